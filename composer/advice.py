@@ -9,15 +9,17 @@ from random import choice
 
 from . import config
 from .utils import display_message
-from .backend.filesystem.primitives import get_entries
-
-try:  # py2
-    from StringIO import StringIO
-except ImportError:  # py3
-    from io import StringIO
+from .backend.filesystem.primitives import (
+    ParseCache,
+    iter_entries,
+    make_file,
+    read_file,
+    set_parse_cache,
+)
 
 CONFIG_ROOT = os.getenv("COMPOSER_ROOT", os.path.expanduser("~/.composer"))
 CONFIG_FILE = os.path.join(CONFIG_ROOT, config.CONFIG_FILENAME)
+CACHE_DIR = os.path.join(CONFIG_ROOT, config.PARSE_CACHE_DIRNAME)
 
 
 def extract_lessons(lessons_files):
@@ -36,11 +38,10 @@ def extract_lessons(lessons_files):
     def format_lesson(lesson):
         return re.sub(lesson_pattern, "", lesson).rstrip("\n") + "\n"
 
-    lesson_sets = [get_entries(f) for f in lessons_files]
-    lessons = [item for sublist in lesson_sets for item in sublist]  # flatten
     lessons = [
         format_lesson(lesson)
-        for lesson in lessons
+        for f in lessons_files
+        for lesson in iter_entries(f)
         if re.match(lesson_pattern, lesson)
     ]
 
@@ -70,8 +71,15 @@ def get_advice(lessons_files):
     )
 )
 @click.argument("wikipath", required=False)
-def main(wikipath=None):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Don't use or update the cache of parsed wiki files.",
+)
+def main(wikipath=None, no_cache=False):
     preferences = config.read_user_preferences(CONFIG_FILE)
+    if not no_cache:
+        set_parse_cache(ParseCache(CACHE_DIR))
     # if wikipath is specified, it should override
     # the configured paths in the ini file
     if wikipath:
@@ -87,9 +95,9 @@ def main(wikipath=None):
 
     def openfile(fn):
         try:
-            f = open(fn, "r")
+            f = read_file(fn)
         except Exception:
-            f = StringIO("")
+            f = make_file()
         return f
 
     lessons_files = map(openfile, filepaths)
@@ -1,3 +1,36 @@
+import importlib
+
 from .filesystem import FilesystemPlanner, FilesystemTasklist
 
-__all__ = ("FilesystemPlanner", "FilesystemTasklist")
+# the other backends are only imported when they are used, so that using
+# the filesystem backend (e.g. from the command line) doesn't pay for
+# importing them (and e.g. sqlite3)
+_LAZY_BACKENDS = {
+    "MemoryPlanner": ".memory",
+    "MemoryTasklist": ".memory",
+    "MemoryWiki": ".memory",
+    "SqlitePlanner": ".sqlite",
+    "SqliteTasklist": ".sqlite",
+    "SqliteWiki": ".sqlite",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_BACKENDS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = (
+    "FilesystemPlanner",
+    "FilesystemTasklist",
+    "MemoryPlanner",
+    "MemoryTasklist",
+    "MemoryWiki",
+    "SqlitePlanner",
+    "SqliteTasklist",
+    "SqliteWiki",
+)
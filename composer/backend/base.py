@@ -1,6 +1,7 @@
 import abc
 import copy
 import datetime
+from collections import namedtuple
 
 from ..config import (
     DEFAULT_BULLET_CHARACTER,
@@ -18,6 +19,15 @@ from ..utils import display_message
 
 ABC = abc.ABCMeta("ABC", (object,), {})  # compatible with Python 2 *and* 3
 
+# the steps in advancing a period at which an advance may be interrupted
+# (e.g. to consult the user), and from which it may later be resumed
+END_PERIOD = "end"
+PREPARE_PERIOD = "prepare"
+
+# the point at which an advance was interrupted, i.e. the step in advancing
+# the given period to the given day
+AdvanceState = namedtuple('AdvanceState', 'period next_day step')
+
 
 class PlannerBase(ABC):
     date = None
@@ -29,6 +39,7 @@ class PlannerBase(ABC):
     next_day_planner = None
     agenda_reviewed = Zero
     tasklist = None
+    advance_state = None
 
     def __init__(self, location, tasklist, preferences):
         self.tasklist = tasklist
@@ -83,6 +94,17 @@ class PlannerBase(ABC):
     def get_log(self, for_day, period):
         raise NotImplementedError
 
+    def has_log(self, for_day, period):
+        """Whether there is a log for the specified period and date. By
+        default, this gets the log, but planners may be able to tell without
+        reading it.
+
+        :param :class:`datetime.date` for_day: The reference date
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :returns bool: Whether there is a log
+        """
+        return bool(self.get_log(for_day, period))
+
     @abc.abstractmethod
     def get_agenda(self, period, complete=None):
         raise NotImplementedError
@@ -166,7 +188,9 @@ class PlannerBase(ABC):
 
     def begin_period(self, period, for_day):
         """Perform any tasks needed to begin a new period.
-        At the moment this just creates a log for the new period.
+        At the moment this advances the tasklist (for a new day), and
+        creates a log for the new period once the user is ready for it (see
+        `prepare_period`).
 
         :param :class:`~composer.timeperiod.Period` period: The period to begin
         :param :class:`datetime.date` for_day: The day we are advancing to
@@ -185,7 +209,27 @@ class PlannerBase(ABC):
             # idempotent. Still, it does result in a message to the user, which
             # we want to avoid, so just doing this for day advance here
             self.tasklist.advance(for_day)
-        self.create_log(period, for_day)
+            # the agenda for the new day is drawn from its log (see
+            # `prepare_period`), so it must be created up front. Since this
+            # takes tasks for tomorrow from the tasklist, it mustn't be
+            # repeated
+            self.create_log(period, for_day)
+        # the advance may be resumed from here if the user needs to be
+        # consulted in preparing the period
+        self.advance_state = AdvanceState(period, for_day, PREPARE_PERIOD)
+        self.prepare_period(period, for_day)
+
+    def prepare_period(self, period, for_day):
+        """Check that the user is ready for a new period to begin, i.e. that
+        they have reviewed its agenda and (for a week) chosen a theme for it,
+        and then create the log for the period (except for a day, whose log
+        is created by `begin_period`). Nothing is changed until the checks
+        pass, so this may be repeated once the user has been consulted.
+
+        :param :class:`~composer.timeperiod.Period` period: The period to
+            prepare
+        :param :class:`datetime.date` for_day: The day we are advancing to
+        """
         if self.agenda_reviewed < period:
             if period == Day:
                 # show the tentative agenda as constituted by tasks added
@@ -214,6 +258,8 @@ class PlannerBase(ABC):
                 "Missing theme for the {period}!".format(period=period),
                 period=period,
             )
+        if period > Day:
+            self.create_log(period, for_day)
 
     def continue_period(self, period, for_day):
         """Perform any tasks needed to continue an existing period in light of
@@ -246,7 +292,7 @@ class PlannerBase(ABC):
             # period boundary criteria are not met, that it still represents an
             # advance of the concerned period since we may not already have a
             # log file tracking the target date
-            is_date_tracked = self.get_log(next_day, next_period)
+            is_date_tracked = self.has_log(next_day, next_period)
             criteria_met = not is_date_tracked
         return criteria_met
 
@@ -272,10 +318,9 @@ class PlannerBase(ABC):
         next_period = get_next_period(current_period)
 
         if self._advance_criteria_met(next_period, next_day):
-            self.end_period(next_period)
-            self.begin_period(next_period, next_day)
-
-            return self.advance_period(next_period, next_day)
+            return self._advance_from(
+                AdvanceState(next_period, next_day, END_PERIOD)
+            )
         else:
             # did not advance beyond current period. If we have advanced
             # at all (e.g. a smaller period), we still want to
@@ -284,6 +329,46 @@ class PlannerBase(ABC):
                 self.continue_period(next_period, next_day)
             return current_period
 
+    def _advance_from(self, state):
+        """Advance the planner from the given step in advancing a period,
+        recording the step as it goes, so that if the advance is interrupted
+        (e.g. by an error asking the user to review an agenda), it may be
+        resumed from that step rather than started over.
+
+        :param :class:`AdvanceState` state: The step to advance from
+        :returns :class:`~composer.timeperiod.Period`: The highest period
+            advanced
+        """
+        period, next_day, step = state
+        self.advance_state = state
+        if step == END_PERIOD:
+            self.end_period(period)
+            # until the period has begun, the advance can't be resumed (see
+            # `begin_period`)
+            self.advance_state = None
+            self.begin_period(period, next_day)
+        else:
+            self.prepare_period(period, next_day)
+        self.advance_state = None
+        return self.advance_period(period, next_day)
+
+    def clone(self):
+        """A copy of the planner, e.g. to be populated for the next day.
+
+        The copy shares the planner's resources, such as its tasklist and
+        its files, rather than copying them. Planners replace these rather
+        than modify them, so the copy only gets its own versions of those
+        that are changed on it (e.g. the logs that it creates), and
+        changes to either planner aren't reflected on the other. The wiki
+        itself (e.g. a :class:`~composer.backend.memory.MemoryWiki`) is
+        likewise shared, as a directory on disk would be.
+
+        :returns :class:`PlannerBase`: The copy
+        """
+        planner = copy.copy(self)
+        planner.next_day_planner = None
+        return planner
+
     def advance(self):
         """Advance planner state to next day, updating week and month info
         as necessary.
@@ -293,6 +378,13 @@ class PlannerBase(ABC):
         file handles will have been updated to the (possibly new) buffers (but
         still not persisted until save() is called).
 
+        If the advance is interrupted in order to consult the user (e.g. to
+        review an agenda), `advance_state` records where it was interrupted,
+        and calling this again (e.g. after updating the planner's preferences
+        with the user's response) resumes the advance from that point.
+        Otherwise (e.g. if the tasklist couldn't be advanced), `advance_state`
+        is None, and the planner should be reloaded before advancing again.
+
         :returns :class:`~composer.timeperiod.Period`: The highest period
             advanced
         """
@@ -300,14 +392,16 @@ class PlannerBase(ABC):
         if self.date > datetime.date.today():
             raise PlannerIsInTheFutureError("Planner is in the future!")
 
+        if self.advance_state is not None:
+            status = self._advance_from(self.advance_state)
+            return status, self.next_day_planner
+
         next_day = self.next_day()  # the new day to advance to
 
         # create a clone of the planner to be populated
-        # for the next day
-        self.next_day_planner = copy.deepcopy(self)
-        # both current and next day planner instances use
-        # the same tasklist instance
-        self.next_day_planner.tasklist = self.tasklist
+        # for the next day. Both current and next day planner
+        # instances use the same tasklist instance
+        self.next_day_planner = self.clone()
         self.next_day_planner.date = next_day
 
         status = self.advance_period(Zero, next_day)
@@ -320,7 +414,7 @@ class PlannerBase(ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def save(self, period=Year):
+    def save(self, period=Year, transaction=None):
         raise NotImplementedError
 
 
@@ -350,5 +444,5 @@ class TasklistBase(ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def save(self):
+    def save(self, transaction=None):
         raise NotImplementedError
@@ -1,5 +1,6 @@
 import os
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
 
 from ..base import PlannerBase, TasklistBase
 from ...config import LOGFILE_CHECKING
@@ -13,8 +14,14 @@ from ...timeperiod import (
     Year,
     Zero,
     Eternity,
+    PeriodInstance,
+)
+from ...errors import (
+    LogfileAlreadyExistsError,
+    LogfileLayoutError,
+    TasklistLayoutError,
+    InvalidDateError,
 )
-from ...errors import LogfileLayoutError, TasklistLayoutError, InvalidDateError
 from ...utils import display_message
 from .scheduling import (
     check_logfile_for_errors,
@@ -23,7 +30,7 @@ from .scheduling import (
     string_to_date,
 )
 from .templates import get_template
-from .interface import ensure_file_does_not_exist, get_log_for_date
+from .interface import get_log_for_date
 
 # should minimize use of low-level (lower than "entry" level) primitives in
 # this file. if necessary, provide duplicate versions of functions at the
@@ -36,17 +43,22 @@ from .primitives import (
     is_completed,
     is_not_completed,
     get_log_filename,
+    get_log_index,
     make_file,
+    copy_file,
+    get_digest,
     full_file_path,
     read_file,
     write_file,
     add_to_section,
+    add_to_sections,
     get_entries,
+    parse_entries,
     entries_to_string,
     partition_entries,
     read_section,
     bare_filename,
-    parse_task,
+    as_entry,
 )
 
 try:  # py3
@@ -61,9 +73,144 @@ PLANNERDAYFILELINK = "currentday"
 SCHEDULE_FILE_PREFIX = "Checkpoints"
 # e.g. Periodic_Weekly.wiki
 PERIODIC_FILE_PREFIX = "Periodic"
+# the maximum number of files to read at once when prefetching
+PREFETCH_WORKERS = 8
+
+
+def _read_resource_file(resource, path):
+    return resource._read_file(path)
+
+
+class FileResources(object):
+    """Files backing the attributes of a planner or tasklist, which are read
+    from disk when they are first accessed, or all together when they are
+    prefetched.
+
+    All access to the underlying storage goes through the `_path`,
+    `_read_file` and `_write_file` methods, so that other kinds of storage
+    may be supported by overriding them.
+    """
+
+    # paths of files that have yet to be loaded, by attribute (set per
+    # instance, in `construct`)
+    _unloaded = None
+    # digests of files as they were loaded, by path, so that files
+    # that haven't changed needn't be written when they are saved (set per
+    # instance, in `construct`)
+    _digests = None
+
+    def _path(self, filename):
+        """The path to a file in the wiki.
+
+        :param str filename: The name of the file
+        :returns str: The path
+        """
+        return full_file_path(root=self.location, filename=filename)
+
+    def _read_file(self, path):
+        """Read a file from storage.
+
+        :param str path: The path to the file
+        :returns :class:`io.StringIO`: The file
+        """
+        return read_file(path)
+
+    def _write_file(self, file, path, transaction=None):
+        """Write a file to storage.
+
+        :param :class:`io.StringIO` file: The file to write
+        :param str path: The path to the file
+        :param transaction: A transaction in which to stage the write
+        """
+        write_file(file, path, transaction=transaction)
+
+    def _record_digest(self, path, digest, transaction=None):
+        """Record the digest of a file as it is on disk, once it has been
+        written, so that it isn't written again until it changes.
 
+        :param str path: The path to the file
+        :param str digest: The digest of the written contents
+        :param transaction: The transaction in which the write was staged,
+            if any, in which case the digest is only recorded once the
+            transaction is committed
+        """
+
+        def record():
+            self._digests[path] = digest
+
+        if transaction is None:
+            record()
+        else:
+            transaction.on_commit(record)
+
+    def _fill(self, attr, path, file):
+        self._digests[path] = get_digest(file)
+        setattr(self, '_' + attr, file)
 
-class FilesystemPlanner(PlannerBase):
+    def _load_file(self, attr):
+        """Get the file for the given attribute, reading it from disk if it
+        hasn't been loaded yet.
+
+        :param str attr: The name of the attribute
+        :returns :class:`io.StringIO`: The file
+        """
+        path = self._unloaded.get(attr)
+        if path is not None:
+            # only mark the file as loaded once it has been read, so that if
+            # reading it fails, it is read again on the next access
+            self._fill(attr, path, self._read_file(path))
+            del self._unloaded[attr]
+        return getattr(self, '_' + attr)
+
+    def _set_file(self, attr, value):
+        """Set the file for the given attribute, superseding any contents
+        that have yet to be loaded from disk.
+
+        :param str attr: The name of the attribute
+        :param :class:`io.StringIO` value: The file
+        """
+        self._unloaded.pop(attr, None)
+        setattr(self, '_' + attr, value)
+
+
+def prefetch(resources, max_workers=PREFETCH_WORKERS):
+    """Read all of the files that have yet to be loaded by the given planners
+    and tasklists, concurrently. This is worthwhile when each read has
+    significant latency, e.g. on a network filesystem.
+
+    :param list resources: The :class:`FileResources` (e.g. planners and
+        tasklists) whose files are to be read
+    :param int max_workers: The maximum number of files to read at once
+    :returns float: The wall-clock time taken to read the files, in seconds
+    """
+    pending = [
+        (resource, attr, path)
+        for resource in resources
+        for attr, path in list(resource._unloaded.items())
+    ]
+    if not pending:
+        return 0.0
+    # imported here since it is slow to import, and prefetching is optional
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        files = list(
+            executor.map(
+                _read_resource_file,
+                [resource for resource, _, _ in pending],
+                [path for _, _, path in pending],
+            )
+        )
+    elapsed = time.perf_counter() - start
+    for (resource, attr, path), file in zip(pending, files):
+        # the attribute may have been set or loaded in the meantime
+        if resource._unloaded.pop(attr, None) is not None:
+            resource._fill(attr, path, file)
+    return elapsed
+
+
+class FilesystemPlanner(FileResources, PlannerBase):
     _daythemesfile = None
     _dayfile = None
     _weekfile = None
@@ -100,142 +247,159 @@ class FilesystemPlanner(PlannerBase):
     # to their values (e.g. "head" position after reading the file's contents)
     # are contained within the client code and not reflected on the planner
     # instance unless it is explicitly modified via a setter
+    #
+    # the getters also load the files from disk on first access, so that
+    # only the files that are actually used are read
 
     @property
     def daythemesfile(self):
-        return make_file(self._daythemesfile.getvalue())
+        return copy_file(self._load_file('daythemesfile'))
 
     @daythemesfile.setter
     def daythemesfile(self, value):
-        self._daythemesfile = value
+        self._set_file('daythemesfile', value)
 
     @property
     def dayfile(self):
-        return make_file(self._dayfile.getvalue())
+        return copy_file(self._load_file('dayfile'))
 
     @dayfile.setter
     def dayfile(self, value):
-        self._dayfile = value
+        self._set_file('dayfile', value)
 
     @property
     def weekfile(self):
-        return make_file(self._weekfile.getvalue())
+        return copy_file(self._load_file('weekfile'))
 
     @weekfile.setter
     def weekfile(self, value):
-        self._weekfile = value
+        self._set_file('weekfile', value)
 
     @property
     def monthfile(self):
-        return make_file(self._monthfile.getvalue())
+        return copy_file(self._load_file('monthfile'))
 
     @monthfile.setter
     def monthfile(self, value):
-        self._monthfile = value
+        self._set_file('monthfile', value)
 
     @property
     def quarterfile(self):
-        return make_file(self._quarterfile.getvalue())
+        return copy_file(self._load_file('quarterfile'))
 
     @quarterfile.setter
     def quarterfile(self, value):
-        self._quarterfile = value
+        self._set_file('quarterfile', value)
 
     @property
     def yearfile(self):
-        return make_file(self._yearfile.getvalue())
+        return copy_file(self._load_file('yearfile'))
 
     @yearfile.setter
     def yearfile(self, value):
-        self._yearfile = value
+        self._set_file('yearfile', value)
 
     @property
     def checkpoints_weekday_file(self):
-        return make_file(self._checkpoints_weekday_file.getvalue())
+        return copy_file(self._load_file('checkpoints_weekday_file'))
 
     @checkpoints_weekday_file.setter
     def checkpoints_weekday_file(self, value):
-        self._checkpoints_weekday_file = value
+        self._set_file('checkpoints_weekday_file', value)
 
     @property
     def checkpoints_weekend_file(self):
-        return make_file(self._checkpoints_weekend_file.getvalue())
+        return copy_file(self._load_file('checkpoints_weekend_file'))
 
     @checkpoints_weekend_file.setter
     def checkpoints_weekend_file(self, value):
-        self._checkpoints_weekend_file = value
+        self._set_file('checkpoints_weekend_file', value)
 
     @property
     def checkpoints_week_file(self):
-        return make_file(self._checkpoints_week_file.getvalue())
+        return copy_file(self._load_file('checkpoints_week_file'))
 
     @checkpoints_week_file.setter
     def checkpoints_week_file(self, value):
-        self._checkpoints_week_file = value
+        self._set_file('checkpoints_week_file', value)
 
     @property
     def checkpoints_month_file(self):
-        return make_file(self._checkpoints_month_file.getvalue())
+        return copy_file(self._load_file('checkpoints_month_file'))
 
     @checkpoints_month_file.setter
     def checkpoints_month_file(self, value):
-        self._checkpoints_month_file = value
+        self._set_file('checkpoints_month_file', value)
 
     @property
     def checkpoints_quarter_file(self):
-        return make_file(self._checkpoints_quarter_file.getvalue())
+        return copy_file(self._load_file('checkpoints_quarter_file'))
 
     @checkpoints_quarter_file.setter
     def checkpoints_quarter_file(self, value):
-        self._checkpoints_quarter_file = value
+        self._set_file('checkpoints_quarter_file', value)
 
     @property
     def checkpoints_year_file(self):
-        return make_file(self._checkpoints_year_file.getvalue())
+        return copy_file(self._load_file('checkpoints_year_file'))
 
     @checkpoints_year_file.setter
     def checkpoints_year_file(self, value):
-        self._checkpoints_year_file = value
+        self._set_file('checkpoints_year_file', value)
 
     @property
     def periodic_day_file(self):
-        return make_file(self._periodic_day_file.getvalue())
+        return copy_file(self._load_file('periodic_day_file'))
 
     @periodic_day_file.setter
     def periodic_day_file(self, value):
-        self._periodic_day_file = value
+        self._set_file('periodic_day_file', value)
 
     @property
     def periodic_week_file(self):
-        return make_file(self._periodic_week_file.getvalue())
+        return copy_file(self._load_file('periodic_week_file'))
 
     @periodic_week_file.setter
     def periodic_week_file(self, value):
-        self._periodic_week_file = value
+        self._set_file('periodic_week_file', value)
 
     @property
     def periodic_month_file(self):
-        return make_file(self._periodic_month_file.getvalue())
+        return copy_file(self._load_file('periodic_month_file'))
 
     @periodic_month_file.setter
     def periodic_month_file(self, value):
-        self._periodic_month_file = value
+        self._set_file('periodic_month_file', value)
 
     @property
     def periodic_quarter_file(self):
-        return make_file(self._periodic_quarter_file.getvalue())
+        return copy_file(self._load_file('periodic_quarter_file'))
 
     @periodic_quarter_file.setter
     def periodic_quarter_file(self, value):
-        self._periodic_quarter_file = value
+        self._set_file('periodic_quarter_file', value)
 
     @property
     def periodic_year_file(self):
-        return make_file(self._periodic_year_file.getvalue())
+        return copy_file(self._load_file('periodic_year_file'))
 
     @periodic_year_file.setter
     def periodic_year_file(self, value):
-        self._periodic_year_file = value
+        self._set_file('periodic_year_file', value)
+
+    def clone(self):
+        """A copy of the planner that shares its files (see
+        :meth:`~composer.backend.base.PlannerBase.clone`). The files are only
+        ever replaced via the setters, and the getters return copies of them,
+        so they may be shared safely. Files that have yet to be loaded are
+        loaded independently by each planner.
+
+        :returns :class:`FilesystemPlanner`: The copy
+        """
+        planner = super(FilesystemPlanner, self).clone()
+        planner._unloaded = dict(self._unloaded)
+        planner._digests = dict(self._digests)
+        return planner
 
     def _logfile_attribute(self, period):
         """A helper to get the name of the attribute on the planner instance
@@ -279,9 +443,18 @@ class FilesystemPlanner(PlannerBase):
         :param :class:`~composer.timeperiod.Period` period: A time period
         :param str contents: The new contents of the log file
         """
+        self._set_logfile(period, make_file(contents))
+
+    def _set_logfile(self, period, logfile):
+        """Time period-agnostic "setter" for the concerned logfile attribute,
+        like `_update_logfile` but taking a file rather than its contents.
+
+        :param :class:`~composer.timeperiod.Period` period: A time period
+        :param :class:`io.StringIO` logfile: The new log file
+        """
         log_attr = self._logfile_attribute(period)
         if log_attr:
-            setattr(self, log_attr, make_file(contents))
+            setattr(self, log_attr, logfile)
 
     def _get_date(self):
         """Get date from planner's current state on disk.
@@ -301,13 +474,15 @@ class FilesystemPlanner(PlannerBase):
         :param str location: Filesystem path to planner wiki
         """
         # use a bunch of StringIO buffers for the Planner object
-        # populate them here from real files
+        # populated from real files when they are first accessed
+        self._digests = {}
+        self._unloaded = {}
         if location is None:
             # needed for tests atm -- eventually make location a required arg
             return
         self.location = location
         self.date = self._get_date()
-        # populate attributes on planner object from files on disk
+        # attributes on planner object to be populated from files on disk
         planner_files = {
             'daythemesfile': PLANNERDAYTHEMESFILE,
             'dayfile': get_log_filename(self.date, Day),
@@ -356,11 +531,20 @@ class FilesystemPlanner(PlannerBase):
             ),
         }
         for attr, filename in planner_files.items():
-            setattr(
-                self,
-                attr,
-                read_file(full_file_path(root=location, filename=filename)),
-            )
+            self._unloaded[attr] = self._path(filename)
+
+    def prefetch(self, max_workers=PREFETCH_WORKERS):
+        """Read all of the planner's files, and those of its tasklist,
+        concurrently, rather than as they are accessed.
+
+        :param int max_workers: The maximum number of files to read at once
+        :returns float: The wall-clock time taken to read the files, in
+            seconds
+        """
+        resources = [self]
+        if isinstance(self.tasklist, FileResources):
+            resources.append(self.tasklist)
+        return prefetch(resources, max_workers)
 
     def get_log(self, for_day, period):
         """Get the log file responsible for the specified period and date.
@@ -377,6 +561,21 @@ class FilesystemPlanner(PlannerBase):
         else:
             return log
 
+    def has_log(self, for_day, period):
+        """Whether there is a log on disk for the specified period and date.
+        This is answered from the index of the logs in the wiki (see
+        :func:`~composer.backend.filesystem.primitives.log_index.
+        get_log_index`), without reading any files.
+
+        :param :class:`datetime.date` for_day: The reference date
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :returns bool: Whether there is a log
+        """
+        if period < Day:
+            return False
+        instance = PeriodInstance.for_date(period, for_day)
+        return instance in get_log_index(self.location)
+
     def schedule_tasks(self):
         """Parse today's agenda for any (e.g. newly-added) scheduled tasks,
         and move them to the appropriate section of the tasklist after
@@ -398,16 +597,9 @@ class FilesystemPlanner(PlannerBase):
         display_message("Tracking any newly scheduled tasks", interactive=True)
         check_logfile_for_errors(self.dayfile)
 
-        tasks = get_entries(self.dayfile, of_type=is_scheduled_task)
+        tasks = parse_entries(self.dayfile, of_type=is_scheduled_task)
 
-        tasks = [
-            (
-                standardize_entry_date(task, self.date)
-                if is_scheduled_task(task)
-                else task
-            )
-            for task in tasks
-        ]
+        tasks = [standardize_entry_date(task, self.date) for task in tasks]
         # check that any blocked tasks have due dates in the future
         # this is usually because a blocked task became due today and
         # wasn't updated to reflect that it isn't blocked anymore
@@ -419,12 +611,11 @@ class FilesystemPlanner(PlannerBase):
         for task in tasks:
             due_date, _ = get_due_date(task, self.date)
             if due_date <= self.date:
-                header, _ = parse_task(task)
                 raise InvalidDateError(
                     "Due date for blocked task is in the past! If the task "
                     "is no longer blocked, then remove the blocked "
                     "indicator. Otherwise, set a follow-up date in the "
-                    "future:\n" + header
+                    "future:\n" + task.header
                 )
 
         self.tasklist.place_tasks(tasks, self.date)
@@ -571,7 +762,7 @@ class FilesystemPlanner(PlannerBase):
                 "No AGENDA section found in {period} log file!"
                 " Add one and try again.".format(period=period)
             )
-        self._update_logfile(period, logfile_updated.getvalue())
+        self._set_logfile(period, logfile_updated)
 
     def _get_filename(self, period):
         """Genenerate a full path to the current log file for a given
@@ -582,7 +773,7 @@ class FilesystemPlanner(PlannerBase):
         :returns str: The path to the log file
         """
         start_date = period.get_start_date(self.date)
-        return get_log_filename(start_date, period, root=self.location)
+        return self._path(get_log_filename(start_date, period))
 
     def is_ok_to_advance(self, period=Year):
         """A helper to check if any time periods just advanced already have
@@ -594,63 +785,103 @@ class FilesystemPlanner(PlannerBase):
         """
         if period == Zero:
             return
-        filename = self._get_filename(period)
-        ensure_file_does_not_exist(filename, period)
+        if self.has_log(self.date, period):
+            raise LogfileAlreadyExistsError(
+                "New {period} logfile already exists!".format(period=period)
+            )
         self.is_ok_to_advance(get_next_period(period, decreasing=True))
 
-    def _write_log_to_file(self, period):
-        """Write the log for the given period to the filesystem.
-        If this represents an advancement of the period in question,
-        then also update the 'current' state of the planner on disk
-        by updating the relevant symbolic link.
+    def _write_log_to_file(self, period, transaction=None):
+        """Write the log for the given period to the filesystem, unless it
+        is unchanged since it was loaded.
+
+        :param :class:`~composer.timeperiod.Period` period: A time period
+        :param transaction: A transaction in which to stage the write
+        :returns bool: Whether the log was written
         """
+        if self._logfile_attribute(period) in self._unloaded:
+            # never loaded, so it can't have changed
+            return False
         log = self._get_logfile(period)
         filename = self._get_filename(period)
+        digest = get_digest(log)
+        if self._digests.get(filename) == digest:
+            return False
         # write the file to disk
-        write_file(log, filename)
+        self._write_file(log, filename, transaction)
+        self._record_digest(filename, digest, transaction)
+        return True
 
-    def _write_files_for_contained_periods(self, period):
+    def _write_files_for_contained_periods(self, period, transaction=None):
         """Write all log files corresponding to periods contained within
         a given time period.
 
         :param :class:`~composer.timeperiod.Period` period: A time period
+        :param transaction: A transaction in which to stage the writes
+        :returns tuple: The number of files written, and the number skipped
+            because they were unchanged
         """
         if period == Zero:
-            return
-        self._write_log_to_file(period)
-        self._write_files_for_contained_periods(
-            get_next_period(period, decreasing=True)
+            return 0, 0
+        written = self._write_log_to_file(period, transaction)
+        written_contained, skipped_contained = (
+            self._write_files_for_contained_periods(
+                get_next_period(period, decreasing=True), transaction
+            )
+        )
+        return (
+            written_contained + written,
+            skipped_contained + (not written),
         )
 
-    def _update_current_date_link(self):
+    def _update_current_date_link(self, transaction=None):
         """Update "current" link on disk to the newly created log file
         for the date to which the planner was advanced.
+
+        :param transaction: A transaction in which to stage the update, in
+            which case the link is replaced atomically when the transaction
+            is committed
         """
         link_name = PLANNERDAYFILELINK
         filelinkfn = full_file_path(root=self.location, filename=link_name)
+        filename = get_log_filename(self.date, Day)
+        # don't need full path in filename since it's relative to the link
+        if os.path.islink(filelinkfn) and os.readlink(filelinkfn) == filename:
+            # already up to date
+            return
+        if transaction is not None:
+            transaction.symlink(filename, filelinkfn)
+            return
         if os.path.islink(filelinkfn):
             os.remove(filelinkfn)
-        filename = get_log_filename(self.date, Day)
-        os.symlink(
-            filename, filelinkfn
-        )  # don't need full path in filename since it's relative to the link
+        os.symlink(filename, filelinkfn)
 
-    def save(self, period=Year):
+    def save(self, period=Year, transaction=None):
         """Write the planner object to the filesystem.
 
         :param :class:`~composer.timeperiod.Period` period: The highest period
             advanced -- only log files encompassed by this period will be
             updated. If unspecified, all logfiles will be overwritten.
+        :param transaction: A
+            :class:`~composer.backend.filesystem.primitives.storage.
+            Transaction` in which to stage the changes, if any, so that they
+            are made on disk together with other changes when the transaction
+            is committed
+        :returns tuple: The number of files written, and the number skipped
+            because they were unchanged since they were loaded
         """
 
         # write the logfile for the current period as well as all contained
         # periods, since they are all affected by the advance
-        self._write_files_for_contained_periods(period)
+        written, skipped = self._write_files_for_contained_periods(
+            period, transaction
+        )
 
-        self._update_current_date_link()
+        self._update_current_date_link(transaction)
+        return written, skipped
 
 
-class FilesystemTasklist(TasklistBase):
+class FilesystemTasklist(FileResources, TasklistBase):
 
     _file = None
 
@@ -669,24 +900,25 @@ class FilesystemTasklist(TasklistBase):
 
     @property
     def file(self):
-        return make_file(self._file.getvalue())
+        return copy_file(self._load_file('file'))
 
     @file.setter
     def file(self, value):
-        self._file = value
+        self._set_file('file', value)
 
     def construct(self, location=None):
         """Construct a tasklist object from a filesystem representation.
 
         :param str location: Filesystem path to planner wiki
         """
+        self._digests = {}
+        self._unloaded = {}
         if location is None:
             # needed for tests atm -- eventually make location a required arg
             return
         self.location = location
-        self.file = read_file(
-            full_file_path(root=location, filename=PLANNERTASKLISTFILE)
-        )
+        # read from disk when first accessed
+        self._unloaded['file'] = self._path(PLANNERTASKLISTFILE)
 
     def place_tasks(self, scheduled_tasks, reference_date):
         """Given a list of scheduled tasks, place them in the appropriate
@@ -703,26 +935,29 @@ class FilesystemTasklist(TasklistBase):
         :param :class:`datetime.date` reference_date: The reference date
             for task placement
         """
-        # sort them first so that they are placed in chronological order within
-        # each section
+        scheduled_tasks = [as_entry(entry) for entry in scheduled_tasks]
+        # determine each task's due date once, and sort them so that they are
+        # placed in chronological order within each section
         scheduled_tasks = sorted(
-            scheduled_tasks,
-            key=lambda entry: get_due_date(entry, reference_date)[0],
+            (
+                (get_due_date(entry, reference_date)[0], entry)
+                for entry in scheduled_tasks
+            ),
+            key=lambda dated: dated[0],
         )
         tasks = defaultdict(lambda: [])
-        for entry in scheduled_tasks:
-            due_date, _ = get_due_date(entry, reference_date)
+        for due_date, entry in scheduled_tasks:
             for period in get_time_periods(Day):
                 # append and break if within time window
                 end_date = period.get_end_date(reference_date)
                 if due_date <= end_date:
                     tasks[period].append(entry)
                     break
-        for period in get_time_periods(Day):
-            tasks_to_add = entries_to_string(tasks[period])
-            self.file = add_to_section(
-                self.file, self.section_name[period], tasks_to_add, above=False
-            )
+        additions = OrderedDict(
+            (self.section_name[period], entries_to_string(tasks[period]))
+            for period in get_time_periods(Day)
+        )
+        self.file = add_to_sections(self.file, additions, above=False)
 
     def advance(self, to_date):
         """'Reverse cascade' tasks from a higher period to an upcoming lower
@@ -804,11 +1039,25 @@ class FilesystemTasklist(TasklistBase):
         self.file = tasklist_nextday
         return tasks
 
-    def save(self):
-        """Write the tasklist object to the filesystem."""
+    def save(self, transaction=None):
+        """Write the tasklist object to the filesystem.
 
-        tasklist_filename = full_file_path(
-            root=self.location, filename=PLANNERTASKLISTFILE
-        )
+        :param transaction: A
+            :class:`~composer.backend.filesystem.primitives.storage.
+            Transaction` in which to stage the write, if any
+        :returns tuple: The number of files written, and the number skipped
+            because they were unchanged since they were loaded
+        """
+
+        if 'file' in self._unloaded:
+            # never loaded, so it can't have changed
+            return 0, 1
+
+        tasklist_filename = self._path(PLANNERTASKLISTFILE)
+        digest = get_digest(self.file)
+        if self._digests.get(tasklist_filename) == digest:
+            return 0, 1
 
-        write_file(self.file, tasklist_filename)
+        self._write_file(self.file, tasklist_filename, transaction)
+        self._record_digest(tasklist_filename, digest, transaction)
+        return 1, 0
@@ -90,6 +90,12 @@ dateformat28 = re.compile(
 )
 
 
+def _match(pattern, date_string, match=None):
+    # the parsers may be handed the match found in identifying the date
+    # format (see `string_to_date`), so that they needn't match it again
+    return match if match is not None else pattern.search(date_string)
+
+
 def get_appropriate_year(month, day, reference_date):
     """For date formats where the year is unspecified, determine the
     appropriate year by ensuring that the resulting date is in the future.
@@ -108,14 +114,16 @@ def get_appropriate_year(month, day, reference_date):
         return reference_date.year
 
 
-def parse_dateformat1(date_string, reference_date=None):
+def parse_dateformat1(date_string, reference_date=None, match=None):
     """Parse date format
         MONTH DD, YYYY (w optional space or comma or both)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (month, day, year) = dateformat1.search(date_string).groups()
+    (month, day, year) = _match(dateformat1, date_string, match).groups()
     date = datetime.datetime.strptime(
         month + "-" + day + "-" + year, "%B-%d-%Y"
     ).date()
@@ -123,14 +131,16 @@ def parse_dateformat1(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat2(date_string, reference_date=None):
+def parse_dateformat2(date_string, reference_date=None, match=None):
     """Parse date format
         DD MONTH, YYYY (w optional space or comma or both)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (day, month, year) = dateformat2.search(date_string).groups()
+    (day, month, year) = _match(dateformat2, date_string, match).groups()
     date = datetime.datetime.strptime(
         month + "-" + day + "-" + year, "%B-%d-%Y"
     ).date()
@@ -138,18 +148,20 @@ def parse_dateformat2(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat3(date_string, reference_date=None):
+def parse_dateformat3(date_string, reference_date=None, match=None):
     """Parse date format
         MONTH DD
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    (month, day) = dateformat3.search(date_string).groups()
+    (month, day) = _match(dateformat3, date_string, match).groups()
     (monthn, dayn) = (get_month_number(month), int(day))
     year = str(get_appropriate_year(monthn, dayn, reference_date))
     date = datetime.datetime.strptime(
@@ -159,18 +171,20 @@ def parse_dateformat3(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat4(date_string, reference_date=None):
+def parse_dateformat4(date_string, reference_date=None, match=None):
     """Parse date format
         DD MONTH
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    (day, month) = dateformat4.search(date_string).groups()
+    (day, month) = _match(dateformat4, date_string, match).groups()
     (monthn, dayn) = (get_month_number(month), int(day))
     year = str(get_appropriate_year(monthn, dayn, reference_date))
     date = datetime.datetime.strptime(
@@ -180,15 +194,17 @@ def parse_dateformat4(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat5(date_string, reference_date=None):
+def parse_dateformat5(date_string, reference_date=None, match=None):
     """Parse date format
         WEEK OF MONTH DD, YYYY (w optional space or comma or both)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     # std = Week of Month dd(sunday/1), yyyy
-    (month, day, year) = dateformat5.search(date_string).groups()
+    (month, day, year) = _match(dateformat5, date_string, match).groups()
     (monthn, dayn, yearn) = (get_month_number(month), int(day), int(year))
     date = datetime.date(yearn, monthn, dayn)
     date = Week.get_start_date(date)
@@ -196,14 +212,16 @@ def parse_dateformat5(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat6(date_string, reference_date=None):
+def parse_dateformat6(date_string, reference_date=None, match=None):
     """Parse date format
         WEEK OF DD MONTH, YYYY (w optional space or comma or both)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (day, month, year) = dateformat6.search(date_string).groups()
+    (day, month, year) = _match(dateformat6, date_string, match).groups()
     (monthn, dayn, yearn) = (get_month_number(month), int(day), int(year))
     date = datetime.date(yearn, monthn, dayn)
     date = Week.get_start_date(date)
@@ -211,18 +229,20 @@ def parse_dateformat6(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat7(date_string, reference_date=None):
+def parse_dateformat7(date_string, reference_date=None, match=None):
     """Parse date format
         WEEK OF MONTH DD
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    (month, day) = dateformat7.search(date_string).groups()
+    (month, day) = _match(dateformat7, date_string, match).groups()
     (monthn, dayn) = (get_month_number(month), int(day))
     yearn = get_appropriate_year(monthn, dayn, reference_date)
     date = datetime.date(yearn, monthn, dayn)
@@ -231,18 +251,20 @@ def parse_dateformat7(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat8(date_string, reference_date=None):
+def parse_dateformat8(date_string, reference_date=None, match=None):
     """Parse date format
         WEEK OF DD MONTH
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    (day, month) = dateformat8.search(date_string).groups()
+    (day, month) = _match(dateformat8, date_string, match).groups()
     (monthn, dayn) = (get_month_number(month), int(day))
     yearn = get_appropriate_year(monthn, dayn, reference_date)
     date = datetime.date(yearn, monthn, dayn)
@@ -251,14 +273,16 @@ def parse_dateformat8(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat9(date_string, reference_date=None):
+def parse_dateformat9(date_string, reference_date=None, match=None):
     """Parse date format
         MONTH YYYY (w optional space or comma or both)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (month, year) = dateformat9.search(date_string).groups()
+    (month, year) = _match(dateformat9, date_string, match).groups()
     day = str(1)
     date = datetime.datetime.strptime(
         month + "-" + day + "-" + year, "%B-%d-%Y"
@@ -267,18 +291,20 @@ def parse_dateformat9(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat10(date_string, reference_date=None):
+def parse_dateformat10(date_string, reference_date=None, match=None):
     """Parse date format
         MONTH
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    month = dateformat10.search(date_string).groups()[0]
+    month = _match(dateformat10, date_string, match).groups()[0]
     (monthn, dayn) = (get_month_number(month), 1)
     (day, year) = (
         str(dayn),
@@ -291,37 +317,47 @@ def parse_dateformat10(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat11(date_string, reference_date=None):
+def parse_dateformat11(date_string, reference_date=None, match=None):
     """Parse date format
         MM/DD/YYYY
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (monthn, dayn, yearn) = map(int, dateformat11.search(date_string).groups())
+    (monthn, dayn, yearn) = map(
+        int, _match(dateformat11, date_string, match).groups()
+    )
     date = datetime.date(yearn, monthn, dayn)
     period = Day
     return date, period
 
 
-def parse_dateformat12(date_string, reference_date=None):
+def parse_dateformat12(date_string, reference_date=None, match=None):
     """Parse date format
         MM-DD-YYYY
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (monthn, dayn, yearn) = map(int, dateformat12.search(date_string).groups())
+    (monthn, dayn, yearn) = map(
+        int, _match(dateformat12, date_string, match).groups()
+    )
     date = datetime.date(yearn, monthn, dayn)
     period = Day
     return date, period
 
 
-def parse_dateformat13(date_string, reference_date=None):
+def parse_dateformat13(date_string, reference_date=None, match=None):
     """Parse date format
         TOMORROW
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -347,11 +383,13 @@ def _weeks_from(how_many, reference_date):
     return date
 
 
-def parse_dateformat14(date_string, reference_date=None):
+def parse_dateformat14(date_string, reference_date=None, match=None):
     """Parse date format
         NEXT WEEK
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -363,11 +401,13 @@ def parse_dateformat14(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat15(date_string, reference_date=None):
+def parse_dateformat15(date_string, reference_date=None, match=None):
     """Parse date format
         NEXT MONTH
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -385,18 +425,20 @@ def parse_dateformat15(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat16(date_string, reference_date=None):
+def parse_dateformat16(date_string, reference_date=None, match=None):
     """Parse date format
         <DOW>
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    dowToSchedule = dateformat16.search(date_string).groups()[0]
+    dowToSchedule = _match(dateformat16, date_string, match).groups()[0]
     upcomingweek = [
         reference_date + datetime.timedelta(days=d) for d in range(1, 8)
     ]
@@ -406,18 +448,20 @@ def parse_dateformat16(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat17(date_string, reference_date=None):
+def parse_dateformat17(date_string, reference_date=None, match=None):
     """Parse date format
         <DOW> (abbrv.)
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    dowToSchedule = dateformat17.search(date_string).groups()[0]
+    dowToSchedule = _match(dateformat17, date_string, match).groups()[0]
     upcomingweek = [
         reference_date + datetime.timedelta(days=d) for d in range(1, 8)
     ]
@@ -427,14 +471,16 @@ def parse_dateformat17(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat18(date_string, reference_date=None):
+def parse_dateformat18(date_string, reference_date=None, match=None):
     """Parse date format
         QN YYYY
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    (quarter, year) = dateformat18.search(date_string).groups()
+    (quarter, year) = _match(dateformat18, date_string, match).groups()
     month = month_for_quarter(quarter)
     month = get_month_name(month)
     day = str(1)
@@ -445,11 +491,13 @@ def parse_dateformat18(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat19(date_string, reference_date=None):
+def parse_dateformat19(date_string, reference_date=None, match=None):
     """Parse date format
         NEXT YEAR
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -461,24 +509,28 @@ def parse_dateformat19(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat20(date_string, reference_date=None):
+def parse_dateformat20(date_string, reference_date=None, match=None):
     """Parse date format
         YYYY
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
-    year = int(dateformat20.search(date_string).groups()[0])
+    year = int(_match(dateformat20, date_string, match).groups()[0])
     date = datetime.date(year, 1, 1)
     period = Year
     return date, period
 
 
-def parse_dateformat21(date_string, reference_date=None):
+def parse_dateformat21(date_string, reference_date=None, match=None):
     """Parse date format
         THIS WEEKEND
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -493,11 +545,13 @@ def parse_dateformat21(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat22(date_string, reference_date=None):
+def parse_dateformat22(date_string, reference_date=None, match=None):
     """Parse date format
         NEXT WEEKEND
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -511,11 +565,13 @@ def parse_dateformat22(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat23(date_string, reference_date=None):
+def parse_dateformat23(date_string, reference_date=None, match=None):
     """Parse date format
         NEXT QUARTER
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -527,18 +583,20 @@ def parse_dateformat23(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat24(date_string, reference_date=None):
+def parse_dateformat24(date_string, reference_date=None, match=None):
     """Parse date format
         QN
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    quarter = dateformat24.search(date_string).groups()[0]
+    quarter = _match(dateformat24, date_string, match).groups()[0]
     # start date of next quarter
     date = Quarter.get_end_date(reference_date) + datetime.timedelta(days=1)
     next_quarter = quarter_for_month(date.month)
@@ -550,11 +608,13 @@ def parse_dateformat24(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat25(date_string, reference_date=None):
+def parse_dateformat25(date_string, reference_date=None, match=None):
     """Parse date format
         DAY AFTER TOMORROW
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -566,7 +626,7 @@ def parse_dateformat25(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat26(date_string, reference_date=None):
+def parse_dateformat26(date_string, reference_date=None, match=None):
     """Parse date format
         SOMEDAY
     This is a special date format indicating a "suspended" task. For the
@@ -575,6 +635,8 @@ def parse_dateformat26(date_string, reference_date=None):
 
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     date = Eternity.get_end_date()
@@ -582,11 +644,13 @@ def parse_dateformat26(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat27(date_string, reference_date=None):
+def parse_dateformat27(date_string, reference_date=None, match=None):
     """Parse date format
         WEEK AFTER NEXT
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
@@ -605,19 +669,22 @@ def parse_dateformat27(date_string, reference_date=None):
     return date, period
 
 
-def parse_dateformat28(date_string, reference_date=None):
+def parse_dateformat28(date_string, reference_date=None, match=None):
     """Parse date format
         (FIRST|SECOND|THIRD|FOURTH|LAST) WEEK OF <MONTH|THE MONTH>
     :param str date_string: The string representation of the date
     :param :class:`datetime.date` reference_date: Date to be treated as "today"
+    :param match: The match of the date format against the string, if it
+        has already been matched
     :returns tuple: The parsed date, together with the relevant time period.
     """
     if not reference_date:
         raise RelativeDateError(
             "Relative date found, but no context available"
         )
-    which_week = dateformat28.search(date_string).groups()[0]
-    month_string = dateformat28.search(date_string).groups()[1]
+    (which_week, month_string) = _match(
+        dateformat28, date_string, match
+    ).groups()
     if month_string == "THE MONTH":
         (monthn, dayn) = (reference_date.month, 1)
         month = get_month_name(monthn)
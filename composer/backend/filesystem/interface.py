@@ -1,14 +1,13 @@
-import os
 import re
-from datetime import timedelta
-from ...timeperiod import get_next_period, Day
-from ...errors import (
-    InvalidTimeFormatError,
-    LogfileLayoutError,
-    LogfileAlreadyExistsError,
+from ...timeperiod import PeriodInstance, Day, get_next_period
+from ...errors import InvalidTimeFormatError, LogfileLayoutError
+
+from .primitives import (
+    get_log_filename,
+    get_log_index,
+    read_file,
+    iter_entries,
 )
-
-from .primitives import get_log_filename, read_file, get_entries
 from .time_parsers import (
     timeformat_min,
     timeformat_hr,
@@ -28,7 +27,7 @@ except NameError:  # py2
     FileNotFoundError = IOError
 
 
-def get_log_for_date(period, for_date, planner_root):
+def get_log_for_date(period, for_date, planner_root, mapped=False):
     """For any date, a time period uniquely maps to a single log file on disk
     for a particular planner instance (which is tied to a wiki root path).
     This function returns that file for the given time period and date.
@@ -44,6 +43,10 @@ def get_log_for_date(period, for_date, planner_root):
         for which we want the log file
     :param :class:`datetime.date` for_date: The date of interest
     :param str planner_root: The root path of the planner wiki
+    :param bool mapped: Whether to map the log into memory rather than
+        reading it (see
+        :func:`~composer.backend.filesystem.primitives.files.read_file`),
+        for logs that are only to be read
     :returns :class:`io.StringIO`: The log file
     """
     if period < Day:
@@ -51,7 +54,7 @@ def get_log_for_date(period, for_date, planner_root):
     start_date = period.get_start_date(for_date)
     log_path = get_log_filename(start_date, period, planner_root)
     try:
-        log = read_file(log_path)
+        log = read_file(log_path, mapped=mapped)
     except FileNotFoundError:
         raise
     return log
@@ -100,11 +103,10 @@ def time_spent_on_planner(log):
         the log to extract the time spent.
     :returns int: The time spent in minutes.
     """
-    try:
-        time_spent_entry = get_entries(
-            log, lambda e: e.startswith("TIME SPENT")
-        )[0]
-    except IndexError:
+    time_spent_entry = next(
+        iter_entries(log, lambda e: e.startswith("TIME SPENT")), None
+    )
+    if time_spent_entry is None:
         raise LogfileLayoutError(
             "Error: No 'TIME SPENT ON PLANNER' section found in log file!"
         )
@@ -135,50 +137,44 @@ def compute_time_spent_on_planner(period, for_date, planner_root):
     return (int(mins / 60), mins % 60)
 
 
-def get_constituent_logs(period, for_date, planner_root):
+def get_constituent_logs(
+    period, for_date, planner_root, with_instances=False
+):
     """Get logfiles for the smaller time period constituting the specified
-    time period, e.g. all of the day logfiles for the week.
+    time period, e.g. all of the day logfiles for the week. The logs that
+    exist are looked up in the index of the logs in the wiki (see
+    :func:`~composer.backend.filesystem.primitives.log_index.
+    get_log_index`), so that missing logs (e.g. for an in-progress period)
+    aren't read. The logs are meant only to be read, and logs for periods
+    longer than a day (which may be large) are mapped into memory rather
+    than read.
 
     :param :class:`~composer.timeperiod.Period` period: The time period
         for which we want constituent log files
     :param :class:`datetime.date` for_date: The date of interest
     :param str planner_root: The root path of the planner wiki
-    :returns list: The constituent logs
+    :param bool with_instances: Whether to also return the period instance
+        tracked by each log
+    :returns list: The constituent logs, in chronological order. If
+        `with_instances` is true, (period instance, log) pairs
     """
     if period <= Day:
         return []
-    start_date = period.get_start_date(for_date)
-    end_date = period.get_end_date(for_date)
+    instance = PeriodInstance.for_date(period, for_date)
     constituent_period = get_next_period(period, decreasing=True)
     logs = []
-    current_date = start_date
-    constituent_end_date = constituent_period.get_end_date(current_date)
-    while constituent_end_date <= end_date:
+    for constituent, _ in get_log_index(planner_root).find(
+        constituent_period, instance.start, instance.end
+    ):
         try:
             log = get_log_for_date(
-                constituent_period, current_date, planner_root
+                constituent.period,
+                constituent.start,
+                planner_root,
+                mapped=constituent.period > Day,
             )
         except FileNotFoundError:
-            # could be an in-progress period, i.e. no log yet exists
-            # or just a missing log. we just skip over it and continue until we
-            # hit the end date of the higher period to be sure
-            pass
-        else:
-            logs.append(log)
-        current_date = constituent_end_date + timedelta(days=1)
-        constituent_end_date = constituent_period.get_end_date(current_date)
+            # removed since the wiki was indexed
+            continue
+        logs.append((constituent, log) if with_instances else log)
     return logs
-
-
-def ensure_file_does_not_exist(filename, period):
-    """Ensure that a file does not already exist on disk. Raises an
-    exception if it does.
-
-    :param str filename: The path to the file
-    :param :class:`~composer.timeperiod.Period` period: The time period
-        for which we are interested in writing a log file
-    """
-    if os.path.isfile(filename):
-        raise LogfileAlreadyExistsError(
-            "New {period} logfile already exists!".format(period=period)
-        )
@@ -1,12 +1,30 @@
+from .parse_cache import ParseCache, get_parse_cache, set_parse_cache  # noqa
+from .log_index import LogIndex, get_log_index  # noqa
 from .entries import (  # noqa
     add_to_section,
+    add_to_sections,
     get_entries,
+    iter_entries,
+    iter_section,
+    parse_entries,
     entries_to_string,
     partition_entries,
     read_section,
 )
-from .files import make_file, read_file, write_file, append_files  # noqa
+from .files import (  # noqa
+    make_file,
+    copy_file,
+    get_digest,
+    read_file,
+    write_file,
+    append_file,
+    append_files,
+)
 from .parsing import (  # noqa
+    Entry,
+    TaskStatus,
+    as_entry,
+    get_status,
     is_blank_line,
     is_completed,
     is_not_completed,
@@ -18,23 +36,42 @@ from .parsing import (  # noqa
     parse_task,
 )
 from .storage import (
+    Transaction,
     full_file_path,
+    get_directory_state,
     get_log_filename,
+    parse_log_filename,
     bare_filename,
     strip_extension,
 )  # noqa
 
 
 __all__ = (
+    "ParseCache",
+    "get_parse_cache",
+    "set_parse_cache",
+    "LogIndex",
+    "get_log_index",
     "add_to_section",
+    "add_to_sections",
     "get_entries",
+    "iter_entries",
+    "iter_section",
+    "parse_entries",
     "entries_to_string",
     "partition_entries",
     "read_section",
     "make_file",
+    "copy_file",
+    "get_digest",
     "read_file",
     "write_file",
+    "append_file",
     "append_files",
+    "Entry",
+    "TaskStatus",
+    "as_entry",
+    "get_status",
     "is_blank_line",
     "is_completed",
     "is_not_completed",
@@ -44,8 +81,11 @@ __all__ = (
     "is_done_task",
     "is_invalid_task",
     "parse_task",
+    "Transaction",
     "full_file_path",
+    "get_directory_state",
     "get_log_filename",
+    "parse_log_filename",
     "bare_filename",
     "strip_extension",
 )
@@ -0,0 +1,402 @@
+import re
+
+from .parsing import ENTRY_START_PATTERN
+from .sections import SectionIndex, get_section_index
+
+# once a document has been edited into this many pieces, it is compacted
+# back into a single piece, so that lookups remain fast
+MAX_PIECES = 64
+
+
+def get_entry_starts(text):
+    """The offsets of the entries in some text, i.e. of the lines that begin
+    entries.
+
+    :param str text: The text
+    :returns list: The offsets, in order
+    """
+    if not text:
+        return []
+    # the first line always begins an entry, even if it's a subtask
+    starts = [0]
+    starts.extend(
+        match.start() for match in ENTRY_START_PATTERN.finditer(text, 1)
+    )
+    return starts
+
+
+class PieceTable(object):
+    """An immutable text document that supports inserting and deleting text
+    without copying the text that isn't affected. The document is
+    represented as a sequence of "pieces," i.e. references to ranges of
+    (immutable) strings, and edits produce new documents that share these
+    strings with the original. The contents of the document are only
+    assembled into a single string when they are actually needed.
+
+    The section index for the document is also maintained across edits
+    wherever possible, so that sections can be located in an edited
+    document without rescanning its contents.
+
+    :param str text: The contents of the document
+    :param index: The section index for the contents, if it is known
+    :param list entry_starts: The offsets of the entries in the contents,
+        if they are known
+    """
+
+    __slots__ = ('_pieces', '_length', '_index', '_value', '_entry_starts')
+
+    def __init__(self, text="", index=None, entry_starts=None):
+        self._pieces = [(text, 0, len(text))] if text else []
+        self._length = len(text)
+        self._index = index
+        self._value = text
+        self._entry_starts = entry_starts
+
+    @classmethod
+    def _derive(cls, pieces, length, index):
+        document = cls.__new__(cls)
+        if len(pieces) > MAX_PIECES:
+            value = "".join(source[start:end] for source, start, end in pieces)
+            pieces = [(value, 0, length)]
+        document._pieces = pieces
+        document._length = length
+        document._index = index
+        document._value = None
+        document._entry_starts = None
+        return document
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def index(self):
+        """The section index for the document.
+
+        :returns :class:`~composer.backend.filesystem.primitives.sections.
+            SectionIndex`: The section index
+        """
+        if self._index is None:
+            self._index = get_section_index(self.getvalue())
+        return self._index
+
+    @property
+    def entry_starts(self):
+        """The offsets of the entries in the document.
+
+        :returns list: The offsets, in order
+        """
+        if self._entry_starts is None:
+            self._entry_starts = get_entry_starts(self.getvalue())
+        return self._entry_starts
+
+    def getvalue(self):
+        """The contents of the document.
+
+        :returns str: The contents
+        """
+        if self._value is None:
+            if len(self._pieces) == 1:
+                source, start, end = self._pieces[0]
+                self._value = source[start:end]
+            else:
+                self._value = "".join(
+                    source[start:end] for source, start, end in self._pieces
+                )
+            # the document is immutable, so we can represent it more
+            # compactly now that we have its contents
+            self._pieces = [(self._value, 0, self._length)]
+        return self._value
+
+    def slice(self, start, end):
+        """The contents of the document between the given offsets.
+
+        :param int start: The start offset
+        :param int end: The end offset
+        :returns str: The contents in that range
+        """
+        start, end = max(start, 0), min(end, self._length)
+        if start >= end:
+            return ""
+        if self._value is not None:
+            return self._value[start:end]
+        parts = []
+        position = 0
+        for source, piece_start, piece_end in self._pieces:
+            size = piece_end - piece_start
+            if position + size > start:
+                lo = piece_start + max(start - position, 0)
+                hi = piece_start + min(end - position, size)
+                parts.append(source[lo:hi])
+            position += size
+            if position >= end:
+                break
+        return "".join(parts)
+
+    def _split(self, offset):
+        """Split the pieces of the document at the given offset.
+
+        :param int offset: The offset to split at
+        :returns tuple: The pieces before the offset and the pieces after it
+        """
+        position = 0
+        for i, (source, start, end) in enumerate(self._pieces):
+            size = end - start
+            if position + size > offset:
+                split = start + offset - position
+                before = self._pieces[:i]
+                after = self._pieces[i + 1 :]
+                if split > start:
+                    before.append((source, start, split))
+                after.insert(0, (source, split, end))
+                return before, after
+            position += size
+        return list(self._pieces), []
+
+    def sub(self, start, end):
+        """The part of the document between the given offsets, as a
+        document. This shares the contents of the original document.
+
+        :param int start: The start offset
+        :param int end: The end offset
+        :returns :class:`PieceTable`: The new document
+        """
+        _, after = self._split(start)
+        pieces = []
+        remaining = end - start
+        for source, piece_start, piece_end in after:
+            if remaining <= 0:
+                break
+            piece_end = min(piece_end, piece_start + remaining)
+            pieces.append((source, piece_start, piece_end))
+            remaining -= piece_end - piece_start
+        return self._derive(pieces, max(end - start, 0), None)
+
+    def splice(self, replacements, index=None):
+        """Replace several ranges of the document with other documents, in a
+        single pass over the document.
+
+        :param list replacements: (start, end, document) triples, for
+            non-overlapping ranges, in order
+        :param index: The section index of the resulting document, if it is
+            known
+        :returns :class:`PieceTable`: The new document
+        """
+        pieces = []
+        length = self._length
+        remaining = iter(self._pieces)
+        piece = next(remaining, None)
+        position = 0  # the offset of the start of the current piece
+        for start, end, document in replacements:
+            # take the pieces before the range, and skip those within it
+            while piece is not None and position < end:
+                source, piece_start, piece_end = piece
+                size = piece_end - piece_start
+                if position < start:
+                    pieces.append(
+                        (
+                            source,
+                            piece_start,
+                            piece_start + min(start - position, size),
+                        )
+                    )
+                if position + size > end:
+                    # the rest of this piece follows the range
+                    skip = end - position
+                    piece = (source, piece_start + skip, piece_end)
+                    position = end
+                    break
+                position += size
+                piece = next(remaining, None)
+            pieces.extend(document._pieces)
+            length += len(document) - (end - start)
+        if piece is not None:
+            pieces.append(piece)
+            pieces.extend(remaining)
+        return self._derive(pieces, length, index)
+
+    def _is_line_start(self, offset):
+        return offset == 0 or self.slice(offset - 1, offset) == "\n"
+
+    def insert(self, offset, text):
+        """Insert text into the document.
+
+        :param int offset: The offset at which to insert the text
+        :param str text: The text to insert
+        :returns :class:`PieceTable`: The new document
+        """
+        if not text:
+            return self
+        before, after = self._split(offset)
+        index = None
+        if self._index is not None and self._is_line_start(offset):
+            index = self._index.insert(offset, text)
+        return self._derive(
+            before + [(text, 0, len(text))] + after,
+            self._length + len(text),
+            index,
+        )
+
+    def delete(self, start, end):
+        """Delete a range of text from the document.
+
+        :param int start: The start of the range to delete
+        :param int end: The end of the range to delete
+        :returns :class:`PieceTable`: The new document
+        """
+        if start >= end:
+            return self
+        before, _ = self._split(start)
+        _, after = self._split(end)
+        index = None
+        if self._index is not None and self._is_line_start(start):
+            index = self._index.delete(start, end, self.slice(start, end))
+        length = self._length - (end - start)
+        return self._derive(before + after, length, index)
+
+
+# the same as ENTRY_START_PATTERN, for scanning memory-mapped contents
+ENTRY_START_BYTES_PATTERN = re.compile(
+    ENTRY_START_PATTERN.pattern.encode(), re.MULTILINE
+)
+
+# the size of the chunks in which memory-mapped contents are checked
+MAPPING_CHECK_SIZE = 1 << 20
+
+
+class MappedDocument(object):
+    """A read-only text document backed by a memory-mapped file. The file
+    contents are scanned in place, e.g. to build the section index or to
+    find entries, and only the parts of the file that are actually used are
+    decoded into strings.
+
+    Editing the document produces a
+    :class:`PieceTable` whose pieces refer to this document, so that even
+    edited documents only decode the parts of the file that they use.
+
+    Since the contents are read from the file on demand, the file must not
+    be modified on disk while the document is in use.
+
+    :param :class:`mmap.mmap` mapping: The ASCII contents of the file,
+        mapped into memory (see `map_document`)
+    :param index: The section index for the contents, if it is known
+    """
+
+    __slots__ = ('_mapping', '_length', '_index', '_value')
+
+    def __init__(self, mapping, index=None):
+        self._mapping = mapping
+        self._length = len(mapping)
+        self._index = index
+        self._value = None
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        # allows the document to be used as the source of pieces in a
+        # piece table
+        return self._mapping[key].decode("ascii")
+
+    @property
+    def index(self):
+        """The section index for the document, built by scanning the mapped
+        contents.
+
+        :returns :class:`~composer.backend.filesystem.primitives.sections.
+            SectionIndex`: The section index
+        """
+        if self._index is None:
+            self._index = SectionIndex(self._mapping)
+        return self._index
+
+    def getvalue(self):
+        """The contents of the document. This decodes the entire file.
+
+        :returns str: The contents
+        """
+        if self._value is None:
+            self._value = self[:]
+        return self._value
+
+    def slice(self, start, end):
+        """The contents of the document between the given offsets.
+
+        :param int start: The start offset
+        :param int end: The end offset
+        :returns str: The contents in that range
+        """
+        start, end = max(start, 0), min(end, self._length)
+        if start >= end:
+            return ""
+        if self._value is not None:
+            return self._value[start:end]
+        return self[start:end]
+
+    def iter_entries(self, start=0, end=None):
+        """Lazily read the entries in a range of the document, decoding only
+        one entry at a time.
+
+        :param int start: The offset of the start of the range, which is
+            taken to be the start of a line
+        :param int end: The offset of the end of the range
+        :returns generator: The entries (strings) in the range, in order
+        """
+        if end is None:
+            end = self._length
+        if start >= end:
+            return
+        # the first line always begins an entry, even if it's a subtask
+        for match in ENTRY_START_BYTES_PATTERN.finditer(
+            self._mapping, start + 1, end
+        ):
+            entry_end = match.start()
+            yield self[start:entry_end]
+            start = entry_end
+        yield self[start:end]
+
+    def _as_piece_table(self):
+        return PieceTable._derive(
+            [(self, 0, self._length)] if self._length else [],
+            self._length,
+            self.index,
+        )
+
+    def sub(self, start, end):
+        """See :meth:`PieceTable.sub`."""
+        return self._as_piece_table().sub(start, end)
+
+    def splice(self, replacements, index=None):
+        """See :meth:`PieceTable.splice`."""
+        return self._as_piece_table().splice(replacements, index)
+
+    def insert(self, offset, text):
+        """See :meth:`PieceTable.insert`."""
+        return self._as_piece_table().insert(offset, text)
+
+    def delete(self, start, end):
+        """See :meth:`PieceTable.delete`."""
+        return self._as_piece_table().delete(start, end)
+
+
+def map_document(mapping, index=None):
+    """Get a document for the contents of a memory-mapped file, if they can
+    be used without decoding them.
+
+    Checking this scans all of the contents up front (though without
+    decoding or copying them), so mapping a file saves decoding the parts of
+    it that aren't used, rather than reading them.
+
+    :param :class:`mmap.mmap` mapping: The mapped contents of the file
+    :param index: The section index for the contents, if it is known
+    :returns :class:`MappedDocument`: The document, or None if the contents
+        must be decoded in order to be used
+    """
+    # the contents can be used directly only if decoding them doesn't change
+    # any offsets, i.e. if they are ASCII, and if they don't contain carriage
+    # returns, which reading the file in text mode would translate
+    if mapping.find(b"\r", 0) != -1:
+        return None
+    for offset in range(0, len(mapping), MAPPING_CHECK_SIZE):
+        if not mapping[offset : offset + MAPPING_CHECK_SIZE].isascii():
+            return None
+    return MappedDocument(mapping, index)
@@ -1,9 +1,19 @@
-from .files import make_file, contain_file_mutation, copy_file, partition_at
+from collections import OrderedDict
+
+from .document import MappedDocument, PieceTable, get_entry_starts
+from .files import (
+    TextBuffer,
+    make_file,
+    copy_file,
+    contain_file_mutation,
+    get_document,
+)
+from .sections import SECTION_HEADER_PATTERN
 from .parsing import (
-    is_section_separator,
-    get_section_pattern,
-    SECTION_OR_EOF_PATTERN,
+    ENTRY_START_PATTERN,
     SECTION_SEPARATOR,
+    Entry,
+    entry_text,
     is_eof,
     is_subtask,
 )
@@ -22,10 +32,15 @@ from .parsing import (
 def entries_to_string(entries):
     """Convert a list of entries to a string.
 
-    :param list entries: A list of entries (strings)
+    :param list entries: A list of entries (strings or
+        :class:`~composer.backend.filesystem.primitives.parsing.Entry`)
     :returns str: A string formed by concatenating all of the entries
     """
-    return "".join(entries)
+    try:
+        return "".join(entries)
+    except TypeError:
+        # not all of the entries are strings
+        return "".join(entry_text(entry) for entry in entries)
 
 
 def string_to_entries(string):
@@ -70,8 +85,10 @@ def partition_entries(entries, filter_fn):
     :returns tuple: A pair with a list containing only those entries passing
         the predicate, and another list containing only those failing
     """
-    filtered = filter_entries(entries, filter_fn)
-    excluded = exclude_entries(entries, filter_fn)
+    filtered, excluded = [], []
+    # each entry is checked only once
+    for entry in entries:
+        (filtered if filter_fn(entry) else excluded).append(entry)
     return filtered, excluded
 
 
@@ -88,28 +105,82 @@ def read_entry(file):
     :returns str: An entry read from the file
     """
     entry = ""
-    complement = make_file()
     line = file.readline()
     if is_eof(line):
-        complement = make_file(file.getvalue())
+        complement = copy_file(file)
         return None, complement
     entry += line
     line = file.readline()
     while is_subtask(line):
         entry += line
         line = file.readline()
-    complement.write(line)
-    complement.write(file.read())
+    complement = make_file(line + file.read())
     return entry, complement
 
 
+def _iter_entries(text, start=0, end=None):
+    """Lazily read the entries in a range of some text, in a single pass.
+
+    :param str text: The text to read from
+    :param int start: The offset of the start of the range, which is taken to
+        be the start of a line
+    :param int end: The offset of the end of the range
+    :returns generator: The entries (strings) in the range, in order
+    """
+    if end is None:
+        end = len(text)
+    if start >= end:
+        return
+    # the first line always begins an entry, even if it's a subtask
+    for match in ENTRY_START_PATTERN.finditer(text, start + 1, end):
+        entry_end = match.start()
+        yield text[start:entry_end]
+        start = entry_end
+    yield text[start:end]
+
+
+def _document_entries(document, start=0, end=None):
+    """Lazily read the entries in a range of a document.
+
+    :param document: The document
+    :param int start: The offset of the start of the range, which is taken to
+        be the start of a line
+    :param int end: The offset of the end of the range
+    :returns generator: The entries (strings) in the range, in order
+    """
+    if isinstance(document, MappedDocument):
+        # scan the mapped file rather than decoding all of it
+        return document.iter_entries(start, end)
+    return _iter_entries(document.getvalue(), start, end)
+
+
 def _read_entries(file):
-    entries = []
-    entry, complement = read_entry(file)
-    while entry:
-        entries.append(entry)
-        entry, complement = read_entry(complement)
-    return entries
+    """Read all entries from a file in a single pass over its contents.
+
+    This is equivalent to repeatedly calling `read_entry` on the complement
+    until the file is exhausted, but it doesn't construct a complement for
+    each entry, and so it takes time linear in the size of the file rather
+    than quadratic.
+
+    :param :class:`io.StringIO` file: The file to read from
+    :returns list: The entries (strings) in the file, in order
+    """
+    document = None
+    if isinstance(file, TextBuffer) and file.tell() == 0:
+        document = file.document
+    if isinstance(document, PieceTable):
+        # the document may already know where its entries are, e.g. if they
+        # were cached
+        text = document.getvalue()
+        starts = document.entry_starts
+    else:
+        text = file.read()
+        starts = get_entry_starts(text)
+    if not text:
+        return []
+    ends = starts[1:]
+    ends.append(len(text))
+    return [text[start:end] for start, end in zip(starts, ends)]
 
 
 @contain_file_mutation
@@ -129,6 +200,102 @@ def get_entries(file, of_type=None):
     return entries
 
 
+@contain_file_mutation
+def iter_entries(file, of_type=None):
+    """Like `get_entries`, but produces the entries lazily, so that callers
+    that only need some of the entries (e.g. the first one of a certain type)
+    can stop reading the file as soon as they have found them, without
+    assembling a list of all of the entries in the file.
+
+    :param :class:`io.StringIO` file: The file to read from
+    :param function of_type: Get only entries that match this type. This
+        argument should be a predicate function that returns true or
+        false based on a type determination on the argument.
+    :returns generator: The entries (strings) in the file, in order
+    """
+    entries = _document_entries(get_document(file))
+    if not of_type:
+        return entries
+    return (entry for entry in entries if of_type(entry))
+
+
+@contain_file_mutation
+def parse_entries(file, of_type=None):
+    """Like `get_entries`, but produces
+    :class:`~composer.backend.filesystem.primitives.parsing.Entry` records
+    rather than strings, so that metadata about the entries, such as their
+    status and scheduled date, is parsed only once.
+
+    :param :class:`io.StringIO` file: The file to read from
+    :param function of_type: Get only entries that match this type. This
+        argument should be a predicate function that returns true or
+        false based on a type determination on the argument (the text of
+        the entry).
+    :returns list: The entries in the file
+    """
+    if not of_type:
+        of_type = lambda x: True
+    return [Entry(entry) for entry in _read_entries(file) if of_type(entry)]
+
+
+def _is_blank_terminated(text):
+    """Whether the last line of some text is a blank line.
+
+    :param str text: The text (or just the last few characters of it)
+    :returns bool: True if the last line is blank
+    """
+    return text == SECTION_SEPARATOR or text.endswith("\n" + SECTION_SEPARATOR)
+
+
+def _tail(document, start, end):
+    """The last few characters of a range of a document -- enough to
+    determine whether it ends in a blank line.
+
+    :param document: The document
+    :param int start: The start of the range
+    :param int end: The end of the range
+    :returns str: The tail of the range
+    """
+    return document.slice(max(start, end - len(SECTION_SEPARATOR) - 1), end)
+
+
+def _locate_contents(document, start, end):
+    """Locate the contents of a section in a document, given the span of the
+    section.
+
+    If there is a blank line at the end of the section, it is treated as a
+    section separator and not as part of the section.
+    Note: This should eventually be unnecessary if we introduce
+    higher-level abstractions with different low-level
+    (e.g. file-based) representations, such that the entities
+    are reasoned about at different levels and their file
+    representation is modulated as a side-effect in a
+    deterministic ("monadic") way
+
+    :param :class:`~composer.backend.filesystem.primitives.document.
+        PieceTable` document: The file contents
+    :param int start: The start of the section contents
+    :param int end: The end of the section, i.e. the start of the next one
+    :returns tuple: The offsets of the start and end of the section contents
+    """
+    if end > start and _is_blank_terminated(_tail(document, start, end)):
+        end -= len(SECTION_SEPARATOR)
+    return start, end
+
+
+def _locate_section(document, section):
+    """Locate the contents of a section in a document, using the section
+    index for the document.
+
+    :param :class:`~composer.backend.filesystem.primitives.document.
+        PieceTable` document: The file contents
+    :param str section: The name of the section
+    :returns tuple: The offsets of the start and end of the section contents
+    """
+    span = document.index.find(section)
+    return _locate_contents(document, span.start, span.end)
+
+
 @contain_file_mutation
 def read_section(file, section):
     """Retrieve the contents of a specified section in a file.
@@ -138,35 +305,79 @@ def read_section(file, section):
     :returns tuple: A pair with a file containing the contents of the section,
         and another file containing everything else
     """
-    pattern = get_section_pattern(section)
-    complement = make_file()
-    try:
-        before, remaining = partition_at(file, pattern, inclusive=True)
-        complement.write(before.read())
-        contents, after = partition_at(
-            remaining, SECTION_OR_EOF_PATTERN, or_eof=True
-        )
-    except ValueError:
-        raise
-
-    if contents.getvalue():
-        # if there is a blank line at the end of the section, treat it
-        # as a section separator and don't include it in the secion.
-        # Note: This should eventually be unnecessary if we introduce
-        # higher-level abstractions with different low-level
-        # (e.g. file-based) representations, such that the entities
-        # are reasoned about at different levels and their file
-        # representation is modulated as a side-effect in a
-        # deterministic ("monadic") way
-        lines = contents.readlines()
-        penultimate_line = lines[-1]
-        if is_section_separator(penultimate_line):
-            complement.write(penultimate_line)
-            contents = make_file("".join(lines[:-1]))
-    complement.write(after.read())
+    document = get_document(file)
+    start, end = _locate_section(document, section)
+    contents = make_file(document.slice(start, end))
+    complement = make_file(document.delete(start, end))
     return contents, complement
 
 
+@contain_file_mutation
+def iter_section(file, section):
+    """Lazily read the entries in a specified section in a file, without
+    copying the contents of the section or of the rest of the file.
+
+    :param :class:`io.StringIO` file: A text file to parse
+    :param str section: The name of the section
+    :returns generator: The entries (strings) in the section, in order
+    """
+    document = get_document(file)
+    start, end = _locate_section(document, section)
+    return _document_entries(document, start, end)
+
+
+def _add_to_contents(
+    document, start, end, tasks, above, ensure_separator, followed=False
+):
+    """Insert tasks into the contents of a section, given its span.
+
+    :param :class:`~composer.backend.filesystem.primitives.document.
+        PieceTable` document: The file contents
+    :param int start: The start of the section contents
+    :param int end: The end of the section, i.e. the start of the next one
+    :param str tasks: Text to add to the section
+    :param bool above: Whether to add the tasks above the existing contents or
+        below them
+    :param bool ensure_separator: Whether to ensure that a section separator is
+        present after the new contents have been added
+    :param bool followed: Whether the document is followed by further
+        contents, in case it is only part of a file
+    :returns tuple: The new document, and the separator that was added, if
+        any
+    """
+    start, end = _locate_contents(document, start, end)
+    contents_tail = _tail(document, start, end)
+    if above:
+        new_contents_tail = tasks + contents_tail
+    else:
+        new_contents_tail = contents_tail + tasks
+    if end < len(document):
+        followed = (
+            document.slice(end, end + len(SECTION_SEPARATOR))
+            != SECTION_SEPARATOR
+        )
+    # in extracting the section from the original file, we disregarded
+    # a section separator (if present). Add it back here. (ideally this
+    # level of management should be made unnecessary with higher-level
+    # abstractions)
+    separator = (
+        SECTION_SEPARATOR
+        if (
+            ensure_separator
+            and new_contents_tail
+            and not _is_blank_terminated(new_contents_tail)
+            and followed
+        )
+        else ""
+    )
+    if above:
+        document = document.insert(start, tasks)
+        document = document.insert(end + len(tasks), separator)
+    else:
+        document = document.insert(end, tasks + separator)
+    return document, separator
+
+
 @contain_file_mutation
 def add_to_section(file, section, tasks, above=True, ensure_separator=False):
     """Find a given section in a file and insert tasks into it.  The new tasks
@@ -174,6 +385,10 @@ def add_to_section(file, section, tasks, above=True, ensure_separator=False):
     pre-existing contents of the section are preserved alongside the new
     additions.
 
+    The tasks are spliced into the file without copying the rest of its
+    contents, so this takes time proportional to the size of the addition
+    rather than the size of the file.
+
     :param :class:`io.StringIO` file: A text file
     :param str section: The name of the section
     :param str tasks: Text to add to the section
@@ -183,46 +398,81 @@ def add_to_section(file, section, tasks, above=True, ensure_separator=False):
         present after the new contents have been added (see comment below)
     :returns :class:`io.StringIO`: The new file including the additions
     """
+    document = get_document(file)
+    span = document.index.find(section)
+    document, _ = _add_to_contents(
+        document, span.start, span.end, tasks, above, ensure_separator
+    )
+    return make_file(document)
 
-    try:
-        contents, complement = read_section(file, section)
-    except ValueError:
-        raise
-    if not contents.getvalue():
-        # "base case"
-        pattern = get_section_pattern(section)
-        try:
-            before, remaining = partition_at(file, pattern, inclusive=True)
-        except ValueError:
-            raise
-        new_file = make_file()
-        new_file.write(before.read())
-        new_file.write(tasks)
-        if (
-            ensure_separator
-            and not is_section_separator(make_file(tasks).readlines()[-1])
-            and remaining.getvalue()
-            and not is_section_separator(copy_file(remaining).readlines()[0])
-        ):
-            # in extracting the section from the original file, we disregarded
-            # a section separator (if present). Add it back here. (ideally this
-            # level of management should be made unnecessary with higher-level
-            # abstractions)
-            new_file.write(SECTION_SEPARATOR)
-        new_file.write(remaining.read())
-        return new_file
-    else:
-        new_contents = make_file()
-        if above:
-            new_contents.write(tasks)
-            new_contents.write(contents.read())
-        else:
-            new_contents.write(contents.read())
-            new_contents.write(tasks)
-        return add_to_section(
-            complement,
-            section,
-            new_contents.getvalue(),
-            above,
-            ensure_separator,
+
+def _is_whole_lines(text):
+    return not text or (
+        text.endswith("\n") and not SECTION_HEADER_PATTERN.search(text)
+    )
+
+
+@contain_file_mutation
+def add_to_sections(file, additions, above=True, ensure_separator=False):
+    """Insert tasks into several sections of a file at once. This is
+    equivalent to calling `add_to_section` for each section in turn, but
+    locates all of the sections using a single lookup and makes all of the
+    additions in a single pass over the file.
+
+    :param :class:`io.StringIO` file: A text file
+    :param dict additions: A mapping of section names to the text to be added
+        to each section, with additions to the same section being made in
+        the order of the mapping
+    :param bool above: Whether to add the tasks above the existing contents of
+        each section or below them
+    :param bool ensure_separator: Whether to ensure that a section separator is
+        present after the new contents have been added
+    :returns :class:`io.StringIO`: The new file including the additions
+    """
+    document = get_document(file)
+    index = document.index
+    spans = OrderedDict()
+    if all(_is_whole_lines(tasks) for tasks in additions.values()):
+        for section, tasks in additions.items():
+            span = index.find(section)
+            spans.setdefault(span, []).append(tasks)
+    if not spans or not all(
+        _is_whole_lines(document.slice(span.start - 1, span.start))
+        and _is_whole_lines(_tail(document, span.start, span.end))
+        for span in spans
+    ):
+        # the additions could change the layout of sections in the file,
+        # so that the sections need to be located anew for each addition
+        for section, tasks in additions.items():
+            span = document.index.find(section)
+            document, _ = _add_to_contents(
+                document, span.start, span.end, tasks, above, ensure_separator
+            )
+        return make_file(document)
+    replacements = []
+    shift = 0  # the growth of the file due to additions made so far
+    for span in sorted(spans, key=lambda span: span.start):
+        contents = document.sub(span.start, span.end)
+        inserted = []
+        for tasks in spans[span]:
+            contents, separator = _add_to_contents(
+                contents,
+                0,
+                len(contents),
+                tasks,
+                above,
+                ensure_separator,
+                followed=span.end < len(document),
+            )
+            inserted.extend((tasks, separator))
+        replacements.append((span.start, span.end, contents))
+        # the additions are whole lines added to the section, so the section
+        # index for the new contents can be derived from the original one
+        size = len(contents) - (span.end - span.start)
+        index = index.insert_lines(
+            span.start + shift,
+            size,
+            sum(text.count("\n") for text in inserted),
         )
+        shift += size
+    return make_file(document.splice(replacements, index))
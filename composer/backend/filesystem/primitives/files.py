@@ -1,5 +1,10 @@
+import hashlib
 from functools import wraps
 
+from .parse_cache import get_parse_cache
+from .document import MappedDocument, PieceTable, map_document
+from .storage import append_file as _append_file
+from .storage import map_file as _map_file
 from .storage import read_file as _read_file
 from .storage import write_file as _write_file
 
@@ -9,6 +14,216 @@ except ImportError:  # py3
     from io import StringIO
 
 
+# running total of the number of characters copied in duplicating file
+# contents, for use in profiling (see `get_bytes_copied`)
+_bytes_copied = 0
+
+
+def _record_copy(contents):
+    global _bytes_copied
+    _bytes_copied += len(contents)
+
+
+def get_bytes_copied():
+    """The number of bytes (characters) of file contents that have been copied
+    so far, e.g. in taking copies of files that have been written to, or in
+    writing to files that were created from existing contents. Reads and
+    copies of files that haven't been written to don't involve any copying.
+
+    :returns int: The number of bytes copied
+    """
+    return _bytes_copied
+
+
+def reset_bytes_copied():
+    """Reset the count of bytes copied, e.g. at the start of an operation
+    to be profiled.
+    """
+    global _bytes_copied
+    _bytes_copied = 0
+
+
+class TextBuffer(object):
+    """A file whose contents are an immutable string. Each buffer has its own
+    read position, but buffers created from the same contents share them, so
+    that copying a buffer, as `contain_file_mutation` does, doesn't copy the
+    contents. The contents are copied into a writable buffer only when the
+    file is actually written to.
+
+    The contents may also be provided as a
+    :class:`~composer.backend.filesystem.primitives.document.PieceTable`
+    or :class:`~composer.backend.filesystem.primitives.document.
+    MappedDocument` document, in which case they are only assembled into a
+    string if the file is actually read.
+
+    This supports the same interface as :class:`io.StringIO`, as far as the
+    planner uses it.
+
+    :param contents: The contents of the file, either a string or a
+        document
+    """
+
+    __slots__ = ('_text', '_document', '_position', '_file')
+
+    def __init__(self, contents=""):
+        if isinstance(contents, (PieceTable, MappedDocument)):
+            self._text = None
+            self._document = contents
+        else:
+            self._text = contents if contents is not None else ""
+            self._document = None
+        self._position = 0
+        self._file = None
+
+    def _contents(self):
+        if self._text is None:
+            self._text = self._document.getvalue()
+        return self._text
+
+    @property
+    def document(self):
+        """The contents of the file as a document, which may be edited
+        without copying the contents.
+
+        :returns :class:`~composer.backend.filesystem.primitives.document.
+            PieceTable`: The document
+        """
+        self._freeze()
+        if self._document is None:
+            self._document = PieceTable(self._text)
+        return self._document
+
+    def _materialize(self):
+        """Copy the contents into a writable buffer, if they haven't been
+        already.
+
+        :returns :class:`io.StringIO`: The writable buffer
+        """
+        if self._file is None:
+            text = self._contents()
+            _record_copy(text)
+            self._file = StringIO(text)
+            self._file.seek(self._position)
+            self._text = None
+            self._document = None
+        return self._file
+
+    def _freeze(self):
+        """Turn the writable buffer (if any) back into immutable contents so
+        that they can be shared again.
+        """
+        if self._file is not None:
+            self._text = self._file.getvalue()
+            _record_copy(self._text)
+            self._position = self._file.tell()
+            self._file = None
+            self._document = None
+
+    def copy(self):
+        """A copy of the file, positioned at the start.
+
+        :returns :class:`TextBuffer`: The copy
+        """
+        self._freeze()
+        copy = TextBuffer()
+        copy._text, copy._document = self._text, self._document
+        return copy
+
+    def getvalue(self):
+        if self._file is not None:
+            return self._file.getvalue()
+        return self._contents()
+
+    def read(self, size=-1):
+        if self._file is not None:
+            return self._file.read(size)
+        text = self._contents()
+        start = self._position
+        if size is None or size < 0:
+            end = len(text)
+        else:
+            end = min(start + size, len(text))
+        end = max(start, end)
+        self._position = end
+        return text[start:end]
+
+    def readline(self, size=-1):
+        if self._file is not None:
+            return self._file.readline(size)
+        text = self._contents()
+        start = self._position
+        end = text.find("\n", start) + 1 or len(text)
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+        end = max(start, end)
+        self._position = end
+        return text[start:end]
+
+    def readlines(self, hint=-1):
+        lines = []
+        total = 0
+        for line in self:
+            lines.append(line)
+            total += len(line)
+            if hint is not None and 0 < hint < total:
+                break
+        return lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    next = __next__  # py2
+
+    def seek(self, offset, whence=0):
+        if self._file is not None:
+            return self._file.seek(offset, whence)
+        if whence == 0:
+            if offset < 0:
+                raise ValueError("Negative seek position {}".format(offset))
+            self._position = offset
+        elif offset != 0:
+            raise OSError("Can't do nonzero relative seeks")
+        elif whence == 2:
+            self._position = len(self._contents())
+        elif whence != 1:
+            raise ValueError(
+                "Invalid whence ({}, should be 0, 1 or 2)".format(whence)
+            )
+        return self._position
+
+    def tell(self):
+        if self._file is not None:
+            return self._file.tell()
+        return self._position
+
+    def write(self, s):
+        return self._materialize().write(s)
+
+    def truncate(self, size=None):
+        return self._materialize().truncate(size)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+
 def contain_file_mutation(fn):
     """For functions that operate on files, this makes is so that these file
     arguments are passed in "by value" rather than "by reference," so that
@@ -18,32 +233,60 @@ def contain_file_mutation(fn):
     calling context. This allows file processing to be done in a "functional"
     way, keeping side-effects contained and eliminating the need for state
     management.
+
+    Copies of :class:`TextBuffer` files share their contents with the
+    original, so this doesn't entail copying the contents of the file unless
+    it has been written to.
     """
 
     @wraps(fn)
     def wrapper(*args, **kwargs):
         new_args = [
-            copy_file(arg) if isinstance(arg, StringIO) else arg
-            for arg in args
+            copy_file(arg) if _is_file(arg) else arg for arg in args
         ]
         new_kwargs = {
-            k: (copy_file(v) if isinstance(v, StringIO) else v)
-            for k, v in kwargs.items()
+            k: (copy_file(v) if _is_file(v) else v) for k, v in kwargs.items()
         }
         result = fn(*new_args, **new_kwargs)
         if isinstance(result, tuple):
-            new_result = [
-                copy_file(r) if isinstance(r, StringIO) else r for r in result
-            ]
+            new_result = [copy_file(r) if _is_file(r) else r for r in result]
         else:
-            new_result = (
-                copy_file(result) if isinstance(result, StringIO) else result
-            )
+            new_result = copy_file(result) if _is_file(result) else result
         return new_result
 
     return wrapper
 
 
+def _is_file(value):
+    return isinstance(value, (TextBuffer, StringIO))
+
+
+def get_document(file):
+    """Get the contents of a file as a document that may be edited without
+    copying the contents.
+
+    :param file: The file
+    :returns :class:`~composer.backend.filesystem.primitives.document.
+        PieceTable`: The document
+    """
+    if isinstance(file, TextBuffer):
+        return file.document
+    contents = file.getvalue()
+    _record_copy(contents)
+    return PieceTable(contents)
+
+
+def get_digest(file):
+    """A digest of the contents of a file, for determining whether the
+    contents have changed without retaining a copy of them.
+
+    :param :class:`io.StringIO` file: The file
+    :returns str: The digest
+    """
+    contents = file.getvalue().encode("utf-8", "surrogateescape")
+    return hashlib.sha1(contents).hexdigest()
+
+
 def make_file(contents=""):
     """'Files' (entailing the concept of "lines") are the abstraction level at
     which the planner is implemented in terms of the filesystem. We prefer to
@@ -52,10 +295,12 @@ def make_file(contents=""):
     namespace. We are concerned with the former notion of a file here, rather
     than the storage and indexing concerns.
 
-    :param str contents: A string to be treated as a file
-    :returns :class:`io.StringIO`: A file representation of the input
+    :param contents: A string (or a
+        :class:`~composer.backend.filesystem.primitives.document.PieceTable`
+        document) to be treated as a file
+    :returns :class:`TextBuffer`: A file representation of the input
     """
-    return StringIO(contents)
+    return TextBuffer(contents)
 
 
 def copy_file(file):
@@ -65,33 +310,124 @@ def copy_file(file):
     :param :class:`io.StringIO` file: The file to copy
     :returns :class:`io.StringIO`: A copy of the file
     """
-    # we only operate on StringIO files and not actual files
+    # we only operate on in-memory files and not actual files
     # except at the entry and exit points
-    return make_file(file.getvalue())
+    if isinstance(file, TextBuffer):
+        return file.copy()
+    contents = file.getvalue()
+    _record_copy(contents)
+    return make_file(contents)
+
+
+def _is_cacheable(cache, stat):
+    """Whether the structure of a file may be cached, so that it is worth
+    computing it up front to store it (otherwise it is only computed if it
+    is needed).
+    """
+    return (
+        cache is not None
+        and stat is not None
+        and stat.st_size >= cache.min_file_size
+    )
+
+
+def _get_cached(cache, path, stat, length):
+    """The cached structure of a file, if any.
 
+    :returns tuple: The section index and entry offsets of the file, either
+        of which may be None if it isn't cached
+    """
+    if not _is_cacheable(cache, stat):
+        return None, None
+    cached = cache.get(path, stat)
+    if cached is None:
+        return None, None
+    index, entry_starts = cached
+    if index.length != length:
+        return None, None
+    return index, entry_starts
+
+
+def _put_cached(cache, path, stat, index, entry_starts=None):
+    cache.put(path, stat, index, entry_starts)
 
-def read_file(filename, strip_newlines=False):
+
+def read_file(filename, strip_newlines=False, mapped=False):
     """Read a file on disk and produce an in-memory logical representation
     of the file. This logical representation will be used for analysis and
     processing so that the actual file on disk isn't affected until any
     such processing is complete.
 
     :param filename: Path to a file on disk
+    :param bool strip_newlines: Whether to strip leading and trailing
+        newlines from the contents
+    :param bool mapped: Whether to map the file into memory rather than
+        reading it, so that only those parts of it that are actually used
+        are decoded (see `map_document`). This is only worthwhile for large
+        files that are only read (e.g. historical logs), and the file must
+        not be modified on disk while the logical file is in use
     :returns :class:`io.StringIO`: A logical file mirroring the file on disk
     """
+    # the structure of the file may be cached from an earlier read, if it
+    # hasn't changed since (see `set_parse_cache`)
+    cache = None if strip_newlines else get_parse_cache()
+    if mapped and not strip_newlines:
+        mapping, stat = _map_file(filename, with_status=True)
+        if mapping is not None:
+            index, _ = _get_cached(cache, filename, stat, len(mapping))
+            document = map_document(mapping, index)
+            if document is not None:
+                if index is None and _is_cacheable(cache, stat):
+                    _put_cached(cache, filename, stat, document.index)
+                return make_file(document)
+            # the contents must be decoded, so they are read instead
+            mapping.close()
+    if cache is not None:
+        contents, stat = _read_file(filename, with_status=True)
+        if not _is_cacheable(cache, stat):
+            # leave the file to be indexed lazily, if at all
+            return make_file(contents)
+        index, entry_starts = _get_cached(cache, filename, stat, len(contents))
+        document = PieceTable(contents, index, entry_starts)
+        if entry_starts is None:
+            _put_cached(
+                cache,
+                filename,
+                stat,
+                document.index,
+                document.entry_starts,
+            )
+        return make_file(document)
     contents = _read_file(filename)
     if strip_newlines:
         contents = contents.strip('\n')
     return make_file(contents)
 
 
-def write_file(file, filename):
+def write_file(file, filename, transaction=None):
     """Write a logical file as an actual file on disk.
 
     :param :class:`io.StringIO` file: The file to write
     :param filename: Path to write to
+    :param transaction: A
+        :class:`~composer.backend.filesystem.primitives.storage.Transaction`
+        in which to stage the write, if any, in which case the file is only
+        written when the transaction is committed
+    """
+    if transaction is not None:
+        transaction.write_file(file.read(), filename)
+    else:
+        _write_file(file.read(), filename)
+
+
+def append_file(file, filename):
+    """Append a logical file to an actual file on disk, without reading or
+    rewriting the existing contents of the file on disk.
+
+    :param :class:`io.StringIO` file: The file to append
+    :param filename: Path to append to
     """
-    _write_file(file.read(), filename)
+    _append_file(file.read(), filename)
 
 
 @contain_file_mutation
@@ -109,23 +445,23 @@ def partition_at(file, pattern, or_eof=False, inclusive=False):
     :returns tuple: A pair with a file containing the contents before
         the pattern, and another file containing the contents after
     """
-    before, after = make_file(), make_file()
+    before, after = [], []
     line = file.readline()
     while line:
         if not pattern.search(line):
-            before.write(line)
+            before.append(line)
             line = file.readline()
             continue
         if inclusive:
-            before.write(line)
+            before.append(line)
         else:
-            after.write(line)
+            after.append(line)
         break
     if not line and not or_eof:
         raise ValueError("Pattern {} not found in file!".format(pattern))
-    after.write(file.read())
+    after.append(file.read())
 
-    return before, after
+    return make_file("".join(before)), make_file("".join(after))
 
 
 @contain_file_mutation
@@ -0,0 +1,127 @@
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+
+from ....timeperiod import PeriodInstance
+from .parse_cache import MINIMUM_AGE
+from .storage import parse_log_filename
+
+# the indexes of directories on disk that have already been listed, by
+# path, along with the modification times of the directories when they were
+# listed (see `get_log_index`)
+_directory_indexes = {}
+
+
+class LogIndex(object):
+    """An index of the log files in a planner wiki by the period instances
+    that they track, e.g. the log for the week of December 2, 2012. The logs
+    for each period are kept in chronological order, and since instances of
+    a period don't overlap, the logs covering a range of dates can be looked
+    up directly rather than computed and checked one instance at a time.
+
+    :param names: The names of the files in the wiki. Names that aren't
+        names of logs are ignored
+    """
+
+    def __init__(self, names=()):
+        self._logs = {}
+        # for each period, the instances with logs in order, and their
+        # start and end dates, for bisecting
+        self._instances = {}
+        self._starts = {}
+        self._ends = {}
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_directory(cls, path):
+        """Index the logs in a directory on disk.
+
+        :param str path: Filesystem path to the wiki
+        :returns :class:`LogIndex`: The index
+        """
+        return cls(
+            entry.name
+            for entry in os.scandir(path)
+            if not entry.is_dir(follow_symlinks=False)
+        )
+
+    def __len__(self):
+        return len(self._logs)
+
+    def __contains__(self, instance):
+        return instance in self._logs
+
+    def add(self, name):
+        """Add a file to the index, if it is a log.
+
+        :param str name: The name of the file
+        :returns :class:`~composer.timeperiod.PeriodInstance`: The instance
+            tracked by the log, or None if the file isn't a log
+        """
+        log = parse_log_filename(name)
+        if log is None:
+            return None
+        instance = PeriodInstance.for_date(*log)
+        if instance not in self._logs:
+            period = instance.period
+            instances = self._instances.setdefault(period, [])
+            starts = self._starts.setdefault(period, [])
+            ends = self._ends.setdefault(period, [])
+            position = bisect_left(starts, instance.start)
+            instances.insert(position, instance)
+            starts.insert(position, instance.start)
+            insort(ends, instance.end)
+        self._logs[instance] = name
+        return instance
+
+    def get(self, instance):
+        """The log for a period instance.
+
+        :param :class:`~composer.timeperiod.PeriodInstance` instance: The
+            period instance
+        :returns str: The name of the log, or None if there is no log for
+            the instance
+        """
+        return self._logs.get(instance)
+
+    def find(self, period, start_date, end_date=None):
+        """The logs for a period that cover a range of dates, i.e. those for
+        every instance of the period that overlaps the range.
+
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :param :class:`datetime.date` start_date: The first date in the range
+        :param :class:`datetime.date` end_date: The last date in the range
+            (by default, the start date)
+        :returns list: (instance, log name) pairs, in chronological order
+        """
+        if end_date is None:
+            end_date = start_date
+        instances = self._instances.get(period, [])
+        first = bisect_left(self._ends.get(period, []), start_date)
+        last = bisect_right(self._starts.get(period, []), end_date)
+        return [
+            (instance, self._logs[instance])
+            for instance in instances[first:last]
+        ]
+
+
+def get_log_index(path):
+    """The index of the logs in a directory on disk. The directory is only
+    listed again once its modification time has changed, i.e. once files
+    have been added to it, removed from it or renamed, so that checking
+    whether logs exist doesn't touch the disk beyond a single `os.stat`.
+
+    :param str path: Filesystem path to the wiki
+    :returns :class:`LogIndex`: The index
+    """
+    stat = os.stat(path)
+    cached = _directory_indexes.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns:
+        return cached[1]
+    index = LogIndex.from_directory(path)
+    # a directory modified very recently could be modified again without
+    # its modification time changing (see `MINIMUM_AGE`)
+    if time.time() - stat.st_mtime >= MINIMUM_AGE:
+        _directory_indexes[path] = (stat.st_mtime_ns, index)
+    return index
@@ -0,0 +1,211 @@
+import hashlib
+import marshal
+import os
+import time
+
+from .sections import SectionIndex, SectionSpan
+
+# the version of the parsed structure stored in the cache. This should be
+# incremented whenever the way files are parsed into sections or entries
+# changes, so that structure cached by earlier versions isn't used
+PARSER_VERSION = 1
+
+# the default maximum total size of the cache on disk, in bytes
+DEFAULT_CACHE_SIZE = 32 << 20
+
+# files smaller than this (in bytes) aren't cached by default, since parsing
+# them is quicker than reading their structure from the cache
+DEFAULT_MIN_FILE_SIZE = 16 << 10
+
+# a cached structure is only marked as recently used if it hasn't been for
+# this long (in seconds), so that reading from the cache seldom writes to it
+USAGE_RESOLUTION = 24 * 60 * 60
+
+# files modified more recently than this (in seconds) aren't cached, since
+# they could be modified again without their modification time changing
+# (filesystem timestamps may be coarse)
+MINIMUM_AGE = 2
+
+CACHE_SUFFIX = ".cache"
+
+
+def _stat_key(stat):
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ParseCache(object):
+    """A persistent cache of the parsed structure of wiki files, i.e. their
+    section index and the offsets of their entries, so that files that
+    haven't changed since they were last read needn't be parsed again.
+
+    Each file's structure is stored in its own file in the cache directory,
+    keyed by the path of the file, its modification time and size, and the
+    parser version. When the cache grows beyond its maximum size, the least
+    recently used structures are evicted (to within `USAGE_RESOLUTION`).
+
+    Only files at least `min_file_size` bytes long are cached, since for
+    smaller files, reading the cached structure costs more than parsing it.
+
+    :param str directory: The directory in which to store the cache
+    :param int max_size: The maximum total size of the cache, in bytes
+    :param int min_file_size: The size (in bytes) below which files aren't
+        cached
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_size=DEFAULT_CACHE_SIZE,
+        min_file_size=DEFAULT_MIN_FILE_SIZE,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.min_file_size = min_file_size
+        # the total size of the cache, once it is known
+        self._size = None
+
+    def _cache_path(self, path):
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + CACHE_SUFFIX)
+
+    def get(self, path, stat):
+        """Get the cached structure for a file, if it is present and still
+        valid.
+
+        :param str path: Filesystem path to the file
+        :param :class:`os.stat_result` stat: The status of the file as it was
+            read
+        :returns tuple: The :class:`~composer.backend.filesystem.primitives.
+            sections.SectionIndex` and the list of entry offsets (which may be
+            None) for the file, or None if they aren't cached
+        """
+        if stat.st_size < self.min_file_size:
+            return None
+        cache_path = self._cache_path(path)
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+                used = os.fstat(f.fileno()).st_mtime
+            version, key, length, spans, entry_starts = marshal.loads(data)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != PARSER_VERSION or tuple(key) != _stat_key(stat):
+            return None
+        if time.time() - used > USAGE_RESOLUTION:
+            try:
+                # mark as recently used
+                os.utime(cache_path)
+            except OSError:
+                pass
+        index = SectionIndex._from_spans(
+            [SectionSpan(*span) for span in spans], length
+        )
+        return index, entry_starts
+
+    def put(self, path, stat, index, entry_starts=None):
+        """Store the structure of a file in the cache.
+
+        :param str path: Filesystem path to the file
+        :param :class:`os.stat_result` stat: The status of the file as it was
+            read
+        :param :class:`~composer.backend.filesystem.primitives.sections.
+            SectionIndex` index: The section index for the file
+        :param list entry_starts: The offsets of the entries in the file
+        """
+        if stat.st_size < self.min_file_size:
+            return
+        if time.time() - stat.st_mtime < MINIMUM_AGE:
+            return
+        data = marshal.dumps(
+            (
+                PARSER_VERSION,
+                _stat_key(stat),
+                index.length,
+                [tuple(span) for span in index.sections],
+                entry_starts,
+            )
+        )
+        cache_path = self._cache_path(path)
+        temporary = "{}.{}.tmp".format(cache_path, os.getpid())
+        try:
+            replaced = os.path.getsize(cache_path)
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, cache_path)
+        except OSError:
+            # the cache is only an optimization
+            return
+        if self._size is None:
+            # the cache is only listed when it is first written to, and
+            # subsequently only if it grows too large
+            self._size = self._get_size()
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_size:
+            self._evict()
+
+    def _get_entries(self):
+        """The structures in the cache.
+
+        :returns list: (last used time, size, path) triples
+        """
+        try:
+            return [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(CACHE_SUFFIX)
+            ]
+        except OSError:
+            return []
+
+    def _get_size(self):
+        return sum(size for _, size, _ in self._get_entries())
+
+    def _evict(self):
+        """Remove the least recently used structures from the cache until it
+        is no larger than its maximum size.
+        """
+        entries = self._get_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, cache_path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        """Remove all structures from the cache."""
+        max_size, self.max_size = self.max_size, 0
+        try:
+            self._evict()
+        finally:
+            self.max_size = max_size
+
+
+# the cache used in reading files, if any
+_parse_cache = None
+
+
+def get_parse_cache():
+    """The cache used in reading files.
+
+    :returns :class:`ParseCache`: The cache, or None if files aren't cached
+    """
+    return _parse_cache
+
+
+def set_parse_cache(cache):
+    """Set the cache to be used in reading files.
+
+    :param :class:`ParseCache` cache: The cache, or None to disable caching
+    """
+    global _parse_cache
+    _parse_cache = cache
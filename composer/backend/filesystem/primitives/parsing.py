@@ -1,6 +1,5 @@
 import re
-
-from .files import make_file
+from enum import Enum
 
 # TODO: probably best to enforce section names as all caps to avoid
 # parsing ambiguity with arbitrary non-task entries
@@ -8,6 +7,165 @@ SECTION_PATTERN = re.compile(r"^[A-Z][A-Z][A-Za-z ]+:")
 SECTION_OR_EOF_PATTERN = re.compile(r"(^[A-Z][A-Z][A-Za-z ]+:|\A\Z)")
 TASK_PATTERN = re.compile(r"^\t*\[")
 SECTION_SEPARATOR = '\n'
+SCHEDULED_DATE_PATTERN = re.compile(r"\[\$?([^\[\$]*)\$?\]$")
+# the start of any line that isn't a subtask, and therefore begins an entry
+ENTRY_START_PATTERN = re.compile(r"^(?=[^\t])", re.MULTILINE)
+
+
+class TaskStatus(Enum):
+    """The status of a task, as indicated by the character in the brackets
+    at the start of the task, e.g. "[x] a done task"."""
+
+    UNDONE = " "
+    DONE = "x"
+    WIP = "\\"
+    INVALID = "-"
+    SCHEDULED = "o"
+    # a task with a status that isn't recognized
+    OTHER = None
+
+
+# tasks are classified by their leading bracket and status character
+_TASK_STATUSES = {
+    "[" + status.value: status for status in TaskStatus if status.value
+}
+
+COMPLETED_STATUSES = frozenset(
+    (TaskStatus.DONE, TaskStatus.INVALID, TaskStatus.SCHEDULED)
+)
+UNFINISHED_STATUSES = frozenset(TaskStatus) - COMPLETED_STATUSES
+
+
+def _classify(text):
+    status = _TASK_STATUSES.get(text[:2])
+    if status is None and text.startswith("["):
+        return TaskStatus.OTHER
+    return status
+
+
+# placeholder for metadata that hasn't been parsed yet
+_UNPARSED = object()
+
+
+class Entry(object):
+    """An entry (see `read_entry`), together with metadata about it that is
+    parsed once and cached, so that it need not be re-parsed each time the
+    entry is inspected. The type predicates in this module accept either
+    entries of this type or plain strings.
+
+    :param str text: The text of the entry
+    """
+
+    __slots__ = ('text', 'status', 'header_end', '_scheduled_date_span')
+
+    def __init__(self, text):
+        self.text = text
+        # the status of the task, or None if the entry isn't a task
+        self.status = _classify(text)
+        # the offset of the end of the header (i.e. the first line) of the
+        # entry; any subtasks or other contents follow it
+        self.header_end = text.find("\n") + 1 or len(text)
+        self._scheduled_date_span = _UNPARSED
+
+    @property
+    def header(self):
+        return self.text[: self.header_end]
+
+    @property
+    def contents(self):
+        return self.text[self.header_end :]
+
+    @property
+    def scheduled_date_span(self):
+        """The offsets in the header delimiting the scheduled date indicator
+        (e.g. "[$TUESDAY$]"), and the scheduled date (e.g. "TUESDAY") within
+        it, or None if there is no scheduled date.
+
+        :returns tuple: The start and end of the indicator, and the start and
+            end of the date
+        """
+        if self._scheduled_date_span is _UNPARSED:
+            match = SCHEDULED_DATE_PATTERN.search(
+                self.text, 0, self.header_end
+            )
+            self._scheduled_date_span = (
+                match.span() + match.span(1) if match else None
+            )
+        return self._scheduled_date_span
+
+    @property
+    def scheduled_date(self):
+        """The scheduled date, as it is written in the entry.
+
+        :returns str: The scheduled date, or None if there isn't one
+        """
+        span = self.scheduled_date_span
+        if span is None:
+            return None
+        _, _, start, end = span
+        return self.text[start:end]
+
+    def reschedule(self, date_string):
+        """Replace the scheduled date indicator in the entry with one for the
+        given date. The entry is expected to have a scheduled date.
+
+        :param str date_string: The new scheduled date
+        :returns :class:`Entry`: The rescheduled entry
+        """
+        start, end, _, _ = self.scheduled_date_span
+        return Entry(
+            self.text[:start] + "[$" + date_string + "$]" + self.text[end:]
+        )
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return "Entry({!r})".format(self.text)
+
+    def __eq__(self, other):
+        if isinstance(other, Entry):
+            return self.text == other.text
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(self.text)
+
+
+def as_entry(entry):
+    """Get an :class:`Entry` for an entry, which may be either a string or
+    already an Entry.
+
+    :param entry: The entry
+    :returns :class:`Entry`: The entry as an Entry
+    """
+    return entry if isinstance(entry, Entry) else Entry(entry)
+
+
+def entry_text(entry):
+    """Get the text of an entry, which may be either a string or an
+    :class:`Entry`.
+
+    :param entry: The entry
+    :returns str: The text of the entry
+    """
+    return entry.text if isinstance(entry, Entry) else entry
+
+
+def get_status(entry):
+    """The status of a task.
+
+    :param entry: The entry, either a string or an :class:`Entry`
+    :returns :class:`TaskStatus`: The status, or None if the entry isn't a
+        task
+    """
+    if isinstance(entry, Entry):
+        return entry.status
+    return _classify(entry)
 
 
 def get_section_pattern(section):
@@ -19,45 +177,45 @@ def get_section_pattern(section):
 # substitutions via re.sub, which could be used for automatic
 # processing of tasks in terms of their status
 def is_scheduled_task(line):
-    return line.startswith("[o")
+    return get_status(line) is TaskStatus.SCHEDULED
 
 
 def is_task(line):
-    return line.startswith("[")
+    return get_status(line) is not None
 
 
 def is_subtask(line):
-    return line.startswith("\t")
+    return entry_text(line).startswith("\t")
 
 
 def is_section(line, section_name=None):
     pattern = (
         get_section_pattern(section_name) if section_name else SECTION_PATTERN
     )
-    return pattern.search(line)
+    return pattern.search(entry_text(line))
 
 
 def is_blank_line(line):
-    return line.startswith("\n")
+    return entry_text(line).startswith("\n")
 
 
 is_section_separator = is_blank_line
 
 
 def is_done_task(line):
-    return line.startswith("[x")
+    return get_status(line) is TaskStatus.DONE
 
 
 def is_invalid_task(line):
-    return line.startswith("[-")
+    return get_status(line) is TaskStatus.INVALID
 
 
 def is_undone_task(line):
-    return line.startswith("[ ")
+    return get_status(line) is TaskStatus.UNDONE
 
 
 def is_wip_task(line):
-    return line.startswith("[\\")
+    return get_status(line) is TaskStatus.WIP
 
 
 def is_eof(line):
@@ -71,13 +229,8 @@ def is_completed(entry):
     exhaustive, since there are entries for which completeness is not
     applicable.
     """
-    return any(
-        (
-            is_done_task(entry),
-            is_invalid_task(entry),
-            is_scheduled_task(entry),  # handled elsewhere
-        )
-    )
+    # scheduled tasks are handled elsewhere
+    return get_status(entry) in COMPLETED_STATUSES
 
 
 def is_not_completed(entry):
@@ -94,7 +247,7 @@ def is_unfinished(entry):
     exhaustive, since there are entries for which completeness is not
     applicable.
     """
-    return is_task(entry) and not is_completed(entry)
+    return get_status(entry) in UNFINISHED_STATUSES
 
 
 def parse_task(task):
@@ -106,7 +259,7 @@ def parse_task(task):
     :param str task: The task to parse
     :returns tuple: The header and the contents, both strings
     """
-    f = make_file(task)
-    header = f.readline()
-    contents = f.read()
-    return header, contents
+    if isinstance(task, Entry):
+        return task.header, task.contents
+    header_end = task.find("\n") + 1 or len(task)
+    return task[:header_end], task[header_end:]
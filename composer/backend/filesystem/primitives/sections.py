@@ -0,0 +1,239 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .parsing import SECTION_PATTERN
+
+# the same pattern as SECTION_PATTERN, but for use in scanning a whole file
+# at once rather than one line at a time
+SECTION_HEADER_PATTERN = re.compile(SECTION_PATTERN.pattern, re.MULTILINE)
+# newlines preceding section headers. Scanning for these rather than for
+# SECTION_HEADER_PATTERN is much faster, since the regex engine can skip
+# ahead to each newline rather than trying to match at every position
+SECTION_BREAK_PATTERN = re.compile(
+    r"\n(?=" + SECTION_PATTERN.pattern[1:] + ")"
+)
+# the same patterns, for scanning the (undecoded) contents of memory-mapped
+# files
+SECTION_BYTES_PATTERN = re.compile(SECTION_PATTERN.pattern.encode())
+SECTION_BREAK_BYTES_PATTERN = re.compile(
+    SECTION_BREAK_PATTERN.pattern.encode()
+)
+
+# the number of distinct file contents for which section indexes are retained
+SECTION_INDEX_CACHE_SIZE = 32
+
+# A section in a file. `header` is the header line (e.g. "AGENDA:") without
+# the trailing newline, `line` and `end_line` are the (0-based) line numbers
+# of the header and of the line following the section, and `header_start`,
+# `start` and `end` are offsets into the file delimiting the header and the
+# contents of the section, respectively.
+SectionSpan = namedtuple(
+    'SectionSpan', 'header line end_line header_start start end'
+)
+
+
+# the size of the chunks in which lines in memory-mapped contents are counted
+LINE_COUNT_CHUNK_SIZE = 1 << 20
+
+
+def _count_lines(text, start, end=None):
+    if isinstance(text, str):
+        return text.count("\n", start, end)
+    # memory-mapped contents don't support counting in place, so count them
+    # a chunk at a time
+    end = len(text) if end is None else end
+    return sum(
+        text[offset : min(offset + LINE_COUNT_CHUNK_SIZE, end)].count(b"\n")
+        for offset in range(start, end, LINE_COUNT_CHUNK_SIZE)
+    )
+
+
+class SectionIndex(object):
+    """An index of the sections in a file, built in a single scan of the file
+    contents. This allows sections to be looked up by name without scanning
+    the file line by line each time.
+
+    The contents may also be the ASCII-encoded contents of a memory-mapped
+    file (see :class:`~composer.backend.filesystem.primitives.document.
+    MappedDocument`), which are scanned without being decoded.
+
+    :param text: The contents of the file, a string or a memory-mapped
+        buffer
+    """
+
+    def __init__(self, text):
+        self.length = len(text)
+        if isinstance(text, str):
+            first, breaks, newline_char = (
+                SECTION_PATTERN,
+                SECTION_BREAK_PATTERN,
+                "\n",
+            )
+        else:
+            first, breaks, newline_char = (
+                SECTION_BYTES_PATTERN,
+                SECTION_BREAK_BYTES_PATTERN,
+                b"\n",
+            )
+        header_starts = [0] if first.match(text) else []
+        header_starts.extend(match.end() for match in breaks.finditer(text))
+        headers = []
+        line = 0
+        previous = 0
+        for header_start in header_starts:
+            line += _count_lines(text, previous, header_start)
+            previous = header_start
+            newline = text.find(newline_char, header_start)
+            if newline == -1:
+                header, start = text[header_start:], None
+            else:
+                header, start = text[header_start:newline], newline + 1
+            if not isinstance(header, str):
+                header = header.decode("ascii")
+            headers.append((header, line, header_start, start))
+        self.sections = []
+        for i, (header, line, header_start, start) in enumerate(headers):
+            if start is None:
+                start = self.length
+            if i + 1 < len(headers):
+                _, end_line, end, _ = headers[i + 1]
+            else:
+                end = self.length
+                end_line = line + _count_lines(text, header_start)
+            self.sections.append(
+                SectionSpan(header, line, end_line, header_start, start, end)
+            )
+
+    @classmethod
+    def _from_spans(cls, sections, length):
+        index = cls.__new__(cls)
+        index.sections = sections
+        index.length = length
+        return index
+
+    def insert(self, offset, text):
+        """Derive the index for the contents resulting from inserting some
+        text at a given offset, without rescanning the contents. This is only
+        possible if the insertion can't affect which lines are section
+        headers, i.e. if the text consists of whole lines that aren't section
+        headers, and it is inserted at the start of a line.
+
+        :param int offset: The offset at which the text is inserted
+        :param str text: The inserted text, which should be inserted at
+            the start of a line
+        :returns :class:`SectionIndex`: The derived index, or None if it
+            can't be derived without rescanning the contents
+        """
+        if not text:
+            return self
+        if not text.endswith("\n") or SECTION_HEADER_PATTERN.search(text):
+            return None
+        return self.insert_lines(offset, len(text), text.count("\n"))
+
+    def insert_lines(self, offset, size, lines):
+        """Derive the index for the contents resulting from inserting whole
+        lines that aren't section headers at the start of a line, given only
+        the size of the inserted text and the number of lines in it.
+
+        :param int offset: The offset at which the lines are inserted
+        :param int size: The length of the inserted text
+        :param int lines: The number of lines inserted
+        :returns :class:`SectionIndex`: The derived index
+        """
+        sections = []
+        for span in self.sections:
+            if span.header_start >= offset:
+                span = SectionSpan(
+                    span.header,
+                    span.line + lines,
+                    span.end_line + lines,
+                    span.header_start + size,
+                    span.start + size,
+                    span.end + size,
+                )
+            elif span.start <= offset <= span.end:
+                span = span._replace(
+                    end_line=span.end_line + lines, end=span.end + size
+                )
+            sections.append(span)
+        return self._from_spans(sections, self.length + size)
+
+    def delete(self, start, end, text):
+        """Derive the index for the contents resulting from deleting a range
+        of lines from the contents of a section, without rescanning the
+        contents.
+
+        :param int start: The start of the deleted range, at the start of a
+            line
+        :param int end: The end of the deleted range
+        :param str text: The deleted text
+        :returns :class:`SectionIndex`: The derived index, or None if the
+            range isn't within the contents of a single section
+        """
+        if start == end:
+            return self
+        if not text.endswith("\n"):
+            return None
+        size = end - start
+        lines = text.count("\n")
+        sections = []
+        contained = False
+        for span in self.sections:
+            if span.header_start >= end:
+                span = SectionSpan(
+                    span.header,
+                    span.line - lines,
+                    span.end_line - lines,
+                    span.header_start - size,
+                    span.start - size,
+                    span.end - size,
+                )
+            elif span.start <= start and end <= span.end:
+                contained = True
+                span = span._replace(
+                    end_line=span.end_line - lines, end=span.end - size
+                )
+            elif span.end > start:
+                # the range includes a section header
+                return None
+            sections.append(span)
+        if not contained:
+            return None
+        return self._from_spans(sections, self.length - size)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def find(self, section):
+        """Find a section by name. As with the section patterns used
+        elsewhere, the name matches any section header that it is a prefix
+        of, and the first such section in the file is returned.
+
+        :param str section: The name of the section
+        :returns :class:`SectionSpan`: The span of the section
+        """
+        name = section.upper()
+        for span in self.sections:
+            if span.header.startswith(name):
+                return span
+        raise ValueError("Section {} not found in file!".format(section))
+
+
+@lru_cache(maxsize=SECTION_INDEX_CACHE_SIZE)
+def _build_section_index(text):
+    return SectionIndex(text)
+
+
+def get_section_index(text):
+    """Get the section index for some file contents. Indexes are cached by
+    contents, so that the index is built once for each version of a file and
+    reused until the file is modified.
+
+    :param str text: The contents of the file
+    :returns :class:`SectionIndex`: The section index
+    """
+    return _build_section_index(text)
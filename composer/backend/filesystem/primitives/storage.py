@@ -1,4 +1,8 @@
+import datetime
+import mmap
 import os
+import re
+from collections import OrderedDict
 
 from ....timeperiod import Day, Week, Month, Quarter, Year, quarter_for_month
 
@@ -41,6 +45,55 @@ def get_log_filename(for_date, period, root=None):
     return path
 
 
+# names of log files for each period (see `get_log_filename`)
+LOG_FILENAME_PATTERNS = (
+    (
+        Week,
+        re.compile(
+            r"^Week of (?P<month>\w+) (?P<day>\d+), (?P<year>\d+)\.wiki$"
+        ),
+    ),
+    (Month, re.compile(r"^Month of (?P<month>\w+), (?P<year>\d+)\.wiki$")),
+    (Quarter, re.compile(r"^Q(?P<quarter>[1-4]) (?P<year>\d+)\.wiki$")),
+    (Year, re.compile(r"^(?P<year>\d+)\.wiki$")),
+    (Day, re.compile(r"^(?P<month>\w+) (?P<day>\d+), (?P<year>\d+)\.wiki$")),
+)
+
+
+def parse_log_filename(name):
+    """The period and start date of the log with the given filename, if it
+    is the name of a log.
+
+    :param str name: The filename
+    :returns tuple: The :class:`~composer.timeperiod.Period` and the start
+        date (:class:`datetime.date`) of the log, or None if the filename
+        isn't the name of a log
+    """
+    for period, pattern in LOG_FILENAME_PATTERNS:
+        match = pattern.match(name)
+        if not match:
+            continue
+        fields = match.groupdict()
+        try:
+            if 'quarter' in fields:
+                month = 3 * int(fields['quarter']) - 2
+            elif 'month' in fields:
+                month = datetime.datetime.strptime(
+                    fields['month'], "%B"
+                ).month
+            else:
+                month = 1
+            for_date = datetime.date(
+                int(fields['year']), month, int(fields.get('day') or 1)
+            )
+        except ValueError:
+            continue
+        start_date = period.get_start_date(for_date)
+        if get_log_filename(start_date, period) == name:
+            return period, start_date
+    return None
+
+
 def full_file_path(filename, root, dereference=False):
     """Given a path root and a filename, construct an OS-specific filesystem
     path.
@@ -91,15 +144,70 @@ def bare_filename(filename):
     return strip_extension(strip_prefix(filename))
 
 
-def read_file(path):
+def _is_unmodified(before, after):
+    return (before.st_mtime_ns, before.st_size) == (
+        after.st_mtime_ns,
+        after.st_size,
+    )
+
+
+def get_directory_state(path):
+    """The state of the files (and links) in a directory on disk, i.e.
+    their modification times and sizes, by name. The directory is only
+    listed, and none of its files are read, so comparing states taken at
+    different times is a cheap way to tell whether any of the files were
+    changed, added or removed in the meantime.
+
+    :param str path: Filesystem path to the directory
+    :returns dict: (modification time in nanoseconds, size) pairs, by name
+    """
+    state = {}
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def read_file(path, with_status=False):
     """Read a file on disk.
 
     :param str path: Filesystem path to the file
-    :returns str: Contents of the file
+    :param bool with_status: Whether to also return the status of the file
+        as it was read
+    :returns str: Contents of the file. If `with_status` is true, a pair of
+        the contents and the :class:`os.stat_result` of the file, which is
+        None if the file was modified while it was being read
     """
     with open(path, "r") as f:
+        if not with_status:
+            return f.read()
+        before = os.fstat(f.fileno())
         contents = f.read()
-    return contents
+        after = os.fstat(f.fileno())
+    return contents, (after if _is_unmodified(before, after) else None)
+
+
+def map_file(path, with_status=False):
+    """Map a file on disk into memory, for reading its contents without
+    reading them all into memory up front.
+
+    :param str path: Filesystem path to the file
+    :param bool with_status: Whether to also return the status of the file
+        as it was mapped
+    :returns :class:`mmap.mmap`: The (read-only) mapped contents of the
+        file, or None if the file is empty, since empty files can't be
+        mapped. If `with_status` is true, a pair of the mapped contents and
+        the :class:`os.stat_result` of the file
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            mapping = None
+        else:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return (mapping, stat) if with_status else mapping
 
 
 def write_file(contents, path):
@@ -110,3 +218,171 @@ def write_file(contents, path):
     """
     with open(path, "w") as f:
         f.write(contents)
+
+
+def append_file(contents, path):
+    """Append to a file on disk (creates the file if not present). The file
+    is opened for appending, so that the contents are written at the end of
+    the file without reading or rewriting what is already there.
+
+    :param str contents: Contents to be appended to the file
+    :param str path: Filesystem path to the file
+    """
+    with open(path, "a") as f:
+        f.write(contents)
+
+
+class Transaction(object):
+    """A set of changes to files on disk that are made together, e.g. in
+    saving the planner after an advance. Files written and links created as
+    part of the transaction are only staged, and nothing on disk is changed
+    until the transaction is committed. At that point, the new contents of
+    all of the files are written to temporary files alongside the originals
+    and synced to disk, and only then renamed over the originals. Links are
+    similarly created under temporary names and renamed into place.
+
+    Each file and link is replaced atomically, so that a crash can't leave a
+    file half-written or a link missing, and the window in which some files
+    have been replaced but not others is reduced to the time taken to rename
+    them. Each file is synced as it is written, but each directory is only
+    synced once, after all of the files in it have been replaced.
+
+    Files that are symbolic links are written through the link, i.e. it is
+    the file that the link points to that is replaced, as when writing the
+    file directly.
+
+    This may be used as a context manager, in which case the transaction is
+    committed on exiting the context, unless an exception was raised.
+    """
+
+    def __init__(self):
+        # staged contents and link targets by path, in the order in which
+        # they were staged
+        self._files = OrderedDict()
+        self._links = OrderedDict()
+        # functions to call once the changes have been made
+        self._callbacks = []
+
+    def write_file(self, contents, path):
+        """Stage writing a file (see `write_file`). If the same file is
+        written more than once in the transaction, the last contents
+        written are the ones that are saved.
+
+        :param str contents: Contents to be written to the file
+        :param str path: Filesystem path to the file
+        """
+        self._files.pop(path, None)
+        self._files[path] = contents
+
+    def symlink(self, target, path):
+        """Stage creating (or replacing) a symbolic link.
+
+        :param str target: The path that the link should point to
+        :param str path: Filesystem path to the link
+        """
+        self._links.pop(path, None)
+        self._links[path] = target
+
+    def on_commit(self, callback):
+        """Register a function to be called (without arguments) once the
+        transaction has been committed, i.e. once all of the staged changes
+        have been made on disk. It isn't called if committing fails, or if
+        the transaction is never committed.
+
+        :param callable callback: The function
+        """
+        self._callbacks.append(callback)
+
+    def commit(self):
+        """Make all of the staged changes on disk."""
+        staged = []
+        try:
+            for path, contents in self._files.items():
+                # replace the file that the path refers to rather than any
+                # link at the path
+                path = os.path.realpath(path)
+                staged.append((_write_temporary_file(contents, path), path))
+            for path, target in self._links.items():
+                temporary = _temporary_path(path)
+                _remove_if_present(temporary)
+                os.symlink(target, temporary)
+                staged.append((temporary, path))
+        except Exception:
+            for temporary, _ in staged:
+                _remove_if_present(temporary)
+            raise
+        for temporary, path in staged:
+            os.replace(temporary, path)
+        for directory in set(os.path.dirname(path) for _, path in staged):
+            _sync_directory(directory)
+        self._files.clear()
+        self._links.clear()
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+
+def _temporary_path(path):
+    directory, filename = os.path.split(path)
+    return os.path.join(
+        directory, ".{}.{}.tmp".format(filename, os.getpid())
+    )
+
+
+def _remove_if_present(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_temporary_file(contents, path):
+    """Write contents intended for a file to a temporary file alongside it,
+    and sync the temporary file to disk.
+
+    :param str contents: Contents to be written to the file
+    :param str path: Filesystem path to the file
+    :returns str: The path to the temporary file
+    """
+    temporary = _temporary_path(path)
+    _remove_if_present(temporary)
+    try:
+        # the file should retain its permissions after being replaced
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(temporary, mode)
+    except Exception:
+        _remove_if_present(temporary)
+        raise
+    return temporary
+
+
+def _sync_directory(directory):
+    """Sync a directory to disk, so that renames within it are durable.
+    This isn't supported on all platforms, in which case it does nothing.
+
+    :param str directory: Filesystem path to the directory
+    """
+    flags = getattr(os, "O_DIRECTORY", None)
+    if flags is None:
+        return
+    fd = os.open(directory or os.curdir, os.O_RDONLY | flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
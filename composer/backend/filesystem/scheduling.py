@@ -1,9 +1,11 @@
-import re
+from collections import namedtuple
+from functools import lru_cache
 
 from ...errors import (
     BlockedTaskNotScheduledError,
     DateFormatError,
     LogfileLayoutError,
+    RelativeDateError,
     SchedulingDateError,
 )
 from ...timeperiod import (
@@ -15,7 +17,8 @@ from ...timeperiod import (
     quarter_for_month,
     get_month_name,
 )
-from .primitives import read_section, parse_task
+from .primitives import read_section
+from .primitives.parsing import SCHEDULED_DATE_PATTERN, Entry, as_entry  # noqa
 from .date_parsers import (
     dateformat1,
     dateformat2,
@@ -75,8 +78,6 @@ from .date_parsers import (
     parse_dateformat28,
 )
 
-SCHEDULED_DATE_PATTERN = re.compile(r"\[\$?([^\[\$]*)\$?\]$")
-
 
 def date_to_string(date, period):
     """
@@ -116,10 +117,209 @@ def date_to_string(date, period):
     return date_string.upper()
 
 
+# the acceptable date formats, in order of precedence, i.e. a date string
+# is parsed using the first of these formats that it matches
+DATE_FORMATS = (
+    (dateformat28, parse_dateformat28),
+    (dateformat27, parse_dateformat27),
+    (dateformat26, parse_dateformat26),
+    (dateformat1, parse_dateformat1),
+    (dateformat2, parse_dateformat2),
+    (dateformat18, parse_dateformat18),
+    (dateformat3, parse_dateformat3),
+    (dateformat4, parse_dateformat4),
+    (dateformat5, parse_dateformat5),
+    (dateformat6, parse_dateformat6),
+    (dateformat7, parse_dateformat7),
+    (dateformat8, parse_dateformat8),
+    (dateformat9, parse_dateformat9),
+    (dateformat13, parse_dateformat13),
+    (dateformat25, parse_dateformat25),
+    (dateformat16, parse_dateformat16),
+    (dateformat17, parse_dateformat17),
+    (dateformat11, parse_dateformat11),
+    (dateformat12, parse_dateformat12),
+    (dateformat14, parse_dateformat14),
+    (dateformat15, parse_dateformat15),
+    (dateformat19, parse_dateformat19),
+    (dateformat23, parse_dateformat23),
+    (dateformat24, parse_dateformat24),
+    (dateformat21, parse_dateformat21),
+    (dateformat22, parse_dateformat22),
+    (dateformat20, parse_dateformat20),
+    (dateformat10, parse_dateformat10),
+)
+
+# the formats that begin with a keyword, by (case-folded) keyword. Any other
+# format either begins with a number (see `NUMERIC_DATE_FORMATS`) or may
+# begin with any word at all (e.g. the name of a month)
+DATE_FORMAT_KEYWORDS = {
+    dateformat28: ("first", "second", "third", "fourth", "last"),
+    dateformat27: ("week",),
+    dateformat26: ("someday",),
+    dateformat18: tuple("q%d" % n for n in range(10)),
+    dateformat5: ("week",),
+    dateformat6: ("week",),
+    dateformat7: ("week",),
+    dateformat8: ("week",),
+    dateformat13: ("tomorrow",),
+    dateformat25: ("day",),
+    dateformat16: (
+        "monday",
+        "tuesday",
+        "wednesday",
+        "thursday",
+        "friday",
+        "saturday",
+        "sunday",
+    ),
+    dateformat17: ("mon", "tue", "wed", "thu", "fri", "sat", "sun"),
+    dateformat14: ("next",),
+    dateformat15: ("next",),
+    dateformat19: ("next",),
+    dateformat23: ("next",),
+    dateformat24: tuple("q%d" % n for n in range(10)),
+    dateformat21: ("this",),
+    dateformat22: ("next",),
+}
+
+NUMERIC_DATE_FORMATS = (
+    dateformat2,
+    dateformat4,
+    dateformat11,
+    dateformat12,
+    dateformat20,
+)
+
+
+def _index_date_formats():
+    """Group the date formats by the first word of the strings that they
+    may match, so that a date string need only be matched against the
+    formats that it could possibly be in. Within each group, the formats
+    retain their order of precedence.
+
+    :returns tuple: The formats by keyword, the formats for strings
+        beginning with a number, and the formats for strings beginning with
+        any other word
+    """
+    words = [
+        (pattern, parse)
+        for pattern, parse in DATE_FORMATS
+        if pattern not in DATE_FORMAT_KEYWORDS
+        and pattern not in NUMERIC_DATE_FORMATS
+    ]
+    numbers = [
+        (pattern, parse)
+        for pattern, parse in DATE_FORMATS
+        if pattern in NUMERIC_DATE_FORMATS
+    ]
+    by_keyword = {}
+    for keywords in DATE_FORMAT_KEYWORDS.values():
+        for keyword in keywords:
+            by_keyword[keyword] = [
+                (pattern, parse)
+                for pattern, parse in DATE_FORMATS
+                if keyword in DATE_FORMAT_KEYWORDS.get(pattern, ())
+                or (pattern, parse) in words
+            ]
+    return by_keyword, numbers, words
+
+
+(
+    _DATE_FORMATS_BY_KEYWORD,
+    _NUMERIC_DATE_FORMATS,
+    _WORD_DATE_FORMATS,
+) = _index_date_formats()
+
+
+def get_date_formats(datestr):
+    """The date formats that a date string could be in, in order of
+    precedence. The string is classified by its first word, which is either
+    a keyword that only some formats begin with, a number, or some other word
+    (e.g. a month).
+
+    :param str datestr: A string representing a date
+    :returns list: The (pattern, parser) pairs for the formats
+    """
+    if not datestr.isascii():
+        # the formats are matched case-insensitively, and some non-ASCII
+        # characters match ASCII letters (e.g. the Kelvin sign matches "k"),
+        # and non-ASCII digits match digits, so we can't classify the string
+        # by its first word
+        return DATE_FORMATS
+    word = datestr.split(" ", 1)[0].rstrip("\n")
+    if "0" <= word[:1] <= "9":
+        return _NUMERIC_DATE_FORMATS
+    return _DATE_FORMATS_BY_KEYWORD.get(word.lower(), _WORD_DATE_FORMATS)
+
+
+# A date string that has been identified as being in a particular date
+# format. `match` is the match of the format's pattern against the string, and
+# `parse` is the format's parser. If the string specifies a date without
+# reference to the current date, `value` is the (date, period) that it
+# represents, and otherwise it is None, and the date is only determined when
+# the string is resolved relative to a reference date (see `resolve_date`).
+ParsedDate = namedtuple('ParsedDate', 'string match parse value')
+
+# the number of distinct date strings whose parsed form is retained
+PARSED_DATE_CACHE_SIZE = 1024
+# the number of (date string, reference date) pairs for which the resolved
+# date is retained
+RESOLVED_DATE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=PARSED_DATE_CACHE_SIZE)
+def parse_date_string(datestr):
+    """Identify the format of a given string representing a date. This doesn't
+    depend on any reference date, and the result is cached, so that strings
+    that recur (e.g. the same scheduled date on many tasks, or on the same
+    task from one day to the next) are only parsed once.
+
+    :param str datestr: A string representing a date
+    :returns :class:`ParsedDate`: The parsed date string
+    """
+    for pattern, parse in get_date_formats(datestr):
+        match = pattern.search(datestr)
+        if match:
+            try:
+                value = parse(datestr, match=match)
+            except RelativeDateError:
+                # the date is relative to a reference date
+                value = None
+            return ParsedDate(datestr, match, parse, value)
+
+    raise DateFormatError(
+        "Date format does not match any acceptable formats! " + datestr
+    )
+
+
+@lru_cache(maxsize=RESOLVED_DATE_CACHE_SIZE)
+def resolve_date(parsed_date, reference_date=None):
+    """Determine the date represented by a parsed date string, relative to a
+    reference date. The result is cached, since the same date strings are
+    typically resolved relative to the same date several times in the course
+    of advancing the planner.
+
+    :param :class:`ParsedDate` parsed_date: The parsed date string
+    :param :class:`datetime.date` reference_date: Reference date to use in
+        case the date is specified relatively
+    :returns tuple: A python date object, and the relevant time period implied
+        by the string representation
+    """
+    if parsed_date.value is not None:
+        return parsed_date.value
+    return parsed_date.parse(
+        parsed_date.string, reference_date, match=parsed_date.match
+    )
+
+
 def string_to_date(datestr, reference_date=None):
     """Parse a given string representing a date.
 
-    Tries various acceptable date formats until one works.
+    Tries the acceptable date formats that the string could be in (see
+    `get_date_formats`), in order of precedence, until one works, and then
+    resolves the date relative to the reference date. Both steps are cached
+    (see `parse_date_string` and `resolve_date`).
 
     :param str datestr: A string representing a follow-up date for a
         blocked/scheduled item
@@ -128,44 +328,7 @@ def string_to_date(datestr, reference_date=None):
     :returns tuple: A python date object, and the relevant time period implied
         by the string representation
     """
-    patterns = (
-        (dateformat28, parse_dateformat28),
-        (dateformat27, parse_dateformat27),
-        (dateformat26, parse_dateformat26),
-        (dateformat1, parse_dateformat1),
-        (dateformat2, parse_dateformat2),
-        (dateformat18, parse_dateformat18),
-        (dateformat3, parse_dateformat3),
-        (dateformat4, parse_dateformat4),
-        (dateformat5, parse_dateformat5),
-        (dateformat6, parse_dateformat6),
-        (dateformat7, parse_dateformat7),
-        (dateformat8, parse_dateformat8),
-        (dateformat9, parse_dateformat9),
-        (dateformat13, parse_dateformat13),
-        (dateformat25, parse_dateformat25),
-        (dateformat16, parse_dateformat16),
-        (dateformat17, parse_dateformat17),
-        (dateformat11, parse_dateformat11),
-        (dateformat12, parse_dateformat12),
-        (dateformat14, parse_dateformat14),
-        (dateformat15, parse_dateformat15),
-        (dateformat19, parse_dateformat19),
-        (dateformat23, parse_dateformat23),
-        (dateformat24, parse_dateformat24),
-        (dateformat21, parse_dateformat21),
-        (dateformat22, parse_dateformat22),
-        (dateformat20, parse_dateformat20),
-        (dateformat10, parse_dateformat10),
-    )
-
-    for pattern, parse in patterns:
-        if pattern.search(datestr):
-            return parse(datestr, reference_date)
-
-    raise DateFormatError(
-        "Date format does not match any acceptable formats! " + datestr
-    )
+    return resolve_date(parse_date_string(datestr), reference_date)
 
 
 def standardize_entry_date(entry, reference_date=None):
@@ -174,38 +337,37 @@ def standardize_entry_date(entry, reference_date=None):
     relatively specified so that it is unambiguous and time-invariant (e.g.
     dates like "next week").
 
-    :param str entry: The entry with a scheduled date
+    :param entry: The entry with a scheduled date, either a string or an
+        :class:`~composer.backend.filesystem.primitives.parsing.Entry`
     :param :class:`datetime.date` reference_date: Reference date to use in
         parsing the indicated scheduled date
-    :returns str: The entry, with the scheduled date converted to a standard
-        format
+    :returns: The entry, with the scheduled date converted to a standard
+        format. This is of the same type as the input entry
     """
-    task_header, task_contents = parse_task(entry)
-    matched_date = get_due_date(task_header, reference_date)
+    task = as_entry(entry)
+    matched_date = get_due_date(task, reference_date)
     datestr = date_to_string(*matched_date)
-    task_header = SCHEDULED_DATE_PATTERN.sub(
-        "[$" + datestr + "$]", task_header
-    )  # replace with standard format
-    task = task_header + task_contents
-    return task
+    task = task.reschedule(datestr)  # replace with standard format
+    return task if isinstance(entry, Entry) else task.text
 
 
 def get_due_date(task, reference_date=None):
     """Get the due date for a task.
 
-    :param str task: The task
+    :param task: The task, either a string or an
+        :class:`~composer.backend.filesystem.primitives.parsing.Entry`
     :param :class:`datetime.date` reference_date: A reference date to use
         in case the due date is specified relatively
     :returns tuple: The due date, together with the implied period
         for the date
     """
-    header, _ = parse_task(task)
-    if not SCHEDULED_DATE_PATTERN.search(header):
+    task = as_entry(task)
+    datestr = task.scheduled_date
+    if datestr is None:
         raise BlockedTaskNotScheduledError(
             "No scheduled date for blocked task -- add a date for it:\n"
-            + header
+            + task.header
         )
-    datestr = SCHEDULED_DATE_PATTERN.search(header).groups()[0]
     try:
         matched_date, period = string_to_date(datestr, reference_date)
     except SchedulingDateError:
@@ -0,0 +1,4 @@
+from .base import MemoryPlanner, MemoryTasklist, MemoryWiki
+
+
+__all__ = ("MemoryPlanner", "MemoryTasklist", "MemoryWiki")
@@ -0,0 +1,252 @@
+import os
+
+from ..filesystem.base import (
+    PLANNERDAYFILELINK,
+    FilesystemPlanner,
+    FilesystemTasklist,
+)
+from ..filesystem.primitives import (
+    Transaction,
+    bare_filename,
+    get_log_filename,
+    make_file,
+)
+from ..filesystem.scheduling import string_to_date
+from ...timeperiod import Day
+
+try:  # py3
+    FileNotFoundError
+except NameError:  # py2
+    FileNotFoundError = IOError
+
+# files are read and written as they are, without translating newlines or
+# rejecting undecodable bytes, so that a wiki can be loaded and dumped again
+# without any changes
+_FILE_OPTIONS = {
+    'encoding': "utf-8",
+    'errors': "surrogateescape",
+    'newline': "",
+}
+
+
+class MemoryWiki(object):
+    """A planner wiki held in memory, i.e. the contents of the files in the
+    wiki and the targets of its links (such as the link to the current day's
+    log), by name.
+
+    A wiki may be loaded from a directory on disk, and dumped to one, so that
+    planners may be advanced in memory and the results saved (or discarded)
+    afterwards.
+
+    :param dict files: The contents of the files in the wiki, by name
+    :param dict links: The targets of the links in the wiki, by name
+    """
+
+    def __init__(self, files=None, links=None):
+        self.files = dict(files or {})
+        self.links = dict(links or {})
+
+    @classmethod
+    def load(cls, path):
+        """Load the files and links in a directory on disk. Subdirectories
+        (e.g. version control metadata) aren't part of the wiki and are
+        ignored.
+
+        :param str path: Filesystem path to the wiki
+        :returns :class:`MemoryWiki`: The wiki
+        """
+        wiki = cls()
+        for name in os.listdir(path):
+            filename = os.path.join(path, name)
+            if os.path.islink(filename):
+                wiki.links[name] = os.readlink(filename)
+            elif os.path.isfile(filename):
+                with open(filename, "r", **_FILE_OPTIONS) as f:
+                    wiki.files[name] = f.read()
+        return wiki
+
+    def dump(self, path):
+        """Write the files and links in the wiki to a directory on disk,
+        replacing any existing files and links of the same names.
+
+        :param str path: Filesystem path to the wiki
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        for name, contents in self.files.items():
+            filename = os.path.join(path, name)
+            if os.path.islink(filename):
+                os.remove(filename)
+            with open(filename, "w", **_FILE_OPTIONS) as f:
+                f.write(contents)
+        for name, target in self.links.items():
+            filename = os.path.join(path, name)
+            if os.path.lexists(filename):
+                os.remove(filename)
+            os.symlink(target, filename)
+
+    def read_file(self, name):
+        """Read a file in the wiki.
+
+        :param str name: The name of the file
+        :returns str: The contents of the file
+        """
+        try:
+            return self.files[name]
+        except KeyError:
+            raise FileNotFoundError(name)
+
+    def write_file(self, contents, name):
+        """Write a file in the wiki (overwrites the file if present).
+
+        :param str contents: The contents of the file
+        :param str name: The name of the file
+        """
+        self.links.pop(name, None)
+        self.files[name] = contents
+
+    def symlink(self, target, name):
+        """Create (or replace) a link in the wiki.
+
+        :param str target: The name of the file that the link points to
+        :param str name: The name of the link
+        """
+        self.files.pop(name, None)
+        self.links[name] = target
+
+    def readlink(self, name):
+        """The target of a link in the wiki.
+
+        :param str name: The name of the link
+        :returns str: The name of the file that the link points to, or None
+            if there is no such link
+        """
+        return self.links.get(name)
+
+    def isfile(self, name):
+        """Whether a file exists in the wiki.
+
+        :param str name: The name of the file
+        :returns bool: Whether it exists
+        """
+        return name in self.files
+
+    def transaction(self):
+        """A transaction for making several changes to the wiki together.
+
+        :returns :class:`MemoryTransaction`: The transaction
+        """
+        return MemoryTransaction(self)
+
+
+class MemoryTransaction(Transaction):
+    """A set of changes to a :class:`MemoryWiki` that are made together (see
+    :class:`~composer.backend.filesystem.primitives.storage.Transaction`).
+
+    :param :class:`MemoryWiki` wiki: The wiki to be changed
+    """
+
+    def __init__(self, wiki):
+        super(MemoryTransaction, self).__init__()
+        self.wiki = wiki
+
+    def commit(self):
+        """Make all of the staged changes to the wiki."""
+        for name, contents in self._files.items():
+            self.wiki.write_file(contents, name)
+        for name, target in self._links.items():
+            self.wiki.symlink(target, name)
+        self._files.clear()
+        self._links.clear()
+
+
+class MemoryResources(object):
+    """Files backing the attributes of a planner or tasklist that are stored
+    in a :class:`MemoryWiki` (the `location` of the planner or tasklist)
+    rather than on disk. Files are identified by their names in the wiki.
+    """
+
+    def _path(self, filename):
+        return filename
+
+    def _read_file(self, path):
+        return make_file(self.location.read_file(path))
+
+    def _write_file(self, file, path, transaction=None):
+        if transaction is not None:
+            transaction.write_file(file.read(), path)
+        else:
+            self.location.write_file(file.read(), path)
+
+
+class MemoryPlanner(MemoryResources, FilesystemPlanner):
+    """A planner whose wiki is held in memory rather than on disk. This
+    behaves exactly like
+    :class:`~composer.backend.filesystem.base.FilesystemPlanner`, and may
+    be used e.g. to simulate advancing a planner, without touching the
+    filesystem.
+
+    :param :class:`MemoryWiki` location: The wiki
+    :param tasklist: The tasklist
+    :param dict preferences: User preferences
+    """
+
+    def _get_date(self):
+        """Get date from planner's current state in the wiki, i.e. the
+        latest daily log file that the current day link points to.
+        """
+        datestr = bare_filename(self.location.readlink(PLANNERDAYFILELINK))
+        plannerdate, _ = string_to_date(datestr)
+        return plannerdate
+
+    def get_log(self, for_day, period):
+        """Get the log file responsible for the specified period and date.
+
+        :param :class:`~composer.timeperiod.Period` period: The period for
+            which to get the log file
+        :param :class:`datetime.date` for_day: The reference date to identify
+            the desired log file.
+        """
+        if period < Day:
+            return None
+        start_date = period.get_start_date(for_day)
+        try:
+            return self._read_file(get_log_filename(start_date, period))
+        except FileNotFoundError:
+            return None
+
+    def has_log(self, for_day, period):
+        """Whether there is a log in the wiki for the specified period and
+        date, without reading it.
+
+        :param :class:`datetime.date` for_day: The reference date
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :returns bool: Whether there is a log
+        """
+        if period < Day:
+            return False
+        start_date = period.get_start_date(for_day)
+        return self.location.isfile(get_log_filename(start_date, period))
+
+    def _update_current_date_link(self, transaction=None):
+        """Update the current day link in the wiki to the newly created log
+        file for the date to which the planner was advanced.
+
+        :param transaction: A transaction in which to stage the update
+        """
+        filename = get_log_filename(self.date, Day)
+        if self.location.readlink(PLANNERDAYFILELINK) == filename:
+            # already up to date
+            return
+        if transaction is not None:
+            transaction.symlink(filename, PLANNERDAYFILELINK)
+        else:
+            self.location.symlink(filename, PLANNERDAYFILELINK)
+
+
+class MemoryTasklist(MemoryResources, FilesystemTasklist):
+    """A tasklist whose wiki is held in memory rather than on disk (see
+    :class:`MemoryPlanner`).
+
+    :param :class:`MemoryWiki` location: The wiki
+    """
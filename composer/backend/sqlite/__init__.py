@@ -0,0 +1,4 @@
+from .base import SqlitePlanner, SqliteTasklist, SqliteWiki
+
+
+__all__ = ("SqlitePlanner", "SqliteTasklist", "SqliteWiki")
@@ -0,0 +1,437 @@
+import sqlite3
+import threading
+
+from ..memory.base import (
+    MemoryPlanner,
+    MemoryResources,
+    MemoryTasklist,
+    MemoryWiki,
+)
+from ..filesystem.primitives import (
+    Transaction,
+    get_status,
+    make_file,
+    parse_log_filename,
+)
+from ..filesystem.primitives.document import PieceTable, get_entry_starts
+from ..filesystem.primitives.sections import SectionIndex, SectionSpan
+from ...timeperiod import Day
+
+try:  # py3
+    FileNotFoundError
+except NameError:  # py2
+    FileNotFoundError = IOError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    contents
+);
+CREATE TABLE IF NOT EXISTS links (
+    name TEXT PRIMARY KEY,
+    target TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    name TEXT PRIMARY KEY,
+    period TEXT NOT NULL,
+    start_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_by_date ON logs (period, start_date);
+CREATE TABLE IF NOT EXISTS sections (
+    file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    header_start INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (file, position)
+);
+CREATE INDEX IF NOT EXISTS sections_by_header ON sections (header);
+CREATE TABLE IF NOT EXISTS entries (
+    file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    section TEXT,
+    status TEXT,
+    PRIMARY KEY (file, position)
+);
+CREATE INDEX IF NOT EXISTS entries_by_status ON entries (status);
+"""
+
+
+def _is_text(contents):
+    # contents that were read with undecodable bytes (see `MemoryWiki`)
+    # can't be stored as text, and are stored as they are, unindexed
+    try:
+        contents.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+class SqliteWiki(object):
+    """A planner wiki stored in a SQLite database. Along with the contents
+    of each file, the database stores the structure of the file, i.e. its
+    sections and entries (with their status), and the period and start date
+    of each log, so that logs may be looked up by date, and files may be
+    read without being parsed. This structure may also be queried directly,
+    e.g. to find entries across years of logs (see `find_entries`).
+
+    The wiki may be imported from a wiki on disk, and exported to one.
+
+    :param str path: Filesystem path to the database, or ":memory:" for a
+        database held in memory
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        # the connection may be used from several threads (e.g. when
+        # prefetching), but only by one at a time
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def import_wiki(self, path):
+        """Import the files and links in a wiki on disk, replacing any files
+        and links of the same names.
+
+        :param str path: Filesystem path to the wiki
+        """
+        wiki = MemoryWiki.load(path)
+        with self._lock, self.connection:
+            for name, contents in wiki.files.items():
+                self._write_file(contents, name)
+            for name, target in wiki.links.items():
+                self._symlink(target, name)
+
+    def export_wiki(self, path):
+        """Export the files and links in the wiki to a wiki on disk, replacing
+        any existing files and links of the same names.
+
+        :param str path: Filesystem path to the wiki
+        """
+        with self._lock:
+            files = {
+                name: self._decode(contents)
+                for name, contents in self.connection.execute(
+                    "SELECT name, contents FROM files"
+                )
+            }
+            links = dict(
+                self.connection.execute("SELECT name, target FROM links")
+            )
+        MemoryWiki(files, links).dump(path)
+
+    @staticmethod
+    def _decode(contents):
+        if isinstance(contents, bytes):
+            return contents.decode("utf-8", "surrogateescape")
+        return contents
+
+    def _remove(self, name):
+        for table, column in (
+            ('files', 'name'),
+            ('links', 'name'),
+            ('logs', 'name'),
+            ('sections', 'file'),
+            ('entries', 'file'),
+        ):
+            self.connection.execute(
+                "DELETE FROM {} WHERE {} = ?".format(table, column), (name,)
+            )
+
+    def _write_file(self, contents, name):
+        """Store a file along with its structure, without committing."""
+        self._remove(name)
+        if not _is_text(contents):
+            self.connection.execute(
+                "INSERT INTO files (name, contents) VALUES (?, ?)",
+                (name, contents.encode("utf-8", "surrogateescape")),
+            )
+            return
+        self.connection.execute(
+            "INSERT INTO files (name, contents) VALUES (?, ?)",
+            (name, contents),
+        )
+        log = parse_log_filename(name)
+        if log is not None:
+            period, start_date = log
+            self.connection.execute(
+                "INSERT INTO logs (name, period, start_date) VALUES (?, ?, ?)",
+                (name, str(period), start_date.isoformat()),
+            )
+        index = SectionIndex(contents)
+        self.connection.executemany(
+            "INSERT INTO sections"
+            " (file, position, header, line, end_line, header_start,"
+            " start, end) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (name, position) + tuple(span)
+                for position, span in enumerate(index.sections)
+            ],
+        )
+        starts = get_entry_starts(contents)
+        ends = starts[1:] + [len(contents)]
+        spans = iter(index.sections)
+        span = next(spans, None)
+        rows = []
+        for position, (start, end) in enumerate(zip(starts, ends)):
+            while span is not None and span.end <= start:
+                span = next(spans, None)
+            in_section = span is not None and span.header_start <= start
+            status = get_status(contents[start:end])
+            rows.append(
+                (
+                    name,
+                    position,
+                    start,
+                    end,
+                    span.header if in_section else None,
+                    status.name if status is not None else None,
+                )
+            )
+        self.connection.executemany(
+            "INSERT INTO entries"
+            " (file, position, start, end, section, status)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _symlink(self, target, name):
+        self._remove(name)
+        self.connection.execute(
+            "INSERT INTO links (name, target) VALUES (?, ?)", (name, target)
+        )
+
+    def read_file(self, name):
+        """Read a file in the wiki.
+
+        :param str name: The name of the file
+        :returns str: The contents of the file
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT contents FROM files WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(name)
+        return self._decode(row[0])
+
+    def read_document(self, name):
+        """Read a file in the wiki as a document whose section index and
+        entries are already known, so that the file needn't be parsed.
+
+        :param str name: The name of the file
+        :returns :class:`~composer.backend.filesystem.primitives.document.
+            PieceTable`: The document
+        """
+        contents = self.read_file(name)
+        if not _is_text(contents):
+            return PieceTable(contents)
+        with self._lock:
+            sections = [
+                SectionSpan(*row)
+                for row in self.connection.execute(
+                    "SELECT header, line, end_line, header_start, start, end"
+                    " FROM sections WHERE file = ? ORDER BY position",
+                    (name,),
+                )
+            ]
+            entry_starts = [
+                start
+                for (start,) in self.connection.execute(
+                    "SELECT start FROM entries WHERE file = ?"
+                    " ORDER BY position",
+                    (name,),
+                )
+            ]
+        index = SectionIndex._from_spans(sections, len(contents))
+        return PieceTable(contents, index, entry_starts)
+
+    def write_file(self, contents, name):
+        """Write a file in the wiki (overwrites the file if present).
+
+        :param str contents: The contents of the file
+        :param str name: The name of the file
+        """
+        with self._lock, self.connection:
+            self._write_file(contents, name)
+
+    def symlink(self, target, name):
+        """Create (or replace) a link in the wiki.
+
+        :param str target: The name of the file that the link points to
+        :param str name: The name of the link
+        """
+        with self._lock, self.connection:
+            self._symlink(target, name)
+
+    def readlink(self, name):
+        """The target of a link in the wiki.
+
+        :param str name: The name of the link
+        :returns str: The name of the file that the link points to, or None
+            if there is no such link
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT target FROM links WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def isfile(self, name):
+        """Whether a file exists in the wiki.
+
+        :param str name: The name of the file
+        :returns bool: Whether it exists
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM files WHERE name = ?", (name,)
+            ).fetchone()
+        return row is not None
+
+    def find_log(self, period, for_date):
+        """Find the log for the given period that tracks the given date.
+
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :param :class:`datetime.date` for_date: The date of interest
+        :returns str: The name of the log, or None if there is no such log
+        """
+        start_date = period.get_start_date(for_date)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT name FROM logs WHERE period = ? AND start_date = ?",
+                (str(period), start_date.isoformat()),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def find_entries(
+        self, period=None, since=None, until=None, section=None, status=None
+    ):
+        """Find entries in logs, in chronological order of the logs.
+
+        :param :class:`~composer.timeperiod.Period` period: Only search logs
+            for this period
+        :param :class:`datetime.date` since: Only search logs starting on or
+            after this date
+        :param :class:`datetime.date` until: Only search logs starting on or
+            before this date
+        :param str section: Only find entries in sections with this name
+            (e.g. "AGENDA")
+        :param :class:`~composer.backend.filesystem.primitives.parsing.
+            TaskStatus` status: Only find tasks with this status
+        :returns list: (log name, entry) pairs
+        """
+        conditions = []
+        parameters = []
+        if period is not None:
+            conditions.append("logs.period = ?")
+            parameters.append(str(period))
+        if since is not None:
+            conditions.append("logs.start_date >= ?")
+            parameters.append(since.isoformat())
+        if until is not None:
+            conditions.append("logs.start_date <= ?")
+            parameters.append(until.isoformat())
+        if section is not None:
+            conditions.append("entries.section LIKE ?")
+            parameters.append(section.upper() + "%")
+        if status is not None:
+            conditions.append("entries.status = ?")
+            parameters.append(status.name)
+        query = (
+            "SELECT logs.name,"
+            " substr(files.contents, entries.start + 1,"
+            " entries.end - entries.start)"
+            " FROM logs"
+            " JOIN entries ON entries.file = logs.name"
+            " JOIN files ON files.name = logs.name"
+        )
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY logs.start_date, logs.name, entries.position"
+        with self._lock:
+            return self.connection.execute(query, parameters).fetchall()
+
+    def transaction(self):
+        """A transaction for making several changes to the wiki together.
+
+        :returns :class:`SqliteTransaction`: The transaction
+        """
+        return SqliteTransaction(self)
+
+
+class SqliteTransaction(Transaction):
+    """A set of changes to a :class:`SqliteWiki` that are made together, in
+    a single database transaction (see
+    :class:`~composer.backend.filesystem.primitives.storage.Transaction`).
+
+    :param :class:`SqliteWiki` wiki: The wiki to be changed
+    """
+
+    def __init__(self, wiki):
+        super(SqliteTransaction, self).__init__()
+        self.wiki = wiki
+
+    def commit(self):
+        """Make all of the staged changes to the wiki."""
+        with self.wiki._lock, self.wiki.connection:
+            for name, contents in self._files.items():
+                self.wiki._write_file(contents, name)
+            for name, target in self._links.items():
+                self.wiki._symlink(target, name)
+        self._files.clear()
+        self._links.clear()
+
+
+class SqliteResources(MemoryResources):
+    """Files backing the attributes of a planner or tasklist that are stored
+    in a :class:`SqliteWiki`. Files are read along with their stored
+    structure, so that finding sections and entries in them (e.g. the agenda
+    of a log, or a section of the tasklist) doesn't require parsing them.
+    """
+
+    def _read_file(self, path):
+        return make_file(self.location.read_document(path))
+
+
+class SqlitePlanner(SqliteResources, MemoryPlanner):
+    """A planner whose wiki is stored in a SQLite database (see
+    :class:`MemoryPlanner`).
+
+    :param :class:`SqliteWiki` location: The wiki
+    :param tasklist: The tasklist
+    :param dict preferences: User preferences
+    """
+
+    def get_log(self, for_day, period):
+        """Get the log file responsible for the specified period and date.
+
+        :param :class:`~composer.timeperiod.Period` period: The period for
+            which to get the log file
+        :param :class:`datetime.date` for_day: The reference date to identify
+            the desired log file.
+        """
+        if period < Day:
+            return None
+        name = self.location.find_log(period, for_day)
+        if name is None:
+            return None
+        return self._read_file(name)
+
+
+class SqliteTasklist(SqliteResources, MemoryTasklist):
+    """A tasklist whose wiki is stored in a SQLite database (see
+    :class:`SqlitePlanner`).
+
+    :param :class:`SqliteWiki` location: The wiki
+    """
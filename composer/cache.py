@@ -1,10 +1,28 @@
+import datetime
+import os
+import re
+import shutil
+
 from .backend.filesystem.primitives import (
     make_file,
-    append_files,
+    append_file,
     read_file,
     write_file,
+    Transaction,
 )
 
+# separates the notes archived on successive days
+ARCHIVE_SEPARATOR = "\n-----\n\n"
+
+# separates notes in archives written before notes were appended to them,
+# i.e. newest first. Each note was written followed by this separator, so
+# that such archives end with it, whereas notes are now appended preceded
+# by a separator, so that archives end with a single newline
+LEGACY_ARCHIVE_SEPARATOR = "\n" + ARCHIVE_SEPARATOR
+
+# the suffix of the backup of an archive made before it is reordered
+ARCHIVE_BACKUP_SUFFIX = ".bak"
+
 
 def read_cache(cache_file):
     """Read the cache file."""
@@ -12,14 +30,148 @@ def read_cache(cache_file):
     return notes
 
 
-def archive_cache(cache_path, archive_cache_path):
-    """Append the contents of the cache to the archive cache, and clear the
-    cache."""
-    cache_file = read_file(cache_path)
-    archive_cache_file = read_file(archive_cache_path)
-    separator = "\n" + "\n-----\n" + "\n"
-    new_archive = append_files(
-        cache_file, archive_cache_file, separator, strip_newlines=True
+def _segment_pattern(archive_cache_path):
+    stem, extension = os.path.splitext(os.path.basename(archive_cache_path))
+    return re.compile(
+        r"^{stem} (\d{{4}}-\d{{2}}-\d{{2}})(?: (\d+))?{extension}$".format(
+            stem=re.escape(stem), extension=re.escape(extension)
+        )
     )
+
+
+def get_archive_segments(archive_cache_path):
+    """The files making up the archive cache, i.e. the segments into which
+    the archive has been rotated (see `rotate_archive`), followed by the
+    archive cache itself, in the order in which notes were archived to them.
+
+    :param str archive_cache_path: Filesystem path to the archive cache
+    :returns list: Filesystem paths to the files that exist
+    """
+    directory = os.path.dirname(archive_cache_path) or "."
+    pattern = _segment_pattern(archive_cache_path)
+    segments = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            date, number = match.groups()
+            segments.append(
+                ((date, int(number or 1)), os.path.join(directory, name))
+            )
+    paths = [path for _, path in sorted(segments)]
+    if os.path.isfile(archive_cache_path):
+        paths.append(archive_cache_path)
+    return paths
+
+
+def is_newest_first(archive_cache_path):
+    """Whether the archive cache was written newest first (see
+    `LEGACY_ARCHIVE_SEPARATOR`). Only the end of the archive is read.
+
+    :param str archive_cache_path: Filesystem path to the archive cache
+    :returns bool: Whether the archive runs newest first
+    """
+    trailer = LEGACY_ARCHIVE_SEPARATOR.encode()
+    try:
+        with open(archive_cache_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - len(trailer), 0))
+            return f.read() == trailer
+    except FileNotFoundError:
+        return False
+
+
+def migrate_archive(archive_cache_path):
+    """Notes used to be archived by prepending them to the archive cache,
+    so that it ran newest first, whereas they are now appended, so that it
+    runs oldest first. Reverse an archive written the old way, so that its
+    notes are in the same order as those appended to it from now on. The
+    original archive is kept alongside it as a backup.
+
+    :param str archive_cache_path: Filesystem path to the archive cache
+    :returns bool: Whether the archive was reversed
+    """
+    if not is_newest_first(archive_cache_path):
+        return False
+    contents = read_file(archive_cache_path).read()
+    notes = [
+        note for note in contents.split(LEGACY_ARCHIVE_SEPARATOR) if note
+    ]
+    shutil.copyfile(
+        archive_cache_path, archive_cache_path + ARCHIVE_BACKUP_SUFFIX
+    )
+    # replace the archive atomically, so that it can't be left half-written
+    with Transaction() as transaction:
+        write_file(
+            make_file(
+                ARCHIVE_SEPARATOR.join(note + "\n" for note in notes[::-1])
+            ),
+            archive_cache_path,
+            transaction=transaction,
+        )
+    return True
+
+
+def rotate_archive(archive_cache_path, max_size, for_date=None):
+    """If the archive cache has grown past the given size, move it aside to
+    a dated segment, so that notes are archived to a new, empty file.
+
+    :param str archive_cache_path: Filesystem path to the archive cache
+    :param int max_size: The size (in bytes) past which to rotate it
+    :param :class:`datetime.date` for_date: The date with which to name the
+        segment (today, by default)
+    :returns str: Filesystem path to the new segment, or None if the archive
+        wasn't rotated
+    """
+    try:
+        size = os.path.getsize(archive_cache_path)
+    except OSError:
+        return None
+    if size < max_size:
+        return None
+    for_date = for_date or datetime.date.today()
+    stem, extension = os.path.splitext(archive_cache_path)
+    segment_path = "{stem} {date}{extension}".format(
+        stem=stem, date=for_date.isoformat(), extension=extension
+    )
+    number = 1
+    while os.path.exists(segment_path):
+        # already rotated on this date
+        number += 1
+        segment_path = "{stem} {date} {number}{extension}".format(
+            stem=stem,
+            date=for_date.isoformat(),
+            number=number,
+            extension=extension,
+        )
+    os.rename(archive_cache_path, segment_path)
+    return segment_path
+
+
+def archive_cache(
+    cache_path, archive_cache_path, max_size=None, for_date=None
+):
+    """Append the contents of the cache to the archive cache, and clear the
+    cache. Only the new notes are written to the archive, which isn't read
+    or rewritten (except to reverse an archive written newest first, see
+    `migrate_archive`).
+
+    :param str cache_path: Filesystem path to the cache
+    :param str archive_cache_path: Filesystem path to the archive cache
+    :param int max_size: The size (in bytes) past which to rotate the
+        archive cache into a dated segment before appending to it (see
+        `rotate_archive`). By default, the archive isn't rotated
+    :param :class:`datetime.date` for_date: The date with which to name the
+        segment if the archive is rotated
+    """
+    notes = read_cache(cache_path)
+    if notes:
+        migrate_archive(archive_cache_path)
+        if max_size is not None:
+            rotate_archive(archive_cache_path, max_size, for_date)
+        try:
+            is_empty = os.path.getsize(archive_cache_path) == 0
+        except OSError:
+            is_empty = True
+        separator = "" if is_empty else ARCHIVE_SEPARATOR
+        append_file(make_file(separator + notes + "\n"), archive_cache_path)
     write_file(make_file(), cache_path)
-    write_file(new_archive, archive_cache_path)
@@ -7,24 +7,25 @@ import os
 
 import click
 
-from datetime import timedelta
-
 from composer.backend import FilesystemPlanner
 from composer.backend.filesystem.interface import (
     get_constituent_logs,
     compute_time_spent_on_planner,
 )
 from composer.backend.filesystem.primitives import (
+    ParseCache,
     get_log_filename,
     read_section,
+    set_parse_cache,
 )
 from composer.backend.filesystem.date_parsers import parse_dateformat12
 from composer.utils import display_message
-from composer.timeperiod import Week, Month, Quarter, Year, get_next_period
+from composer.timeperiod import Week, Month, Quarter, Year
 from composer import config
 
 CONFIG_ROOT = os.getenv("COMPOSER_ROOT", os.path.expanduser("~/.composer"))
 CONFIG_FILE = os.path.join(CONFIG_ROOT, config.CONFIG_FILENAME)
+CACHE_DIR = os.path.join(CONFIG_ROOT, config.PARSE_CACHE_DIRNAME)
 
 
 def extract_notes_from_log(logfile):
@@ -50,27 +51,20 @@ def get_logs_times(wikidir, period, reference_date=None):
     planner = FilesystemPlanner(wikidir)
     reference_date = reference_date or planner.date
     current_date = period.get_start_date(reference_date)
-    logs = get_constituent_logs(period, current_date, wikidir)
-    constituent_period = get_next_period(period, decreasing=True)
+    logs = get_constituent_logs(
+        period, current_date, wikidir, with_instances=True
+    )
     logs_string = ""
     time = compute_time_spent_on_planner(period, current_date, wikidir)
     # hrs, mins
-    for log in logs:
+    for instance, log in logs:
         notes = extract_notes_from_log(log)
-        start_date = constituent_period.get_start_date(current_date)
-        # TODO: in case of missing logs, this mislabels the
-        # log period. Instead, rely on get_constituent_logs to
-        # provide source information instead of independently
-        # computing things here
         logs_string += (
-            get_log_filename(start_date, constituent_period)
+            get_log_filename(instance.start, instance.period)
             + "\n"
             + notes
             + "\n\n"
         )
-        current_date = constituent_period.get_end_date(
-            current_date
-        ) + timedelta(days=1)
     return (logs_string, time)
 
 
@@ -84,8 +78,15 @@ def get_logs_times(wikidir, period, reference_date=None):
 )
 @click.argument("wikipath", required=False)
 @click.option("-d", "--date", help="Reference date to use (MM-DD-YYYY).")
-def main(wikipath=None, date=None):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Don't use or update the cache of parsed wiki files.",
+)
+def main(wikipath=None, date=None, no_cache=False):
     preferences = config.read_user_preferences(CONFIG_FILE)
+    if not no_cache:
+        set_parse_cache(ParseCache(CACHE_DIR))
     # if wikipath is specified, it should override
     # the configured paths in the ini file
     if wikipath:
@@ -18,6 +18,10 @@ LOGFILE_CHECKING = {"STRICT": 1, "LAX": 2}
 DEFAULT_SCHEDULE = "standard"
 DEFAULT_BULLET_CHARACTER = "*"
 
+# the directory (within the composer config directory) in which the parsed
+# structure of wiki files is cached
+PARSE_CACHE_DIRNAME = "cache"
+
 
 def _read_config(config_path):
     config = configparser.ConfigParser()
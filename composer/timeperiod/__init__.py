@@ -6,11 +6,14 @@ from .quarter import Quarter
 from .year import Year
 from .utils import get_next_day, get_next_month
 from .interface import (
+    PeriodInstance,
     get_next_period,
     is_weekend,
     quarter_for_month,
     month_for_quarter,
     get_time_periods,
+    get_period_boundaries,
+    get_period_instances,
     get_month_name,
     get_month_number,
     day_of_week,
@@ -23,6 +26,8 @@ __all__ = (
     "get_next_month",
     "get_next_period",
     "get_time_periods",
+    "get_period_boundaries",
+    "get_period_instances",
     "is_weekend",
     "quarter_for_month",
     "month_for_quarter",
@@ -31,6 +36,7 @@ __all__ = (
     "day_of_week",
     "upcoming_dow_to_date",
     "Period",
+    "PeriodInstance",
     "Zero",
     "Eternity",
     "Day",
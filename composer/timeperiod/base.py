@@ -48,6 +48,10 @@ class Period(ABC):
         """Given a date, return the date corresponding to the
         start of the present period (e.g. Week) encompassing that date.
 
+        This searches backwards from the date for the start of the period,
+        one day at a time. Periods that can compute their boundaries directly
+        override this.
+
         :param :class:`datetime.date` for_date: The reference date
         :returns :class:`datetime.date`: The start date of the concerned period
         """
@@ -62,6 +66,10 @@ class Period(ABC):
         """Given a date, return the date corresponding to the
         end of the present period (e.g. Week) encompassing that date.
 
+        This searches forwards from the date for the start of the next
+        period, one day at a time. Periods that can compute their boundaries
+        directly override this.
+
         :param :class:`datetime.date` for_date: The reference date
         :returns :class:`datetime.date`: The end date of the concerned period
         """
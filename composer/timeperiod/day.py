@@ -13,6 +13,14 @@ class _Day(Period):
         """
         return True
 
+    def get_start_date(self, for_date):
+        """The date itself."""
+        return for_date
+
+    def get_end_date(self, for_date):
+        """The date itself."""
+        return for_date
+
     def get_name(self):
         return "day"
 
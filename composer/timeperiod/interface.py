@@ -1,5 +1,8 @@
 import calendar
-from datetime import date
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
 
 from .base import Zero, Eternity  # noqa
 from .day import Day
@@ -11,6 +14,10 @@ from .utils import get_next_day
 
 TIME_PERIODS = (Zero, Day, Week, Month, Quarter, Year, Eternity)
 
+# the number of (period, year) pairs for which the boundaries of the
+# instances of the period in the year are retained
+PERIOD_BOUNDARIES_CACHE_SIZE = 512
+
 
 def get_next_period(current_period, decreasing=False):
     """Return the next time period in sequence among the tracked
@@ -135,3 +142,123 @@ def upcoming_dow_to_date(dow, reference_date=None):
     while day_of_week(d).lower() != dow:
         d = get_next_day(d)
     return d
+
+
+@lru_cache(maxsize=PERIOD_BOUNDARIES_CACHE_SIZE)
+def get_period_boundaries(period, year):
+    """The boundaries of each instance of a time period in a year, e.g. the
+    start and end dates of each week of the year. Every tracked period from
+    Day to Year is contained within a year, so a year's instances can be
+    found independently of any other year. The boundaries are cached.
+
+    :param :class:`~composer.timeperiod.Period` period: A time period, from
+        Day to Year
+    :param int year: The year
+    :returns tuple: The start dates of the instances and their end dates, as
+        two tuples of dates in chronological order
+    """
+    if not Day <= period <= Year:
+        raise ValueError(
+            "Instances of the {} period aren't contained in a year!".format(
+                period
+            )
+        )
+    starts, ends = [], []
+    start_date = date(year, 1, 1)
+    last_date = date(year, 12, 31)
+    while True:
+        end_date = period.get_end_date(start_date)
+        starts.append(start_date)
+        ends.append(end_date)
+        if end_date >= last_date:
+            break
+        start_date = end_date + timedelta(days=1)
+    return tuple(starts), tuple(ends)
+
+
+class PeriodInstance(namedtuple('PeriodInstance', 'period start end')):
+    """A particular instance of a time period, e.g. the week of December 2,
+    2012, identified by the period together with its start and end dates.
+    Instances are immutable and hashable, so that they may be used to
+    identify e.g. log files, without recomputing the start of the period for
+    some date in it each time.
+
+    Instances are tuples, and may be unpacked as (period, start, end) tuples.
+    Testing whether something is "in" an instance, however, tests whether a
+    date (or another instance) falls within it.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def for_date(cls, period, for_date):
+        """The instance of a period that contains a date.
+
+        :param :class:`~composer.timeperiod.Period` period: The time period
+        :param :class:`datetime.date` for_date: The date
+        :returns :class:`PeriodInstance`: The instance
+        """
+        return cls(
+            period,
+            period.get_start_date(for_date),
+            period.get_end_date(for_date),
+        )
+
+    def __contains__(self, item):
+        if isinstance(item, PeriodInstance):
+            return self.start <= item.start and item.end <= self.end
+        if isinstance(item, date):
+            return self.start <= item <= self.end
+        return False
+
+    def __repr__(self):
+        return "PeriodInstance({}, {}, {})".format(
+            self.period, self.start.isoformat(), self.end.isoformat()
+        )
+
+    def parent(self, period=None):
+        """The instance of a larger period that contains this one.
+
+        :param :class:`~composer.timeperiod.Period` period: The larger period
+            (by default, the next larger one, e.g. Month for a week)
+        :returns :class:`PeriodInstance`: The containing instance
+        """
+        period = period or get_next_period(self.period)
+        return self.for_date(period, self.start)
+
+    def children(self, period=None):
+        """The instances of a smaller period that make up this one.
+
+        :param :class:`~composer.timeperiod.Period` period: The smaller period
+            (by default, the next smaller one, e.g. Week for a month)
+        :returns list: The constituent instances, in chronological order
+        """
+        if self.period <= Day:
+            return []
+        period = period or get_next_period(self.period, decreasing=True)
+        return list(get_period_instances(period, self.start, self.end))
+
+
+def get_period_instances(period, start_date, end_date):
+    """Every instance of a time period that overlaps a range of dates, e.g.
+    all of the weeks in a month. The first instance is the one containing the
+    start date, and so may begin before it, and likewise the last instance
+    may end after the end date.
+
+    :param :class:`~composer.timeperiod.Period` period: A time period, from
+        Day to Year
+    :param :class:`datetime.date` start_date: The first date in the range
+    :param :class:`datetime.date` end_date: The last date in the range
+    :returns generator: The :class:`PeriodInstance` for each instance, in
+        chronological order
+    """
+    for year in range(start_date.year, end_date.year + 1):
+        starts, ends = get_period_boundaries(period, year)
+        first = 0
+        last = len(starts)
+        if year == start_date.year:
+            first = bisect_left(ends, start_date)
+        if year == end_date.year:
+            last = bisect_right(starts, end_date)
+        for index in range(first, last):
+            yield PeriodInstance(period, starts[index], ends[index])
@@ -1,3 +1,5 @@
+import calendar
+
 from .base import Period
 
 
@@ -16,6 +18,15 @@ class _Month(Period):
         else:
             return False
 
+    def get_start_date(self, for_date):
+        """The 1st of the month."""
+        return for_date.replace(day=1)
+
+    def get_end_date(self, for_date):
+        """The last day of the month."""
+        days_in_month = calendar.monthrange(for_date.year, for_date.month)[1]
+        return for_date.replace(day=days_in_month)
+
     def get_name(self):
         return "month"
 
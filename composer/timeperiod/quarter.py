@@ -1,3 +1,5 @@
+import calendar
+
 from .base import Period
 from .month import Month
 
@@ -22,6 +24,19 @@ class _Quarter(Period):
         else:
             return False
 
+    def _get_first_month(self, for_date):
+        return for_date.month - (for_date.month - 1) % 3
+
+    def get_start_date(self, for_date):
+        """The 1st of the first month of the quarter."""
+        return for_date.replace(month=self._get_first_month(for_date), day=1)
+
+    def get_end_date(self, for_date):
+        """The last day of the last month of the quarter."""
+        last_month = self._get_first_month(for_date) + 2
+        days_in_month = calendar.monthrange(for_date.year, last_month)[1]
+        return for_date.replace(month=last_month, day=days_in_month)
+
     def get_name(self):
         return "quarter"
 
@@ -5,6 +5,7 @@ from .day import Day
 from .month import Month
 
 MIN_WEEK_LENGTH = 5
+SUNDAY = 6  # see `datetime.date.weekday`
 
 
 class _Week(Period):
@@ -31,6 +32,38 @@ class _Week(Period):
         else:
             return False
 
+    def _is_sunday_start(self, day, days_in_month):
+        """Whether a Sunday, given by its day of the month, starts a week,
+        i.e. whether neither the week before it (which began on the 1st) nor
+        the week starting on it would be shorter than the minimum length.
+        """
+        return (
+            day > MIN_WEEK_LENGTH
+            and days_in_month - day + 1 >= MIN_WEEK_LENGTH
+        )
+
+    def get_start_date(self, for_date):
+        """The last week-starting Sunday up to the date, else the 1st."""
+        days_in_month = calendar.monthrange(for_date.year, for_date.month)[1]
+        # the latest Sunday on or before the date
+        day = for_date.day - (for_date.weekday() - SUNDAY) % 7
+        while day > 1:
+            if self._is_sunday_start(day, days_in_month):
+                return for_date.replace(day=day)
+            day -= 7
+        return for_date.replace(day=1)
+
+    def get_end_date(self, for_date):
+        """The day before the next week-starting Sunday, else month end."""
+        days_in_month = calendar.monthrange(for_date.year, for_date.month)[1]
+        # the earliest Sunday after the date
+        day = for_date.day + (SUNDAY - for_date.weekday() - 1) % 7 + 1
+        while day <= days_in_month:
+            if self._is_sunday_start(day, days_in_month):
+                return for_date.replace(day=day - 1)
+            day += 7
+        return for_date.replace(day=days_in_month)
+
     def get_name(self):
         return "week"
 
@@ -2,6 +2,7 @@ from .base import Period
 from .quarter import Quarter
 
 FIRST_MONTH_OF_YEAR = 1
+LAST_MONTH_OF_YEAR = 12
 
 
 class _Year(Period):
@@ -22,6 +23,14 @@ class _Year(Period):
         else:
             return False
 
+    def get_start_date(self, for_date):
+        """January 1st."""
+        return for_date.replace(month=FIRST_MONTH_OF_YEAR, day=1)
+
+    def get_end_date(self, for_date):
+        """December 31st."""
+        return for_date.replace(month=LAST_MONTH_OF_YEAR, day=31)
+
     def get_name(self):
         return "year"
 
@@ -10,6 +10,12 @@ from . import config
 from . import updateindex
 from .cache import read_cache, archive_cache
 from .backend import FilesystemPlanner, FilesystemTasklist
+from .backend.filesystem.primitives import (
+    ParseCache,
+    Transaction,
+    get_directory_state,
+    set_parse_cache,
+)
 from .timeperiod import (
     Zero,
     Day,
@@ -39,6 +45,7 @@ except ImportError:  # py3
 
 CONFIG_ROOT = os.getenv("COMPOSER_ROOT", os.path.expanduser("~/.composer"))
 CONFIG_FILE = os.path.join(CONFIG_ROOT, config.CONFIG_FILENAME)
+CACHE_DIR = os.path.join(CONFIG_ROOT, config.PARSE_CACHE_DIRNAME)
 
 
 def _make_git_commit(wikidir, message):
@@ -64,10 +71,17 @@ def _show_advice(wikidir, preferences):
     display_message(advice.get_advice(lessons_files))
 
 
-def _pass_baton(wikidir, preferences):
+def _pass_baton(wikidir, preferences, plannerdate=None):
     """Display the contents of the "baton" file (usually Cache.wiki)
     as the strands in progress / next steps to pick up on. Then clear
-    the file.
+    the file, appending its contents to the archive. If the
+    `archive_cache_max_size` preference is set, the archive is rotated into
+    dated segments once it grows past that many bytes.
+
+    The archive runs oldest first. Archives written before notes were
+    appended to them ran newest first, and are reversed the first time
+    notes are archived to them, keeping the original as a backup (see
+    `composer.cache.migrate_archive`).
     """
     cache_file = preferences.get('cache_file')
     if cache_file:
@@ -82,7 +96,13 @@ def _pass_baton(wikidir, preferences):
             display_message()
             display_message(notes)
             # move it to the archive
-            archive_cache(cache_path, archive_cache_path)
+            max_size = preferences.get('archive_cache_max_size')
+            archive_cache(
+                cache_path,
+                archive_cache_path,
+                max_size=int(max_size) if max_size else None,
+                for_date=plannerdate,
+            )
 
 
 def _post_advance_tasks(wikidir, plannerdate, preferences):
@@ -106,7 +126,7 @@ def _post_advance_tasks(wikidir, plannerdate, preferences):
     message = "SOD %s" % datestr
     _make_git_commit(wikidir, message)
 
-    _pass_baton(wikidir, preferences)
+    _pass_baton(wikidir, preferences, plannerdate)
 
     _show_advice(wikidir, preferences)
 
@@ -128,11 +148,31 @@ def process_wiki(wikidir, preferences):
     )  # mutates preferences
 
     period_prompted = Zero
+    planner = None
+    wiki_state = None
     while True:
         display_message()
         try:
-            tasklist = FilesystemTasklist(wikidir)
-            planner = FilesystemPlanner(wikidir, tasklist, preferences)
+            if (
+                planner is None
+                or planner.advance_state is None
+                or get_directory_state(wikidir) != wiki_state
+            ):
+                # the advance can't be resumed, or the user changed the wiki
+                # while it was interrupted, so start over
+                wiki_state = get_directory_state(wikidir)
+                tasklist = FilesystemTasklist(wikidir)
+                planner = FilesystemPlanner(wikidir, tasklist, preferences)
+                if preferences.get('prefetch'):
+                    elapsed = planner.prefetch()
+                    display_message(
+                        "Prefetched planner files in %.1f ms"
+                        % (elapsed * 1000)
+                    )
+            else:
+                # pick up where the advance left off, in light of the user's
+                # response
+                planner.set_preferences(preferences)
             status, next_day_planner = planner.advance()
         except LogfileNotCompletedError as err:
             display_message(
@@ -292,13 +332,26 @@ def process_wiki(wikidir, preferences):
                 next_period = (
                     get_next_period(status) if status < Year else status
                 )
-                planner.save(next_period)
-
-                # save all newly advanced periods
-                next_day_planner.save(status)
-
-                # save the (common) tasklist
-                planner.tasklist.save()
+                # all of the changes are made on disk together, once they
+                # have all been staged
+                # files that haven't changed since they were loaded aren't
+                # written
+                with Transaction() as transaction:
+                    counts = [
+                        planner.save(next_period, transaction=transaction),
+                        # save all newly advanced periods
+                        next_day_planner.save(
+                            status, transaction=transaction
+                        ),
+                        # save the (common) tasklist
+                        planner.tasklist.save(transaction=transaction),
+                    ]
+                written = sum(w for w, _ in counts)
+                skipped = sum(s for _, s in counts)
+                display_message(
+                    "Saved planner: %d files written, %d unchanged"
+                    % (written, skipped)
+                )
 
                 _post_advance_tasks(
                     wikidir, next_day_planner.date, preferences
@@ -323,10 +376,22 @@ def process_wiki(wikidir, preferences):
 )
 @click.argument("wikipath", required=False)
 @click.option("-j", "--jump", is_flag=True, help="Jump to present day.")
-def main(wikipath=None, jump=False):
+@click.option(
+    "--prefetch",
+    is_flag=True,
+    help="Read all planner files concurrently up front.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Don't use or update the cache of parsed wiki files.",
+)
+def main(wikipath=None, jump=False, prefetch=False, no_cache=False):
     # could try: [Display score for today]
 
     preferences = config.read_user_preferences(CONFIG_FILE)
+    if not no_cache:
+        set_parse_cache(ParseCache(CACHE_DIR))
     # if wikipath is specified, it should override
     # the configured paths in the ini file
     if wikipath:
@@ -341,6 +406,9 @@ def main(wikipath=None, jump=False):
         display_message()
         ask_input()
 
+    if prefetch:
+        preferences['prefetch'] = prefetch
+
     for wikidir in wikidirs:
         process_wiki(
             wikidir,
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Benchmark for advancing the planner.
+
+Advances planners on synthetic wikis of increasing size and reports the time
+taken and the number of bytes of file contents copied in the course of each
+advance. Run with:
+
+    python -m tests.benchmarks.advance_benchmark
+"""
+
+import shutil
+import tempfile
+import timeit
+
+from composer.backend import FilesystemPlanner, FilesystemTasklist
+from composer.backend.filesystem.primitives.files import (
+    get_bytes_copied,
+    reset_bytes_copied,
+)
+from composer.config import LOGFILE_CHECKING
+from composer.timeperiod import Day
+
+from .wiki import make_wiki
+
+SIZES = (10, 100, 1000)
+
+
+def advance(wikidir):
+    """Advance the planner at the given location by a day, without saving
+    it.
+
+    :param str wikidir: The location of the planner wiki
+    :returns int: The number of bytes copied during the advance
+    """
+    tasklist = FilesystemTasklist(wikidir)
+    planner = FilesystemPlanner(wikidir, tasklist)
+    planner.set_preferences(
+        {
+            'week_theme': '',
+            'agenda_reviewed': Day,
+            'logfile_completion_checking': LOGFILE_CHECKING['LAX'],
+        }
+    )
+    reset_bytes_copied()
+    planner.advance()
+    return get_bytes_copied()
+
+
+def run(sizes=SIZES, repeat=3):
+    """Time a day advance on wikis of each of the given sizes.
+
+    :param tuple sizes: Number of entries per section in each wiki
+    :param int repeat: Number of timings to take the best of
+    :returns list: (size, seconds, bytes copied) tuples
+    """
+    results = []
+    for n in sizes:
+        wikidir = tempfile.mkdtemp()
+        try:
+            make_wiki(wikidir, n)
+            copied = advance(wikidir)
+            timings = timeit.repeat(
+                lambda: advance(wikidir), number=1, repeat=repeat
+            )
+            seconds = min(timings)
+        finally:
+            shutil.rmtree(wikidir)
+        results.append((n, seconds, copied))
+    return results
+
+
+def main():
+    results = run()
+    print("{:>10} {:>12} {:>14}".format("entries", "seconds", "bytes copied"))
+    for n, seconds, copied in results:
+        print("{:>10} {:>12.4f} {:>14}".format(n, seconds, copied))
+
+
+if __name__ == "__main__":
+    main()
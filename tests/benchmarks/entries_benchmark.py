@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""Scaling benchmark for entry parsing.
+
+Parses synthetic logfiles of increasing size and reports the time taken per
+entry, which should stay roughly constant if parsing is linear in the size of
+the file. Run with:
+
+    python -m tests.benchmarks.entries_benchmark
+"""
+
+import timeit
+
+from composer.backend.filesystem.primitives import get_entries, make_file
+
+SIZES = (100, 1000, 10000, 100000)
+
+
+def make_logfile(n):
+    """Make a logfile containing n entries, every third of which has
+    subtasks.
+
+    :param int n: The number of entries
+    :returns :class:`io.StringIO`: The logfile
+    """
+    lines = []
+    for i in range(n):
+        lines.append("[ ] task number {}\n".format(i))
+        if i % 3 == 0:
+            lines.append("\t[x] a subtask\n")
+            lines.append("\tsome clarification\n")
+    return make_file("".join(lines))
+
+
+def run(sizes=SIZES, repeat=3):
+    """Time `get_entries` on logfiles of each of the given sizes.
+
+    :param tuple sizes: Number of entries in each logfile to be parsed
+    :param int repeat: Number of timings to take the best of
+    :returns list: (size, seconds) pairs
+    """
+    results = []
+    for n in sizes:
+        logfile = make_logfile(n)
+        timings = timeit.repeat(
+            lambda: get_entries(logfile), number=1, repeat=repeat
+        )
+        seconds = min(timings)
+        results.append((n, seconds))
+    return results
+
+
+def main():
+    results = run()
+    print("{:>10} {:>12} {:>16}".format("entries", "seconds", "usec / entry"))
+    for n, seconds in results:
+        print(
+            "{:>10} {:>12.4f} {:>16.3f}".format(n, seconds, seconds * 1e6 / n)
+        )
+
+
+if __name__ == "__main__":
+    main()
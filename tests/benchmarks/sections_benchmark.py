@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""Benchmark for adding entries to sections of a logfile.
+
+Repeatedly appends a day's agenda to the agenda of synthetic logfiles of
+increasing size, as happens in cascading agendas into a year's log, and
+reports the time taken per addition, which should not grow with the size of
+the logfile. Run with:
+
+    python -m tests.benchmarks.sections_benchmark
+"""
+
+import timeit
+
+from composer.backend.filesystem.primitives import add_to_section, make_file
+
+from .wiki import make_log
+
+SIZES = (100, 1000, 10000, 100000)
+
+AGENDA = "[x] a task\n[-] another task\n"
+
+
+def cascade(logfile, times):
+    """Append the agenda to the logfile the given number of times.
+
+    :param :class:`io.StringIO` logfile: The logfile
+    :param int times: The number of additions
+    :returns :class:`io.StringIO`: The updated logfile
+    """
+    for _ in range(times):
+        logfile = add_to_section(
+            logfile, 'agenda', AGENDA, above=False, ensure_separator=True
+        )
+    return logfile
+
+
+def run(sizes=SIZES, times=100, repeat=3):
+    """Time repeated additions to logfiles of each of the given sizes.
+
+    :param tuple sizes: Number of agenda items and notes in each logfile
+    :param int times: Number of additions to time
+    :param int repeat: Number of timings to take the best of
+    :returns list: (size, seconds per addition) pairs
+    """
+    results = []
+    for n in sizes:
+        logfile = make_file(make_log("2012", n))
+        timings = timeit.repeat(
+            lambda: cascade(logfile, times), number=1, repeat=repeat
+        )
+        results.append((n, min(timings) / times))
+    return results
+
+
+def main():
+    results = run()
+    print("{:>10} {:>16}".format("entries", "usec / addition"))
+    for n, seconds in results:
+        print("{:>10} {:>16.2f}".format(n, seconds * 1e6))
+
+
+if __name__ == "__main__":
+    main()
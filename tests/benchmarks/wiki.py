@@ -0,0 +1,131 @@
+"""Synthetic planner wikis for use in benchmarks."""
+
+import datetime
+import os
+
+from composer.backend.filesystem.base import (
+    PLANNERDAYFILELINK,
+    PLANNERDAYTHEMESFILE,
+    PLANNERTASKLISTFILE,
+)
+from composer.backend.filesystem.primitives import (
+    bare_filename,
+    get_log_filename,
+)
+from composer.timeperiod import Day, Week, Month, Quarter, Year
+
+# a Wednesday, so that advancing the planner advances only the day
+DEFAULT_DATE = datetime.date(2012, 12, 5)
+
+LOG_TEMPLATE = (
+    "= {title} =\n"
+    "\n"
+    "{links}"
+    "\n"
+    "CHECKPOINTS:\n"
+    "[ ] checkpoint []\n"
+    "\n"
+    "AGENDA:\n"
+    "{agenda}"
+    "\n"
+    "PERIODICs:\n"
+    "[ ] a periodic task\n"
+    "\n"
+    "NOTES:\n"
+    "{notes}"
+    "\n"
+    "TIME SPENT ON PLANNER: 15 mins\n"
+)
+
+DAYTHEMES = (
+    "SUNDAY: \nMONDAY: \nTUESDAY: \nWEDNESDAY: \n"
+    "THURSDAY: \nFRIDAY: \nSATURDAY: \n"
+)
+
+TASKLIST_SECTIONS = (
+    "TOMORROW",
+    "THIS WEEK",
+    "THIS MONTH",
+    "THIS QUARTER",
+    "THIS YEAR",
+    "SOMEDAY",
+)
+
+SUPPORTING_FILES = (
+    "Checkpoints_Weekday_Standard.wiki",
+    "Checkpoints_Weekend_Standard.wiki",
+    "Checkpoints_Week.wiki",
+    "Checkpoints_Month.wiki",
+    "Checkpoints_Quarter.wiki",
+    "Checkpoints_Year.wiki",
+    "Periodic_Daily_Standard.wiki",
+    "Periodic_Weekly.wiki",
+    "Periodic_Monthly.wiki",
+    "Periodic_Quarterly.wiki",
+    "Periodic_Yearly.wiki",
+)
+
+
+def _tasks(n, done=False):
+    status = "x" if done else " "
+    lines = []
+    for i in range(n):
+        lines.append("[{}] task number {}\n".format(status, i))
+        if i % 3 == 0:
+            lines.append("\t[ ] a subtask\n")
+    return "".join(lines)
+
+
+def make_tasklist(n):
+    """Make a tasklist with n tasks in each section.
+
+    :param int n: The number of tasks per section
+    :returns str: The tasklist
+    """
+    return "".join(
+        "{}:\n{}\n".format(section, _tasks(n)) for section in TASKLIST_SECTIONS
+    )
+
+
+def make_log(title, n, link=None):
+    """Make a logfile with n completed agenda items and n lines of notes.
+
+    :param str title: The title of the log
+    :param int n: The number of agenda items and notes
+    :param str link: The title of a log (e.g. for a contained period) to
+        link to
+    :returns str: The logfile
+    """
+    links = "\t* [[{}]]\n".format(link) if link else ""
+    notes = "".join("note number {}\n".format(i) for i in range(n))
+    return LOG_TEMPLATE.format(
+        title=title, links=links, agenda=_tasks(n, done=True), notes=notes
+    )
+
+
+def _write(root, filename, contents):
+    with open(os.path.join(root, filename), "w") as f:
+        f.write(contents)
+
+
+def make_wiki(root, n=100, date=DEFAULT_DATE):
+    """Populate a directory with a planner wiki whose current date is the
+    given date, with logs and a tasklist containing roughly n entries per
+    section.
+
+    :param str root: The directory in which to create the wiki
+    :param int n: The number of entries per section
+    :param :class:`datetime.date` date: The current date of the planner
+    """
+    link = None
+    for period in (Day, Week, Month, Quarter, Year):
+        filename = get_log_filename(period.get_start_date(date), period)
+        _write(root, filename, make_log(bare_filename(filename), n, link))
+        link = bare_filename(filename)
+    _write(root, PLANNERTASKLISTFILE, make_tasklist(n))
+    _write(root, PLANNERDAYTHEMESFILE, DAYTHEMES)
+    for filename in SUPPORTING_FILES:
+        _write(root, filename, "[ ] item []\n")
+    os.symlink(
+        get_log_filename(date, Day), os.path.join(root, PLANNERDAYFILELINK)
+    )
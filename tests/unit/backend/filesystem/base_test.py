@@ -4,9 +4,17 @@ import pytest
 from datetime import timedelta
 
 from composer.backend.filesystem.primitives.files import make_file
+from composer.backend.filesystem.primitives.storage import (
+    Transaction,
+    get_log_filename,
+)
 from composer.config import LOGFILE_CHECKING
 from composer.errors import LogfileAlreadyExistsError, LogfileLayoutError
-from composer.backend.filesystem.base import PLANNERTASKLISTFILE
+from composer.backend.filesystem.base import (
+    PLANNERTASKLISTFILE,
+    FilesystemPlanner,
+    FilesystemTasklist,
+)
 from composer.timeperiod import Zero, Day, Month, Week, Quarter, Year, Eternity
 from composer.timeperiod.interface import TIME_PERIODS
 
@@ -18,7 +26,7 @@ class TestFilesystemBase(object):
     def note_filename(self):
         self.filenames = []
 
-        def make_note(contents, filename):
+        def make_note(contents, filename, transaction=None):
             name_index = filename.rfind('/')
             name = filename[name_index + 1 :]
             self.filenames.append(name)
@@ -30,6 +38,109 @@ class TestPlanner(TestFilesystemBase):
     pass
 
 
+class TestLazyLoading(TestPlanner):
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_file_read_on_first_access(self, mock_read_file, planner):
+        mock_read_file.return_value = make_file("contents\n")
+        planner._unloaded = {'weekfile': '/wiki/week.wiki'}
+        mock_read_file.assert_not_called()
+        assert planner.weekfile.getvalue() == "contents\n"
+        assert planner.weekfile.getvalue() == "contents\n"
+        mock_read_file.assert_called_once_with('/wiki/week.wiki')
+
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_failed_read_is_retried(self, mock_read_file, planner):
+        planner._unloaded = {'weekfile': '/wiki/week.wiki'}
+        mock_read_file.side_effect = FileNotFoundError
+        with pytest.raises(FileNotFoundError):
+            planner.weekfile
+        assert planner._unloaded == {'weekfile': '/wiki/week.wiki'}
+        mock_read_file.side_effect = None
+        mock_read_file.return_value = make_file("contents\n")
+        assert planner.weekfile.getvalue() == "contents\n"
+        assert planner._unloaded == {}
+
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_set_file_is_not_overwritten(self, mock_read_file, planner):
+        planner._unloaded = {'weekfile': '/wiki/week.wiki'}
+        planner.weekfile = make_file("new contents\n")
+        assert planner.weekfile.getvalue() == "new contents\n"
+        mock_read_file.assert_not_called()
+
+    @patch('composer.backend.filesystem.base.os')
+    @patch('composer.backend.filesystem.base.read_file')
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_unloaded_log_not_written(
+        self, mock_write_file, mock_read_file, mock_os, planner
+    ):
+        planner._unloaded = {'monthfile': '/wiki/month.wiki'}
+        written, skipped = planner.save(Month)
+        mock_read_file.assert_not_called()
+        assert written == 2  # week and day
+        assert skipped == 1
+
+    def test_state_not_shared(self, planner):
+        other = FilesystemPlanner()
+        assert other._unloaded is not planner._unloaded
+        assert other._digests is not planner._digests
+        tasklist = FilesystemTasklist()
+        assert tasklist._unloaded is not FilesystemTasklist()._unloaded
+
+
+class TestPrefetch(TestPlanner):
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_reads_all_unloaded_files(self, mock_read_file, planner):
+        mock_read_file.side_effect = lambda path: make_file(path)
+        planner._unloaded = {
+            'weekfile': '/wiki/week.wiki',
+            'monthfile': '/wiki/month.wiki',
+        }
+        planner.tasklist._unloaded = {'file': '/wiki/TaskList.wiki'}
+        elapsed = planner.prefetch()
+        assert elapsed >= 0
+        assert mock_read_file.call_count == 3
+        assert planner._unloaded == {}
+        assert planner.tasklist._unloaded == {}
+        assert planner.weekfile.getvalue() == '/wiki/week.wiki'
+        assert planner.monthfile.getvalue() == '/wiki/month.wiki'
+        assert planner.tasklist.file.getvalue() == '/wiki/TaskList.wiki'
+        assert mock_read_file.call_count == 3
+
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_nothing_to_prefetch(self, mock_read_file, planner):
+        assert planner.prefetch() == 0
+        mock_read_file.assert_not_called()
+
+
+class TestClone(TestPlanner):
+    def test_shares_files(self, planner):
+        clone = planner.clone()
+        assert clone._dayfile is planner._dayfile
+        assert clone._weekfile is planner._weekfile
+        assert clone.tasklist is planner.tasklist
+
+    def test_set_file_is_not_shared(self, planner):
+        original = planner.dayfile.getvalue()
+        clone = planner.clone()
+        clone.dayfile = make_file("new contents\n")
+        assert clone.dayfile.getvalue() == "new contents\n"
+        assert planner.dayfile.getvalue() == original
+
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_unloaded_files_are_not_shared(self, mock_read_file, planner):
+        mock_read_file.return_value = make_file("contents\n")
+        planner._unloaded = {'weekfile': '/wiki/week.wiki'}
+        clone = planner.clone()
+        clone.weekfile = make_file("new contents\n")
+        assert planner._unloaded == {'weekfile': '/wiki/week.wiki'}
+        assert planner.weekfile.getvalue() == "contents\n"
+        assert clone.weekfile.getvalue() == "new contents\n"
+
+    def test_does_not_clone_next_day_planner(self, planner):
+        planner.next_day_planner = planner.clone()
+        assert planner.clone().next_day_planner is None
+
+
 class TestGetAgenda(TestPlanner):
     def test_no_period_returns_none(self, planner):
         result = planner.get_agenda(Zero)
@@ -162,15 +273,51 @@ class TestCheckLogCompletion(TestPlanner):
         assert result is True
 
 
+class TestHasLog(TestPlanner):
+    def _make_log(self, path, for_date, period):
+        name = get_log_filename(period.get_start_date(for_date), period)
+        with open(str(path / name), "w") as f:
+            f.write("")
+
+    def test_log_exists(self, tmp_path, planner):
+        planner.location = str(tmp_path)
+        self._make_log(tmp_path, datetime.date(2012, 12, 5), Week)
+        assert planner.has_log(datetime.date(2012, 12, 5), Week)
+        assert planner.has_log(datetime.date(2012, 12, 8), Week)
+
+    def test_log_does_not_exist(self, tmp_path, planner):
+        planner.location = str(tmp_path)
+        self._make_log(tmp_path, datetime.date(2012, 12, 5), Week)
+        assert not planner.has_log(datetime.date(2012, 12, 9), Week)
+        assert not planner.has_log(datetime.date(2012, 12, 5), Day)
+
+    @patch('composer.backend.filesystem.base.read_file')
+    def test_log_is_not_read(self, mock_read_file, tmp_path, planner):
+        planner.location = str(tmp_path)
+        self._make_log(tmp_path, datetime.date(2012, 12, 5), Month)
+        assert planner.has_log(datetime.date(2012, 12, 5), Month)
+        mock_read_file.assert_not_called()
+
+    def test_new_log(self, tmp_path, planner):
+        planner.location = str(tmp_path)
+        assert not planner.has_log(datetime.date(2012, 12, 5), Day)
+        self._make_log(tmp_path, datetime.date(2012, 12, 5), Day)
+        assert planner.has_log(datetime.date(2012, 12, 5), Day)
+
+
 class TestOkToAdvance(TestPlanner):
-    @patch(
-        'composer.backend.filesystem.interface.os.path.isfile',
-        return_value=True,
-    )
-    def test_new_logfile_preexists_raises_error(self, mock_isfile, planner):
+    def test_new_logfile_preexists_raises_error(self, tmp_path, planner):
+        planner.location = str(tmp_path)
+        name = get_log_filename(Week.get_start_date(planner.date), Week)
+        with open(str(tmp_path / name), "w") as f:
+            f.write("")
         with pytest.raises(LogfileAlreadyExistsError):
             planner.is_ok_to_advance()
 
+    def test_no_new_logfiles(self, tmp_path, planner):
+        planner.location = str(tmp_path)
+        planner.is_ok_to_advance()
+
 
 class TestPlannerSave(TestPlanner):
     @patch('composer.backend.filesystem.base.os')
@@ -211,6 +358,50 @@ class TestPlannerSave(TestPlanner):
         # because os is mocked, this filename remains 'currentquarter'
         assert not any('Month' in filename for filename in self.filenames)
 
+    @patch('composer.backend.filesystem.base.os')
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_stages_changes_in_transaction(
+        self, mock_write_file, mock_os, planner
+    ):
+        transaction = MagicMock()
+        planner.save(Month, transaction=transaction)
+        for call in mock_write_file.call_args_list:
+            assert call.kwargs['transaction'] is transaction
+        transaction.symlink.assert_called_once()
+        mock_os.symlink.assert_not_called()
+        mock_os.remove.assert_not_called()
+
+    @patch('composer.backend.filesystem.base.os')
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_reports_files_written(self, mock_write_file, mock_os, planner):
+        written, skipped = planner.save(Month)
+        assert written == 3  # month, week and day
+        assert skipped == 0
+
+    @patch('composer.backend.filesystem.base.os')
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_skips_unchanged_logs(self, mock_write_file, mock_os, planner):
+        planner.save(Month)
+        mock_write_file.reset_mock()
+        written, skipped = planner.save(Month)
+        mock_write_file.assert_not_called()
+        assert written == 0
+        assert skipped == 3
+
+    @patch('composer.backend.filesystem.base.os')
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_writes_changed_logs(self, mock_write_file, mock_os, planner):
+        planner.save(Month)
+        mock_write_file.reset_mock()
+        mock_write_file.side_effect = self.note_filename()
+        planner.weekfile = make_file(planner.weekfile.getvalue() + "more\n")
+        written, skipped = planner.save(Month)
+        assert written == 1
+        assert skipped == 2
+        assert mock_write_file.call_count == 1
+        args, _ = mock_write_file.call_args
+        assert args[0].getvalue() == planner.weekfile.getvalue()
+
 
 class TestTasklist(TestFilesystemBase):
     def _tasklist(self, task="", period=Day):
@@ -253,6 +444,41 @@ class TestTasklistSave(TestTasklist):
             PLANNERTASKLISTFILE in filename for filename in self.filenames
         )
 
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_stages_write_in_transaction(self, mock_write_file, tasklist):
+        transaction = MagicMock()
+        tasklist.save(transaction=transaction)
+        _, kwargs = mock_write_file.call_args
+        assert kwargs['transaction'] is transaction
+
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_uncommitted_write_not_skipped(self, mock_write_file, tasklist):
+        transaction = Transaction()
+        tasklist.save(transaction=transaction)
+        # the transaction is abandoned, e.g. because committing it failed
+        mock_write_file.reset_mock()
+        assert tasklist.save() == (1, 0)
+        mock_write_file.assert_called_once()
+
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_committed_write_skipped(self, mock_write_file, tasklist):
+        transaction = Transaction()
+        tasklist.save(transaction=transaction)
+        transaction.commit()
+        mock_write_file.reset_mock()
+        assert tasklist.save() == (0, 1)
+        mock_write_file.assert_not_called()
+
+    @patch('composer.backend.filesystem.base.write_file')
+    def test_skips_unchanged_tasklist(self, mock_write_file, tasklist):
+        tasklist.save()
+        mock_write_file.reset_mock()
+        assert tasklist.save() == (0, 1)
+        mock_write_file.assert_not_called()
+        tasklist.file = make_file(tasklist.file.getvalue() + "[ ] task\n")
+        assert tasklist.save() == (1, 0)
+        mock_write_file.assert_called_once()
+
 
 class TestTasklistPlaceTasks(TestTasklist):
     def test_tomorrow(self, tasklist):
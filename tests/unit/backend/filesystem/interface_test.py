@@ -8,7 +8,8 @@ from composer.backend.filesystem.interface import (
     compute_time_spent_on_planner,
     time_spent_on_planner,
 )
-from composer.timeperiod import Zero, Day, Week
+from composer.backend.filesystem.primitives import get_log_filename
+from composer.timeperiod import Zero, Day, Week, Month, Quarter
 from ...fixtures import logfile, complete_logfile  # noqa
 
 try:  # py2
@@ -23,20 +24,6 @@ except NameError:  # py2
     FileNotFoundError = IOError
 
 
-class LogTimes(object):
-
-    times = 0
-
-    def __init__(self, n):
-        self.n = n
-
-    def __call__(self, *args, **kwargs):
-        if self.times < self.n:
-            self.times += 1
-            return str(self.times)
-        raise FileNotFoundError
-
-
 class TestGetLogForDate(object):
     @patch('composer.backend.filesystem.interface.read_file')
     def test_retrieves_log(self, mock_read_file, logfile):
@@ -70,33 +57,33 @@ class TestTimeSpentOnPlanner(object):
             ('35 + 30 = 1hr 5 mins (completed next day)\n', 65),
         ],
     )
-    @patch('composer.backend.filesystem.interface.get_entries')
+    @patch('composer.backend.filesystem.interface.iter_entries')
     @patch('composer.backend.filesystem.interface.read_file')
     def test_time_is_parsed(
         self,
         mock_read_file,
-        mock_get_entries,
+        mock_iter_entries,
         time_string,
         expected_time,
         logfile,
     ):
         mock_read_file.return_value = StringIO('')
-        mock_get_entries.return_value = [
-            'TIME SPENT ON PLANNER: ' + time_string
-        ]
+        mock_iter_entries.return_value = iter(
+            ['TIME SPENT ON PLANNER: ' + time_string]
+        )
         time_spent = time_spent_on_planner(logfile)
         assert time_spent == expected_time
 
-    @patch('composer.backend.filesystem.interface.get_entries')
+    @patch('composer.backend.filesystem.interface.iter_entries')
     @patch('composer.backend.filesystem.interface.read_file')
     def test_missing_time(
         self,
         mock_read_file,
-        mock_get_entries,
+        mock_iter_entries,
         logfile,
     ):
         mock_read_file.return_value = StringIO('')
-        mock_get_entries.return_value = ['TIME SPENT ON PLANNER: ']
+        mock_iter_entries.return_value = iter(['TIME SPENT ON PLANNER: '])
         time_spent = time_spent_on_planner(logfile)
         assert time_spent == 0
 
@@ -119,6 +106,8 @@ class TestComputeTimeSpentOnPlanner(object):
             Day, for_date, '/path/to/root'
         )
         assert time_spent == (0, 25)
+        # day logs are small, so they are read rather than mapped
+        mock_get_log.assert_called_once_with(Day, for_date, '/path/to/root')
 
     @patch('composer.backend.filesystem.interface.get_constituent_logs')
     def test_time_spent_on_week(self, mock_get_logs, complete_logfile):
@@ -135,23 +124,62 @@ class TestComputeTimeSpentOnPlanner(object):
 
 
 class TestGetConstituentLogs(object):
-    @patch('composer.backend.filesystem.interface.get_log_for_date')
-    def test_for_day_returns_empty(self, mock_get_log):
-        mock_get_log.side_effect = LogTimes(1)
-        for_date = date.today() - timedelta(days=15)
-        logs = get_constituent_logs(Day, for_date, '/path/to/root')
+    for_date = date(2012, 10, 16)
+
+    def _write_logs(self, root, period, dates):
+        for for_date in dates:
+            name = get_log_filename(period.get_start_date(for_date), period)
+            (root / name).write_text(
+                "{}\n".format(period.get_start_date(for_date))
+            )
+
+    def _days(self):
+        start = Week.get_start_date(self.for_date)
+        return [start + timedelta(days=i) for i in range(7)]
+
+    def test_for_day_returns_empty(self, tmp_path):
+        self._write_logs(tmp_path, Day, [self.for_date])
+        logs = get_constituent_logs(Day, self.for_date, str(tmp_path))
         assert logs == []
 
-    @patch('composer.backend.filesystem.interface.get_log_for_date')
-    def test_for_in_progress_period(self, mock_get_log):
-        mock_get_log.side_effect = LogTimes(1)
-        for_date = date.today() - timedelta(days=15)
-        logs = get_constituent_logs(Week, for_date, '/path/to/root')
-        assert logs == ['1']
+    def test_for_in_progress_period(self, tmp_path):
+        days = self._days()
+        self._write_logs(tmp_path, Day, days[:1])
+        logs = get_constituent_logs(Week, self.for_date, str(tmp_path))
+        assert [log.getvalue() for log in logs] == ["{}\n".format(days[0])]
+
+    def test_for_completed_period(self, tmp_path):
+        days = self._days()
+        self._write_logs(tmp_path, Day, days)
+        logs = get_constituent_logs(Week, self.for_date, str(tmp_path))
+        assert [log.getvalue() for log in logs] == [
+            "{}\n".format(day) for day in days
+        ]
 
-    @patch('composer.backend.filesystem.interface.get_log_for_date')
-    def test_for_completed_period(self, mock_get_log):
-        mock_get_log.side_effect = LogTimes(10)
-        for_date = date(2012, 10, 16)
-        logs = get_constituent_logs(Week, for_date, '/path/to/root')
-        assert logs == [str(i) for i in range(1, 8)]
+    def test_missing_logs(self, tmp_path):
+        days = self._days()
+        self._write_logs(tmp_path, Day, days[::2])
+        logs = get_constituent_logs(
+            Week, self.for_date, str(tmp_path), with_instances=True
+        )
+        assert [
+            (instance.start, log.getvalue()) for instance, log in logs
+        ] == [(day, "{}\n".format(day)) for day in days[::2]]
+
+    @patch('composer.backend.filesystem.interface.read_file')
+    def test_only_longer_periods_mapped(self, mock_read_file, tmp_path):
+        self._write_logs(tmp_path, Day, self._days())
+        get_constituent_logs(Week, self.for_date, str(tmp_path))
+        assert mock_read_file.call_count == 7
+        assert all(
+            not call[1]['mapped'] for call in mock_read_file.call_args_list
+        )
+        mock_read_file.reset_mock()
+        self._write_logs(
+            tmp_path, Month, [date(2012, 10, 1), date(2012, 11, 1)]
+        )
+        get_constituent_logs(Quarter, self.for_date, str(tmp_path))
+        assert mock_read_file.call_count == 2
+        assert all(
+            call[1]['mapped'] for call in mock_read_file.call_args_list
+        )
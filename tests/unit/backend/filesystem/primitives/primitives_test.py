@@ -1,24 +1,75 @@
+import datetime
+import mmap
+import os
 import pytest
 import re
+from collections import OrderedDict
+from mock import patch
+
+try:  # py2
+    from StringIO import StringIO
+except ImportError:  # py3
+    from io import StringIO
 
 from composer.backend.filesystem.primitives.entries import (
     add_to_section,
+    add_to_sections,
     read_section,
     partition_entries,
     get_entries,
+    iter_entries,
+    iter_section,
+    parse_entries,
     read_entry,
+    _read_entries,
 )
 from composer.backend.filesystem.primitives.files import (
     make_file,
+    copy_file,
     partition_at,
     append_files,
+    contain_file_mutation,
+    get_bytes_copied,
+    get_document,
+    read_file,
+    reset_bytes_copied,
+)
+from composer.backend.filesystem.primitives.document import (
+    MappedDocument,
+    PieceTable,
+    map_document,
+)
+from composer.backend.filesystem.primitives.parse_cache import (
+    ParseCache,
+    USAGE_RESOLUTION,
+    set_parse_cache,
+)
+from composer.backend.filesystem.primitives.log_index import (
+    LogIndex,
+    get_log_index,
+)
+from composer.backend.filesystem.primitives.storage import (
+    Transaction,
+    get_directory_state,
+    map_file as storage_map_file,
+    parse_log_filename,
+)
+from composer.backend.filesystem.primitives.sections import (
+    SectionIndex,
+    get_section_index,
 )
 from composer.backend.filesystem.primitives.parsing import (
+    Entry,
+    TaskStatus,
+    get_status,
+    parse_task,
+    is_scheduled_task,
     is_done_task,
     is_undone_task,
     is_completed,
     is_unfinished,
 )
+from composer.timeperiod import Day, Week, Quarter, PeriodInstance
 
 from ....fixtures import logfile, empty_logfile, tasklist_file  # noqa
 
@@ -95,6 +146,168 @@ class TestReadEntry(object):
         assert complement.read() == empty_logfile.read()
 
 
+class TestReadEntries(object):
+    def _read_entries_by_complement(self, file):
+        entries = []
+        entry, complement = read_entry(file)
+        while entry:
+            entries.append(entry)
+            entry, complement = read_entry(complement)
+        return entries
+
+    def test_matches_read_entry(self, logfile):
+        expected = self._read_entries_by_complement(logfile)
+        assert _read_entries(make_file(logfile.getvalue())) == expected
+
+    def test_empty_file(self, empty_logfile):
+        assert _read_entries(empty_logfile) == []
+
+    def test_leading_subtask(self):
+        file = make_file("\t[ ] orphan\n\t[ ] subtask\n[ ] a task\n")
+        expected = ["\t[ ] orphan\n\t[ ] subtask\n", "[ ] a task\n"]
+        assert _read_entries(file) == expected
+
+    def test_no_trailing_newline(self):
+        file = make_file("[ ] a task\n\t[ ] subtask")
+        assert _read_entries(file) == ["[ ] a task\n\t[ ] subtask"]
+
+    def test_blank_lines_are_entries(self):
+        file = make_file("[ ] a task\n\n\n\t[ ] subtask\n")
+        expected = ["[ ] a task\n", "\n", "\n\t[ ] subtask\n"]
+        assert _read_entries(file) == expected
+
+
+class TestEntry(object):
+    def test_task(self):
+        entry = Entry("[x] a task\n\t[ ] a subtask\n")
+        assert entry.status is TaskStatus.DONE
+        assert entry.header == "[x] a task\n"
+        assert entry.contents == "\t[ ] a subtask\n"
+
+    def test_not_a_task(self):
+        entry = Entry("some text\n")
+        assert entry.status is None
+        assert entry.header == "some text\n"
+        assert entry.contents == ""
+
+    def test_no_trailing_newline(self):
+        entry = Entry("[ ] a task")
+        assert entry.header == "[ ] a task"
+        assert entry.contents == ""
+
+    def test_scheduled_date(self):
+        entry = Entry("[o] a task [$TUESDAY$]\n\t[ ] a subtask\n")
+        assert entry.scheduled_date == "TUESDAY"
+
+    def test_scheduled_date_without_dollars(self):
+        entry = Entry("[o] a task [TUESDAY]\n")
+        assert entry.scheduled_date == "TUESDAY"
+
+    def test_no_scheduled_date(self):
+        entry = Entry("[o] a task\n\t[ ] a subtask [$TUESDAY$]\n")
+        assert entry.scheduled_date is None
+
+    def test_reschedule(self):
+        entry = Entry("[o] a task [$TUESDAY$]\n\t[ ] a subtask\n")
+        rescheduled = entry.reschedule("DECEMBER 11, 2012")
+        assert rescheduled.text == (
+            "[o] a task [$DECEMBER 11, 2012$]\n\t[ ] a subtask\n"
+        )
+        assert rescheduled.scheduled_date == "DECEMBER 11, 2012"
+
+    def test_predicates(self):
+        assert is_scheduled_task(Entry("[o] a task\n"))
+        assert not is_scheduled_task(Entry("[x] a task\n"))
+        assert is_completed(Entry("[x] a task\n"))
+        assert is_unfinished(Entry("[\\] a task\n"))
+        assert not is_unfinished(Entry("some text\n"))
+
+    def test_parse_task(self):
+        entry = Entry("[ ] a task\n\t[ ] a subtask\n")
+        assert parse_task(entry) == parse_task(entry.text)
+
+
+class TestGetStatus(object):
+    @pytest.mark.parametrize(
+        "entry, status",
+        [
+            ("[ ] a task\n", TaskStatus.UNDONE),
+            ("[x] a task\n", TaskStatus.DONE),
+            ("[\\] a task\n", TaskStatus.WIP),
+            ("[-] a task\n", TaskStatus.INVALID),
+            ("[o] a task [$TUESDAY$]\n", TaskStatus.SCHEDULED),
+            ("[?] a task\n", TaskStatus.OTHER),
+            ("[", TaskStatus.OTHER),
+            ("some text\n", None),
+            ("\t[x] a subtask\n", None),
+            ("\n", None),
+            ("", None),
+        ],
+    )
+    def test_status(self, entry, status):
+        assert get_status(entry) is status
+        assert get_status(Entry(entry)) is status
+
+
+class TestParseEntries(object):
+    def test_matches_get_entries(self, logfile):
+        entries = parse_entries(logfile)
+        assert [entry.text for entry in entries] == get_entries(logfile)
+
+    def test_of_type(self, logfile):
+        entries = parse_entries(logfile, of_type=is_completed)
+        assert [entry.text for entry in entries] == get_entries(
+            logfile, of_type=is_completed
+        )
+
+
+class TestIterEntries(object):
+    def test_matches_get_entries(self, logfile):
+        expected = get_entries(copy_file(logfile))
+        assert list(iter_entries(logfile)) == expected
+
+    def test_of_type(self, logfile):
+        expected = get_entries(copy_file(logfile), is_undone_task)
+        assert list(iter_entries(logfile, is_undone_task)) == expected
+
+    def test_is_lazy(self, logfile):
+        checked = []
+
+        def of_type(entry):
+            checked.append(entry)
+            return is_undone_task(entry)
+
+        first = next(iter_entries(copy_file(logfile), of_type))
+        assert first == get_entries(logfile, is_undone_task)[0]
+        assert checked[-1] == first
+
+    def test_file_is_not_mutated(self, logfile):
+        list(iter_entries(logfile))
+        assert logfile.tell() == 0
+
+    def test_empty_file(self, empty_logfile):
+        assert list(iter_entries(empty_logfile)) == []
+
+
+class TestIterSection(object):
+    def test_matches_read_section(self, tasklist_file):
+        contents, _ = read_section(copy_file(tasklist_file), 'THIS WEEK')
+        entries = list(iter_section(tasklist_file, 'THIS WEEK'))
+        assert entries == get_entries(contents)
+
+    def test_separator_is_excluded(self):
+        file = make_file("NOTES:\na note\n\tmore\n\nAGENDA:\n")
+        entries = list(iter_section(file, 'NOTES'))
+        assert entries == ["a note\n\tmore\n"]
+
+    def test_empty_section(self, tasklist_file):
+        assert list(iter_section(tasklist_file, 'THIS MONTH')) == []
+
+    def test_section_missing(self, tasklist_file):
+        with pytest.raises(ValueError):
+            iter_section(tasklist_file, 'THIS DECADE')
+
+
 class TestPartitionAt(object):
     def test_first_part(self, logfile):
         pattern = re.compile(r"^Just")
@@ -224,6 +437,76 @@ class TestAppendFiles(object):
         assert second.read() == "there"
 
 
+class TestTextBuffer(object):
+    def test_read(self):
+        file = make_file("first\nsecond\n")
+        assert file.readline() == "first\n"
+        assert file.tell() == 6
+        assert file.read() == "second\n"
+        assert file.read() == ""
+
+    def test_iterate(self):
+        file = make_file("first\nsecond")
+        assert list(file) == ["first\n", "second"]
+
+    def test_seek(self):
+        file = make_file("first\nsecond\n")
+        file.read()
+        file.seek(0)
+        assert file.readlines() == ["first\n", "second\n"]
+
+    def test_write(self):
+        file = make_file("first\n")
+        file.read()
+        file.write("second\n")
+        assert file.getvalue() == "first\nsecond\n"
+
+    def test_write_overwrites_at_position(self):
+        file = make_file("first\n")
+        file.write("F")
+        assert file.getvalue() == "First\n"
+        assert file.read() == "irst\n"
+
+    def test_copy_is_independent(self):
+        file = make_file("first\n")
+        file.readline()
+        copy = copy_file(file)
+        copy.write("second\n")
+        assert copy.getvalue() == "second\n"
+        assert file.getvalue() == "first\n"
+        assert file.read() == ""
+
+    def test_copy_of_stringio(self):
+        file = StringIO("first\n")
+        file.read()
+        assert copy_file(file).read() == "first\n"
+
+    def test_copy_does_not_copy_contents(self):
+        file = make_file("first\n")
+        reset_bytes_copied()
+        copy_file(copy_file(file)).read()
+        assert get_bytes_copied() == 0
+
+    def test_write_copies_contents(self):
+        file = make_file("first\n")
+        reset_bytes_copied()
+        file.write("F")
+        assert get_bytes_copied() == len("first\n")
+
+    def test_contained_mutation_does_not_copy_contents(self):
+        @contain_file_mutation
+        def read_everything(file):
+            file.read()
+            return file
+
+        file = make_file("first\nsecond\n")
+        reset_bytes_copied()
+        result = read_everything(file)
+        assert result.read() == "first\nsecond\n"
+        assert file.read() == "first\nsecond\n"
+        assert get_bytes_copied() == 0
+
+
 class TestReadSection(object):
     def test_read_section(self, tasklist_file):
         contents, _ = read_section(tasklist_file, 'THIS WEEK')
@@ -267,6 +550,208 @@ class TestReadSection(object):
             read_section(tasklist_file, 'THIS DECADE')
 
 
+class TestPieceTable(object):
+    def test_insert(self):
+        document = PieceTable("first\nthird\n").insert(6, "second\n")
+        assert document.getvalue() == "first\nsecond\nthird\n"
+        assert len(document) == len("first\nsecond\nthird\n")
+
+    def test_insert_does_not_modify_original(self):
+        document = PieceTable("first\nthird\n")
+        document.insert(6, "second\n")
+        assert document.getvalue() == "first\nthird\n"
+
+    def test_insert_at_ends(self):
+        document = PieceTable("second\n").insert(0, "first\n")
+        document = document.insert(len(document), "third\n")
+        assert document.getvalue() == "first\nsecond\nthird\n"
+
+    def test_delete(self):
+        document = PieceTable("first\nsecond\nthird\n").delete(6, 13)
+        assert document.getvalue() == "first\nthird\n"
+
+    def test_slice_across_pieces(self):
+        document = PieceTable("first\nthird\n").insert(6, "second\n")
+        assert document.slice(3, 16) == "st\nsecond\nthi"
+
+    def test_many_edits(self):
+        document = PieceTable("")
+        for i in range(200):
+            document = document.insert(len(document), "{}\n".format(i))
+        expected = "".join("{}\n".format(i) for i in range(200))
+        assert document.getvalue() == expected
+
+    def test_sub(self):
+        document = PieceTable("first\nthird\n").insert(6, "second\n")
+        assert document.sub(3, 16).getvalue() == "st\nsecond\nthi"
+
+    def test_splice(self):
+        document = PieceTable("one\ntwo\nthree\n")
+        spliced = document.splice(
+            [(0, 4, PieceTable("1\n")), (8, 14, PieceTable("3\n"))]
+        )
+        assert spliced.getvalue() == "1\ntwo\n3\n"
+        assert document.getvalue() == "one\ntwo\nthree\n"
+
+    def test_index_follows_insert(self, tasklist_file):
+        document = PieceTable(tasklist_file.read())
+        span = document.index.find('THIS WEEK')
+        document = document.insert(span.start, "[ ] new\n[ ] tasks\n")
+        expected = SectionIndex(document.getvalue())
+        assert list(document.index) == list(expected)
+
+    def test_index_follows_delete(self, tasklist_file):
+        document = PieceTable(tasklist_file.read())
+        span = document.index.find('THIS WEEK')
+        document = document.delete(span.start, span.end)
+        expected = SectionIndex(document.getvalue())
+        assert list(document.index) == list(expected)
+
+    def test_index_after_inserting_section(self, tasklist_file):
+        document = PieceTable(tasklist_file.read())
+        span = document.index.find('THIS WEEK')
+        document = document.insert(span.start, "NEW SECTION:\n")
+        assert document.index.find('NEW SECTION').line == span.line + 1
+
+    def test_file(self):
+        file = make_file(PieceTable("first\nthird\n").insert(6, "second\n"))
+        assert file.readline() == "first\n"
+        assert file.read() == "second\nthird\n"
+
+
+def _mapping(text):
+    data = text.encode("utf-8")
+    mapping = mmap.mmap(-1, len(data))
+    mapping.write(data)
+    return mapping
+
+
+class TestMappedDocument(object):
+    def test_contents(self, tasklist_file):
+        text = tasklist_file.read()
+        document = MappedDocument(_mapping(text))
+        assert len(document) == len(text)
+        assert document.getvalue() == text
+        assert document.slice(3, 20) == text[3:20]
+
+    def test_index(self, tasklist_file):
+        text = tasklist_file.read()
+        document = MappedDocument(_mapping(text))
+        assert list(document.index) == list(SectionIndex(text))
+
+    def test_entries(self, logfile):
+        text = logfile.read()
+        document = MappedDocument(_mapping(text))
+        entries = list(document.iter_entries())
+        assert entries == get_entries(make_file(text))
+
+    def test_edit(self, tasklist_file):
+        text = tasklist_file.read()
+        document = MappedDocument(_mapping(text))
+        span = document.index.find('THIS MONTH')
+        edited = document.insert(span.start, "[ ] a task\n")
+        expected = text[: span.start] + "[ ] a task\n" + text[span.start :]
+        assert edited.getvalue() == expected
+        assert list(edited.index) == list(SectionIndex(expected))
+
+    def test_read_section(self, tasklist_file):
+        text = tasklist_file.read()
+        file = make_file(MappedDocument(_mapping(text)))
+        contents, complement = read_section(file, 'THIS WEEK')
+        expected, expected_complement = read_section(
+            make_file(text), 'THIS WEEK'
+        )
+        assert contents.read() == expected.read()
+        assert complement.read() == expected_complement.read()
+
+    @pytest.mark.parametrize("text", ["a \u00e9t\u00e9 note\n", "a\r\nb\r\n"])
+    def test_contents_that_must_be_decoded(self, text):
+        assert map_document(_mapping(text)) is None
+
+    def test_unused_mapping_closed(self, tmp_path):
+        path = tmp_path / "file.wiki"
+        path.write_bytes(b"a\r\nb\r\n")
+        mappings = []
+
+        def map_file(*args, **kwargs):
+            mapping, stat = storage_map_file(*args, **kwargs)
+            mappings.append(mapping)
+            return mapping, stat
+
+        with patch(
+            'composer.backend.filesystem.primitives.files._map_file',
+            map_file,
+        ):
+            file = read_file(str(path), mapped=True)
+        assert file.getvalue() == "a\nb\n"
+        assert mappings[0].closed
+
+
+class TestSectionIndex(object):
+    def test_headers(self, tasklist_file):
+        index = SectionIndex(tasklist_file.read())
+        headers = [span.header for span in index]
+        assert headers == [
+            "TOMORROW:",
+            "THIS WEEK:",
+            "THIS MONTH:",
+            "THIS QUARTER:",
+            "THIS YEAR:",
+            "SOMEDAY:",
+        ]
+
+    def test_span(self, tasklist_file):
+        text = tasklist_file.read()
+        span = SectionIndex(text).find('THIS WEEK')
+        assert text[span.header_start : span.start] == "THIS WEEK:\n"
+        assert text[span.start : span.end] == (
+            "[ ] a task with subtasks\n"
+            "\t[\\] first thing\n"
+            "\tclarification of first thing\n"
+            "\t[ ] second thing\n"
+        )
+
+    def test_lines(self, tasklist_file):
+        span = SectionIndex(tasklist_file.read()).find('THIS WEEK')
+        assert span.line == 6
+        assert span.end_line == 11
+
+    def test_last_section(self, tasklist_file):
+        text = tasklist_file.read()
+        span = SectionIndex(text).find('SOMEDAY')
+        assert span.end == len(text)
+        assert span.end_line == 16
+
+    def test_header_at_eof(self):
+        text = "AGENDA:\n[ ] a task\nNOTES:"
+        span = SectionIndex(text).find('NOTES')
+        assert span.header == "NOTES:"
+        assert span.start == span.end == len(text)
+
+    def test_prefix_matches_first_section(self):
+        text = "THIS WEEKEND:\n[ ] a task\nTHIS WEEK:\n"
+        span = SectionIndex(text).find('this week')
+        assert span.header == "THIS WEEKEND:"
+
+    def test_section_missing(self, tasklist_file):
+        with pytest.raises(ValueError):
+            SectionIndex(tasklist_file.read()).find('THIS DECADE')
+
+    def test_empty_file(self):
+        assert len(SectionIndex("")) == 0
+
+    def test_index_is_reused(self, tasklist_file):
+        text = tasklist_file.read()
+        assert get_section_index(text) is get_section_index(text)
+
+    def test_index_is_rebuilt_for_new_contents(self, tasklist_file):
+        text = tasklist_file.read()
+        updated = add_to_section(make_file(text), 'THIS WEEK', "[ ] new\n")
+        assert get_section_index(text) is not get_section_index(
+            updated.read()
+        )
+
+
 class TestAddToSection(object):
     def test_add_to_empty_section(self, tasklist_file):
         new_tasks = "[ ] one more thing to do!\n"
@@ -411,6 +896,72 @@ class TestAddToSection(object):
         assert updated.read() == expected
 
 
+class TestAddToSections(object):
+    def _sequential(self, file, additions, **kwargs):
+        for section, tasks in additions.items():
+            file = add_to_section(file, section, tasks, **kwargs)
+        return file
+
+    @pytest.mark.parametrize("above", [True, False])
+    @pytest.mark.parametrize("ensure_separator", [True, False])
+    def test_matches_sequential(
+        self, tasklist_file, above, ensure_separator
+    ):
+        additions = OrderedDict(
+            [
+                ('THIS MONTH', "[ ] a monthly task\n"),
+                ('TOMORROW', "[ ] a task for tomorrow\n"),
+                ('SOMEDAY', "[ ] some task\n\t[ ] a subtask\n"),
+                ('THIS YEAR', ""),
+            ]
+        )
+        expected = self._sequential(
+            copy_file(tasklist_file),
+            additions,
+            above=above,
+            ensure_separator=ensure_separator,
+        )
+        updated = add_to_sections(
+            tasklist_file,
+            additions,
+            above=above,
+            ensure_separator=ensure_separator,
+        )
+        assert updated.read() == expected.read()
+
+    def test_same_section_in_order(self, tasklist_file):
+        additions = OrderedDict(
+            [('THIS WEEK', "[ ] first\n"), ('this week', "[ ] second\n")]
+        )
+        updated = add_to_sections(tasklist_file, additions, above=False)
+        contents, _ = read_section(updated, 'THIS WEEK')
+        assert contents.read().endswith("[ ] first\n[ ] second\n")
+
+    def test_addition_containing_section(self, tasklist_file):
+        additions = OrderedDict(
+            [
+                ('THIS QUARTER', "NEXT QUARTER:\n[ ] a task\n"),
+                ('NEXT QUARTER', "[ ] another task\n"),
+            ]
+        )
+        expected = self._sequential(copy_file(tasklist_file), additions)
+        updated = add_to_sections(tasklist_file, additions)
+        assert updated.read() == expected.read()
+
+    def test_index(self, tasklist_file):
+        additions = OrderedDict(
+            [('THIS WEEK', "[ ] a task\n"), ('SOMEDAY', "[ ] another\n")]
+        )
+        document = add_to_sections(tasklist_file, additions).document
+        expected = SectionIndex(document.getvalue())
+        assert list(document.index) == list(expected)
+
+    def test_section_missing(self, tasklist_file):
+        additions = OrderedDict([('THIS DECADE', "[ ] a task\n")])
+        with pytest.raises(ValueError):
+            add_to_sections(tasklist_file, additions)
+
+
 class TestGetTaskEntries(object):
     def test_all_entries(self, tasklist_file):
         entries = get_entries(tasklist_file)
@@ -517,6 +1068,17 @@ class TestPartitionEntries(object):
         )
         assert set(filtered + excluded) == set(entries)
 
+    def test_predicate_called_once_per_entry(self):
+        entries = [1, 2, 3]
+        calls = []
+
+        def predicate(entry):
+            calls.append(entry)
+            return entry > 2
+
+        partition_entries(entries, predicate)
+        assert calls == entries
+
 
 class TestIsCompleted(object):
     def test_done(self):
@@ -608,3 +1170,365 @@ class TestIsUnfinished(object):
     def test_empty(self):
         entry = ""
         assert not is_unfinished(entry)
+
+
+class TestTransaction(object):
+    def test_nothing_written_until_commit(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        transaction = Transaction()
+        transaction.write_file("contents\n", path)
+        transaction.symlink("file.wiki", str(tmp_path / "link"))
+        assert os.listdir(str(tmp_path)) == []
+        transaction.commit()
+        with open(path) as f:
+            assert f.read() == "contents\n"
+        assert os.readlink(str(tmp_path / "link")) == "file.wiki"
+
+    def test_replaces_files_and_links(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        link = str(tmp_path / "link")
+        with open(path, "w") as f:
+            f.write("old contents\n")
+        os.chmod(path, 0o600)
+        os.symlink("old.wiki", link)
+        with Transaction() as transaction:
+            transaction.write_file("new contents\n", path)
+            transaction.symlink("file.wiki", link)
+        with open(path) as f:
+            assert f.read() == "new contents\n"
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert os.readlink(link) == "file.wiki"
+        assert sorted(os.listdir(str(tmp_path))) == ["file.wiki", "link"]
+
+    def test_last_write_wins(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        with Transaction() as transaction:
+            transaction.write_file("first\n", path)
+            transaction.write_file("second\n", path)
+        with open(path) as f:
+            assert f.read() == "second\n"
+
+    def test_not_committed_on_error(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        with pytest.raises(ValueError):
+            with Transaction() as transaction:
+                transaction.write_file("contents\n", path)
+                raise ValueError
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_failed_commit_leaves_files_unchanged(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        with open(path, "w") as f:
+            f.write("old contents\n")
+        transaction = Transaction()
+        transaction.write_file("new contents\n", path)
+        transaction.write_file("contents\n", str(tmp_path / "no" / "file"))
+        with pytest.raises(OSError):
+            transaction.commit()
+        with open(path) as f:
+            assert f.read() == "old contents\n"
+        assert os.listdir(str(tmp_path)) == ["file.wiki"]
+
+    def test_callbacks_called_on_commit(self, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        committed = []
+        transaction = Transaction()
+        transaction.write_file("contents\n", path)
+        transaction.on_commit(lambda: committed.append(os.path.exists(path)))
+        assert committed == []
+        transaction.commit()
+        assert committed == [True]
+        transaction.commit()
+        assert committed == [True]
+
+    def test_callbacks_not_called_on_failed_commit(self, tmp_path):
+        committed = []
+        transaction = Transaction()
+        transaction.write_file("contents\n", str(tmp_path / "no" / "file"))
+        transaction.on_commit(lambda: committed.append(True))
+        with pytest.raises(OSError):
+            transaction.commit()
+        assert committed == []
+
+    def test_writes_through_links(self, tmp_path):
+        target = str(tmp_path / "target.wiki")
+        link = str(tmp_path / "TaskList.wiki")
+        with open(target, "w") as f:
+            f.write("old contents\n")
+        os.symlink(target, link)
+        with Transaction() as transaction:
+            transaction.write_file("new contents\n", link)
+        assert os.readlink(link) == target
+        with open(target) as f:
+            assert f.read() == "new contents\n"
+        assert sorted(os.listdir(str(tmp_path))) == [
+            "TaskList.wiki",
+            "target.wiki",
+        ]
+
+
+class TestParseCache(object):
+    contents = "AGENDA:\n[ ] a task\n\t[ ] a subtask\n\nNOTES:\nsome notes\n"
+
+    def _write(self, path, contents):
+        with open(path, "w") as f:
+            f.write(contents)
+        # recently modified files aren't cached
+        past = os.stat(path).st_mtime - 60
+        os.utime(path, (past, past))
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"), min_file_size=0)
+        set_parse_cache(cache)
+        yield cache
+        set_parse_cache(None)
+
+    def test_structure_cached_on_read(self, cache, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        read_file(path)
+        index, entry_starts = cache.get(path, os.stat(path))
+        assert [span.header for span in index] == ["AGENDA:", "NOTES:"]
+        assert entry_starts == [0, 8, 34, 35, 42]
+
+    def test_cached_structure_used(self, cache, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        read_file(path)
+        with patch(
+            'composer.backend.filesystem.primitives.document.get_entry_starts'
+        ) as mock_get_entry_starts:
+            file = read_file(path)
+            assert get_entries(file) == [
+                "AGENDA:\n",
+                "[ ] a task\n\t[ ] a subtask\n",
+                "\n",
+                "NOTES:\n",
+                "some notes\n",
+            ]
+            assert read_section(file, 'notes')[0].getvalue() == "some notes\n"
+            mock_get_entry_starts.assert_not_called()
+
+    def test_modified_file_not_used(self, cache, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        read_file(path)
+        self._write(path, "NOTES:\nother notes\n")
+        assert cache.get(path, os.stat(path)) is None
+        file = read_file(path)
+        assert read_section(file, 'notes')[0].getvalue() == "other notes\n"
+
+    def test_recently_modified_file_not_cached(self, cache, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        with open(path, "w") as f:
+            f.write(self.contents)
+        read_file(path)
+        assert cache.get(path, os.stat(path)) is None
+
+    def test_mapped_file(self, cache, tmp_path):
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        read_file(path, mapped=True)
+        index, _ = cache.get(path, os.stat(path))
+        assert [span.header for span in index] == ["AGENDA:", "NOTES:"]
+        file = read_file(path, mapped=True)
+        assert get_document(file).index.sections == index.sections
+        assert read_section(file, 'notes')[0].getvalue() == "some notes\n"
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"), min_file_size=0)
+        paths = [str(tmp_path / "{}.wiki".format(i)) for i in range(3)]
+        for path in paths:
+            self._write(path, self.contents)
+        index = SectionIndex(self.contents)
+        cache.put(paths[0], os.stat(paths[0]), index)
+        size = os.path.getsize(cache._cache_path(paths[0]))
+        cache.max_size = 2 * size
+        cache.put(paths[1], os.stat(paths[1]), index)
+        # make the first file the most recently used, with both last used
+        # long enough ago for the use to be recorded
+        now = os.stat(cache._cache_path(paths[1])).st_mtime
+        for path, age in ((paths[0], 1), (paths[1], 2)):
+            past = now - age * USAGE_RESOLUTION - 60
+            os.utime(cache._cache_path(path), (past, past))
+        assert cache.get(paths[0], os.stat(paths[0])) is not None
+        cache.put(paths[2], os.stat(paths[2]), index)
+        assert cache.get(paths[0], os.stat(paths[0])) is not None
+        assert cache.get(paths[1], os.stat(paths[1])) is None
+        assert cache.get(paths[2], os.stat(paths[2])) is not None
+
+    def test_recent_use_not_recorded(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"), min_file_size=0)
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        cache.put(path, os.stat(path), SectionIndex(self.contents))
+        with patch('os.utime') as mock_utime:
+            assert cache.get(path, os.stat(path)) is not None
+            mock_utime.assert_not_called()
+
+    def test_small_file_not_cached(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"))
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        cache.put(path, os.stat(path), SectionIndex(self.contents))
+        assert not os.path.exists(cache._cache_path(path))
+        assert cache.get(path, os.stat(path)) is None
+
+    def test_small_file_not_indexed(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"))
+        set_parse_cache(cache)
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        try:
+            with patch(
+                'composer.backend.filesystem.primitives.document.'
+                'get_entry_starts'
+            ) as mock_get_entry_starts, patch.object(
+                cache, 'put'
+            ) as mock_put:
+                for mapped in (False, True):
+                    file = read_file(path, mapped=mapped)
+                    assert file.getvalue() == self.contents
+                mock_get_entry_starts.assert_not_called()
+                mock_put.assert_not_called()
+        finally:
+            set_parse_cache(None)
+
+    def test_cache_listed_only_when_too_large(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"), min_file_size=0)
+        paths = [str(tmp_path / "{}.wiki".format(i)) for i in range(3)]
+        for path in paths:
+            self._write(path, self.contents)
+        index = SectionIndex(self.contents)
+        cache.put(paths[0], os.stat(paths[0]), index)
+        cache.max_size = 2 * os.path.getsize(cache._cache_path(paths[0]))
+        with patch('os.scandir', wraps=os.scandir) as mock_scandir:
+            cache.put(paths[1], os.stat(paths[1]), index)
+            cache.put(paths[1], os.stat(paths[1]), index)
+            mock_scandir.assert_not_called()
+            cache.put(paths[2], os.stat(paths[2]), index)
+            mock_scandir.assert_called_once()
+
+    def test_parser_version(self, tmp_path):
+        cache = ParseCache(str(tmp_path / "cache"), min_file_size=0)
+        path = str(tmp_path / "file.wiki")
+        self._write(path, self.contents)
+        cache.put(path, os.stat(path), SectionIndex(self.contents))
+        with patch(
+            'composer.backend.filesystem.primitives.parse_cache.'
+            'PARSER_VERSION',
+            2,
+        ):
+            assert cache.get(path, os.stat(path)) is None
+
+
+class TestGetDirectoryState(object):
+    def _make_wiki(self, path):
+        with open(str(path / "file.wiki"), "w") as f:
+            f.write("contents\n")
+        os.symlink("file.wiki", str(path / "link"))
+        os.mkdir(str(path / "subdirectory"))
+
+    def test_files_and_links(self, tmp_path):
+        self._make_wiki(tmp_path)
+        state = get_directory_state(str(tmp_path))
+        assert sorted(state) == ["file.wiki", "link"]
+        assert state["file.wiki"][1] == len("contents\n")
+
+    def test_unchanged(self, tmp_path):
+        self._make_wiki(tmp_path)
+        state = get_directory_state(str(tmp_path))
+        assert get_directory_state(str(tmp_path)) == state
+
+    def test_changed_file(self, tmp_path):
+        self._make_wiki(tmp_path)
+        state = get_directory_state(str(tmp_path))
+        with open(str(tmp_path / "file.wiki"), "a") as f:
+            f.write("more contents\n")
+        assert get_directory_state(str(tmp_path)) != state
+
+    def test_added_file(self, tmp_path):
+        self._make_wiki(tmp_path)
+        state = get_directory_state(str(tmp_path))
+        with open(str(tmp_path / "other.wiki"), "w") as f:
+            f.write("")
+        assert get_directory_state(str(tmp_path)) != state
+
+
+class TestParseLogFilename(object):
+    def test_day(self):
+        assert parse_log_filename("December 5, 2012.wiki") == (
+            Day,
+            datetime.date(2012, 12, 5),
+        )
+
+    def test_not_a_log(self):
+        assert parse_log_filename("TaskList.wiki") is None
+
+
+class TestLogIndex(object):
+    names = (
+        "December 5, 2012.wiki",
+        "December 7, 2012.wiki",
+        "November 30, 2012.wiki",
+        "Week of December 1, 2012.wiki",
+        "Week of December 9, 2012.wiki",
+        "Month of December, 2012.wiki",
+        "TaskList.wiki",
+        "currentday",
+    )
+
+    def test_index(self):
+        index = LogIndex(self.names)
+        assert len(index) == 6
+        week = PeriodInstance.for_date(Week, datetime.date(2012, 12, 3))
+        assert week in index
+        assert index.get(week) == "Week of December 1, 2012.wiki"
+        assert index.get(week.parent()) == "Month of December, 2012.wiki"
+        missing = PeriodInstance.for_date(Week, datetime.date(2012, 12, 20))
+        assert index.get(missing) is None
+
+    def test_find(self):
+        index = LogIndex(self.names)
+        found = index.find(
+            Day, datetime.date(2012, 11, 30), datetime.date(2012, 12, 6)
+        )
+        assert [name for _, name in found] == [
+            "November 30, 2012.wiki",
+            "December 5, 2012.wiki",
+        ]
+        found = index.find(Week, datetime.date(2012, 12, 8))
+        assert [name for _, name in found] == [
+            "Week of December 1, 2012.wiki"
+        ]
+        assert index.find(Quarter, datetime.date(2012, 12, 8)) == []
+
+    def test_from_directory(self, tmp_path):
+        for name in self.names:
+            (tmp_path / name).write_text("")
+        index = LogIndex.from_directory(str(tmp_path))
+        assert len(index) == 6
+
+    def test_get_log_index(self, tmp_path):
+        for name in self.names:
+            (tmp_path / name).write_text("")
+        index = get_log_index(str(tmp_path))
+        assert len(index) == 6
+
+    def test_get_log_index_unchanged(self, tmp_path):
+        for name in self.names:
+            (tmp_path / name).write_text("")
+        # long enough ago that the modification time can be trusted
+        os.utime(str(tmp_path), (1000000000, 1000000000))
+        index = get_log_index(str(tmp_path))
+        assert get_log_index(str(tmp_path)) is index
+
+    def test_get_log_index_changed(self, tmp_path):
+        os.utime(str(tmp_path), (1000000000, 1000000000))
+        index = get_log_index(str(tmp_path))
+        assert len(index) == 0
+        (tmp_path / "2012.wiki").write_text("")
+        os.utime(str(tmp_path), (1000000001, 1000000001))
+        index = get_log_index(str(tmp_path))
+        assert len(index) == 1
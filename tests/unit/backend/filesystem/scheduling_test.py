@@ -1,4 +1,5 @@
 import datetime
+import itertools
 import unittest
 import pytest
 
@@ -6,14 +7,24 @@ from mock import patch
 
 from composer.backend import FilesystemPlanner, FilesystemTasklist
 from composer.backend.filesystem.scheduling import (
+    DATE_FORMATS,
+    get_date_formats,
+    parse_date_string,
+    resolve_date,
     standardize_entry_date,
     get_due_date,
     string_to_date,
     is_task_due,
     date_to_string,
 )
+from composer.backend.filesystem.primitives import Entry
 from composer.timeperiod import Day, Week, Month, Quarter, Year, Eternity
-from composer.errors import BlockedTaskNotScheduledError, InvalidDateError
+from composer.errors import (
+    BlockedTaskNotScheduledError,
+    DateFormatError,
+    InvalidDateError,
+    RelativeDateError,
+)
 
 try:  # py2
     from StringIO import StringIO
@@ -444,6 +455,94 @@ class TestStringToDate(object):
         assert period == expected_period
 
 
+class TestGetDateFormats(object):
+    words = (
+        "FIRST",
+        "last",
+        "WEEK",
+        "of",
+        "AFTER",
+        "next",
+        "SOMEDAY",
+        "tomorrow",
+        "DAY",
+        "Monday",
+        "FRI",
+        "Q1",
+        "this",
+        "WEEKEND",
+        "MONTH",
+        "December",
+        "DEC,",
+        "5",
+        "12",
+        "2012",
+        "12/05/2012",
+        "12-05-2012",
+        "THE",
+        "2012\n",
+        "\u212aelvin",
+        "\u0661\u0662",
+        "",
+    )
+
+    @staticmethod
+    def _first_match(formats, date_string):
+        for pattern, _ in formats:
+            if pattern.search(date_string):
+                return pattern
+        return None
+
+    def test_formats_are_partitioned(self):
+        # every format is found under some first word
+        formats = set(pattern for pattern, _ in DATE_FORMATS)
+        assert formats == set(
+            pattern
+            for word in self.words
+            for pattern, _ in get_date_formats(word + " ")
+        )
+
+    def test_precedence_is_preserved(self):
+        for size in range(1, 4):
+            for combination in itertools.product(self.words, repeat=size):
+                for separator in (" ", ", "):
+                    date_string = separator.join(combination)
+                    assert self._first_match(
+                        get_date_formats(date_string), date_string
+                    ) is self._first_match(DATE_FORMATS, date_string)
+
+
+class TestParseDateString(object):
+    def test_cached(self):
+        assert parse_date_string("NEXT WEEK") is parse_date_string("NEXT WEEK")
+
+    def test_absolute(self):
+        parsed = parse_date_string("DECEMBER 12, 2012")
+        assert parsed.value == (datetime.date(2012, 12, 12), Day)
+        assert resolve_date(parsed) == parsed.value
+        assert resolve_date(parsed, datetime.date(2013, 1, 1)) == (
+            parsed.value
+        )
+
+    def test_relative(self):
+        parsed = parse_date_string("TOMORROW")
+        assert parsed.value is None
+        assert resolve_date(parsed, datetime.date(2012, 12, 12)) == (
+            datetime.date(2012, 12, 13),
+            Day,
+        )
+        assert resolve_date(parsed, datetime.date(2012, 12, 20)) == (
+            datetime.date(2012, 12, 21),
+            Day,
+        )
+        with pytest.raises(RelativeDateError):
+            resolve_date(parsed)
+
+    def test_unknown_format(self):
+        with pytest.raises(DateFormatError):
+            parse_date_string("12.12.2012")
+
+
 class TestDateToString(object):
     def test_day(self):
         today = datetime.date(2012, 10, 14)
@@ -519,6 +618,17 @@ class TestDueDate(object):
         result, _ = get_due_date(task)
         assert result == expected
 
+    def test_entry_record(self):
+        task = Entry("[o] something [$OCTOBER 12, 2013$]\n\t[ ] subtask\n")
+        expected = datetime.date(2013, 10, 12)
+        result, _ = get_due_date(task)
+        assert result == expected
+
+    def test_date_in_subtask_is_ignored(self):
+        task = "[o] something\n\t[ ] subtask [$OCTOBER 12, 2013$]\n"
+        with pytest.raises(BlockedTaskNotScheduledError):
+            get_due_date(task)
+
 
 class TestIsTaskDue(object):
     def test_due_date_in_past(self):
@@ -0,0 +1,121 @@
+import datetime
+import os
+import pytest
+
+from composer.backend.filesystem.primitives import make_file
+from composer.backend.memory import MemoryPlanner, MemoryTasklist, MemoryWiki
+from composer.errors import LogfileAlreadyExistsError
+from composer.timeperiod import Day, Month, Week
+
+
+def _wiki():
+    return MemoryWiki(
+        files={
+            "December 5, 2012.wiki": "AGENDA:\n[ ] a task\n\nNOTES:\n",
+            "Week of December 2, 2012.wiki": "AGENDA:\n\nNOTES:\n",
+            "Month of December, 2012.wiki": "AGENDA:\n\nNOTES:\n",
+            "Q4 2012.wiki": "AGENDA:\n\nNOTES:\n",
+            "2012.wiki": "AGENDA:\n\nNOTES:\n",
+            "TaskList.wiki": "TOMORROW:\n[ ] a task\n",
+        },
+        links={"currentday": "December 5, 2012.wiki"},
+    )
+
+
+class TestMemoryWiki(object):
+    def test_load_and_dump_are_lossless(self, tmp_path):
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "a.wiki").write_bytes(b"line\r\nnot utf-8: \xff\n")
+        (source / "b.wiki").write_bytes(b"")
+        os.symlink("a.wiki", str(source / "currentday"))
+        (source / ".git").mkdir()
+        wiki = MemoryWiki.load(str(source))
+        assert sorted(wiki.files) == ["a.wiki", "b.wiki"]
+        assert wiki.links == {"currentday": "a.wiki"}
+        destination = tmp_path / "destination"
+        wiki.dump(str(destination))
+        assert sorted(os.listdir(str(destination))) == [
+            "a.wiki",
+            "b.wiki",
+            "currentday",
+        ]
+        assert (destination / "a.wiki").read_bytes() == (
+            b"line\r\nnot utf-8: \xff\n"
+        )
+        assert os.readlink(str(destination / "currentday")) == "a.wiki"
+
+    def test_dump_replaces_link(self, tmp_path):
+        os.symlink("old.wiki", str(tmp_path / "currentday"))
+        MemoryWiki(links={"currentday": "new.wiki"}).dump(str(tmp_path))
+        assert os.readlink(str(tmp_path / "currentday")) == "new.wiki"
+
+    def test_transaction(self):
+        wiki = _wiki()
+        with wiki.transaction() as transaction:
+            transaction.write_file("contents\n", "new.wiki")
+            transaction.symlink("new.wiki", "currentday")
+            assert not wiki.isfile("new.wiki")
+        assert wiki.read_file("new.wiki") == "contents\n"
+        assert wiki.links["currentday"] == "new.wiki"
+
+
+class TestMemoryPlanner(object):
+    def test_clone_shares_wiki(self):
+        wiki = _wiki()
+        planner = MemoryPlanner(wiki, MemoryTasklist(wiki))
+        assert planner.clone().location is wiki
+
+    def test_construct(self):
+        wiki = _wiki()
+        planner = MemoryPlanner(wiki, MemoryTasklist(wiki))
+        assert planner.date == datetime.date(2012, 12, 5)
+        assert planner.dayfile.getvalue() == (
+            "AGENDA:\n[ ] a task\n\nNOTES:\n"
+        )
+        assert planner.tasklist.file.getvalue() == "TOMORROW:\n[ ] a task\n"
+
+    def test_get_log(self):
+        wiki = _wiki()
+        planner = MemoryPlanner(wiki, MemoryTasklist(wiki))
+        log = planner.get_log(datetime.date(2012, 12, 20), Month)
+        assert log.getvalue() == "AGENDA:\n\nNOTES:\n"
+        assert planner.get_log(datetime.date(2012, 12, 20), Week) is None
+
+    def test_is_ok_to_advance(self):
+        wiki = _wiki()
+        planner = MemoryPlanner(wiki, MemoryTasklist(wiki))
+        planner.date = datetime.date(2012, 12, 6)
+        planner.is_ok_to_advance(Day)
+        wiki.write_file("", "December 6, 2012.wiki")
+        with pytest.raises(LogfileAlreadyExistsError):
+            planner.is_ok_to_advance(Day)
+
+    def test_save(self):
+        wiki = _wiki()
+        planner = MemoryPlanner(wiki, MemoryTasklist(wiki))
+        planner.date = datetime.date(2012, 12, 6)
+        planner.dayfile = planner.dayfile
+        written, skipped = planner.save(Day)
+        assert (written, skipped) == (1, 0)
+        assert wiki.read_file("December 6, 2012.wiki") == (
+            "AGENDA:\n[ ] a task\n\nNOTES:\n"
+        )
+        assert wiki.links["currentday"] == "December 6, 2012.wiki"
+
+    def test_save_in_transaction(self):
+        wiki = _wiki()
+        tasklist = MemoryTasklist(wiki)
+        planner = MemoryPlanner(wiki, tasklist)
+        planner.date = datetime.date(2012, 12, 6)
+        planner.dayfile = planner.dayfile
+        tasklist.file = make_file("TOMORROW:\n")
+        with wiki.transaction() as transaction:
+            planner.save(Day, transaction=transaction)
+            tasklist.save(transaction=transaction)
+            assert not wiki.isfile("December 6, 2012.wiki")
+            assert wiki.read_file("TaskList.wiki") == (
+                "TOMORROW:\n[ ] a task\n"
+            )
+        assert wiki.isfile("December 6, 2012.wiki")
+        assert wiki.read_file("TaskList.wiki") == "TOMORROW:\n"
@@ -1,8 +1,14 @@
 import datetime
 import pytest
 
+from composer.backend.base import AdvanceState, END_PERIOD, PREPARE_PERIOD
 from composer.config import LOGFILE_CHECKING
-from composer.errors import AgendaNotReviewedError, PlannerIsInTheFutureError
+from composer.errors import (
+    AgendaNotReviewedError,
+    LogfileNotCompletedError,
+    MissingThemeError,
+    PlannerIsInTheFutureError,
+)
 from composer.timeperiod import Zero, Day, Week, Month, Quarter, Year
 
 from mock import MagicMock, patch
@@ -449,3 +455,76 @@ class TestJumpDate(object):
         jump_to_date = planner.date
         planner.set_jump_date(jump_to_date)
         assert planner.jump_to_date is None
+
+
+class TestResumeAdvance(object):
+    def _set_up_advance(self, planner):
+        planner.date = datetime.date(2012, 12, 5)
+        planner.week_theme = ''
+        planner.agenda_reviewed = Year
+        planner.get_log = MagicMock(return_value=True)
+        planner.end_period = MagicMock()
+        planner.tasklist.advance = MagicMock()
+        planner.create_log = MagicMock()
+
+    def test_interrupted_end_is_resumed(self, planner_base):
+        self._set_up_advance(planner_base)
+        planner_base.end_period.side_effect = [
+            LogfileNotCompletedError("Log not completed!", Day),
+            None,
+        ]
+        with pytest.raises(LogfileNotCompletedError):
+            planner_base.advance()
+        assert planner_base.advance_state == AdvanceState(
+            Day, datetime.date(2012, 12, 6), END_PERIOD
+        )
+        status, _ = planner_base.advance()
+        assert status == Day
+        assert planner_base.end_period.call_count == 2
+        planner_base.tasklist.advance.assert_called_once()
+        assert planner_base.advance_state is None
+
+    def test_interrupted_preparation_is_resumed(self, planner_base):
+        self._set_up_advance(planner_base)
+        planner_base.agenda_reviewed = Zero
+        with pytest.raises(AgendaNotReviewedError):
+            planner_base.advance()
+        assert planner_base.advance_state == AdvanceState(
+            Day, datetime.date(2012, 12, 6), PREPARE_PERIOD
+        )
+        planner_base.agenda_reviewed = Day
+        status, _ = planner_base.advance()
+        assert status == Day
+        planner_base.end_period.assert_called_once()
+        planner_base.tasklist.advance.assert_called_once()
+        planner_base.create_log.assert_called_once()
+
+    def test_log_is_created_once_prepared(self, planner_base):
+        self._set_up_advance(planner_base)
+        planner_base.date = datetime.date(2012, 12, 8)
+        planner_base.week_theme = None
+        with pytest.raises(MissingThemeError):
+            planner_base.advance()
+        # only the log for the day has been created
+        planner_base.create_log.assert_called_once()
+        planner_base.week_theme = 'Timeliness'
+        status, _ = planner_base.advance()
+        assert status == Week
+        assert planner_base.create_log.call_count == 2
+
+    def test_resumed_advance_uses_same_next_day_planner(self, planner_base):
+        self._set_up_advance(planner_base)
+        planner_base.agenda_reviewed = Zero
+        with pytest.raises(AgendaNotReviewedError):
+            planner_base.advance()
+        next_day_planner = planner_base.next_day_planner
+        planner_base.agenda_reviewed = Day
+        _, resumed_next_day_planner = planner_base.advance()
+        assert resumed_next_day_planner is next_day_planner
+
+    def test_failed_advance_cannot_be_resumed(self, planner_base):
+        self._set_up_advance(planner_base)
+        planner_base.tasklist.advance.side_effect = ValueError
+        with pytest.raises(ValueError):
+            planner_base.advance()
+        assert planner_base.advance_state is None
@@ -0,0 +1,173 @@
+import datetime
+import os
+import subprocess
+import sys
+
+from composer.backend.filesystem.primitives import TaskStatus
+from composer.backend.sqlite import SqlitePlanner, SqliteTasklist, SqliteWiki
+from composer.backend.sqlite.base import parse_log_filename
+from composer.timeperiod import Day, Month, Quarter, Week, Year
+
+
+def _wiki():
+    wiki = SqliteWiki()
+    for name, contents in {
+        "December 5, 2012.wiki": (
+            "AGENDA:\n[ ] a task\n[x] a done task\n\nNOTES:\n"
+        ),
+        "Week of December 1, 2012.wiki": "AGENDA:\n[x] weekly\n\nNOTES:\n",
+        "Month of December, 2012.wiki": "AGENDA:\n\nNOTES:\n",
+        "Q4 2012.wiki": "AGENDA:\n\nNOTES:\n",
+        "2012.wiki": "AGENDA:\n\nNOTES:\n",
+        "TaskList.wiki": "TOMORROW:\n[ ] a task\n",
+    }.items():
+        wiki.write_file(contents, name)
+    wiki.symlink("December 5, 2012.wiki", "currentday")
+    return wiki
+
+
+class TestImport(object):
+    def test_exported_by_backend(self):
+        import composer.backend
+
+        assert composer.backend.SqliteWiki is SqliteWiki
+
+    def test_not_imported_with_backend(self):
+        code = (
+            "import sys, composer.backend; "
+            "print('sqlite3' in sys.modules)"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code])
+        assert output.strip() == b"False"
+
+
+class TestParseLogFilename(object):
+    def test_logs(self):
+        assert parse_log_filename("December 5, 2012.wiki") == (
+            Day,
+            datetime.date(2012, 12, 5),
+        )
+        assert parse_log_filename("Week of December 1, 2012.wiki") == (
+            Week,
+            datetime.date(2012, 12, 1),
+        )
+        assert parse_log_filename("Month of December, 2012.wiki") == (
+            Month,
+            datetime.date(2012, 12, 1),
+        )
+        assert parse_log_filename("Q4 2012.wiki") == (
+            Quarter,
+            datetime.date(2012, 10, 1),
+        )
+        assert parse_log_filename("2012.wiki") == (
+            Year,
+            datetime.date(2012, 1, 1),
+        )
+
+    def test_not_logs(self):
+        assert parse_log_filename("TaskList.wiki") is None
+        assert parse_log_filename("Checkpoints_Day.wiki") is None
+        assert parse_log_filename("Smarch 5, 2012.wiki") is None
+        # not the start of a week
+        assert parse_log_filename("Week of December 5, 2012.wiki") is None
+
+
+class TestSqliteWiki(object):
+    def test_import_and_export(self, tmp_path):
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "a.wiki").write_bytes(b"line\r\nnot utf-8: \xff\n")
+        (source / "2012.wiki").write_bytes(b"AGENDA:\n\nNOTES:\n")
+        os.symlink("2012.wiki", str(source / "currentday"))
+        wiki = SqliteWiki(str(tmp_path / "wiki.db"))
+        wiki.import_wiki(str(source))
+        assert wiki.find_log(Year, datetime.date(2012, 6, 1)) == "2012.wiki"
+        destination = tmp_path / "destination"
+        wiki.export_wiki(str(destination))
+        assert sorted(os.listdir(str(destination))) == [
+            "2012.wiki",
+            "a.wiki",
+            "currentday",
+        ]
+        assert (destination / "a.wiki").read_bytes() == (
+            b"line\r\nnot utf-8: \xff\n"
+        )
+        assert os.readlink(str(destination / "currentday")) == "2012.wiki"
+
+    def test_persists(self, tmp_path):
+        path = str(tmp_path / "wiki.db")
+        wiki = SqliteWiki(path)
+        wiki.write_file("AGENDA:\n\nNOTES:\n", "2012.wiki")
+        wiki.close()
+        wiki = SqliteWiki(path)
+        assert wiki.read_file("2012.wiki") == "AGENDA:\n\nNOTES:\n"
+
+    def test_read_document(self):
+        wiki = _wiki()
+        document = wiki.read_document("December 5, 2012.wiki")
+        assert document.index.find("NOTES").header_start == 36
+        assert document.entry_starts == [0, 8, 19, 35, 36]
+
+    def test_overwrite(self):
+        wiki = _wiki()
+        wiki.write_file("AGENDA:\n\nNOTES:\n", "December 5, 2012.wiki")
+        assert wiki.find_entries(period=Day) == [
+            ("December 5, 2012.wiki", "AGENDA:\n"),
+            ("December 5, 2012.wiki", "\n"),
+            ("December 5, 2012.wiki", "NOTES:\n"),
+        ]
+
+    def test_find_entries(self):
+        wiki = _wiki()
+        assert wiki.find_entries(section="agenda", status=TaskStatus.DONE) == [
+            ("Week of December 1, 2012.wiki", "[x] weekly\n"),
+            ("December 5, 2012.wiki", "[x] a done task\n"),
+        ]
+        assert wiki.find_entries(
+            period=Day, since=datetime.date(2012, 12, 6)
+        ) == []
+
+    def test_transaction(self):
+        wiki = _wiki()
+        with wiki.transaction() as transaction:
+            transaction.write_file("contents\n", "new.wiki")
+            transaction.symlink("new.wiki", "currentday")
+            assert not wiki.isfile("new.wiki")
+        assert wiki.read_file("new.wiki") == "contents\n"
+        assert wiki.readlink("currentday") == "new.wiki"
+
+
+class TestSqlitePlanner(object):
+    def test_clone_shares_wiki(self):
+        wiki = _wiki()
+        planner = SqlitePlanner(wiki, SqliteTasklist(wiki))
+        assert planner.clone().location is wiki
+
+    def test_construct(self):
+        wiki = _wiki()
+        planner = SqlitePlanner(wiki, SqliteTasklist(wiki))
+        assert planner.date == datetime.date(2012, 12, 5)
+        assert planner.tasklist.file.getvalue() == "TOMORROW:\n[ ] a task\n"
+
+    def test_get_log(self):
+        wiki = _wiki()
+        planner = SqlitePlanner(wiki, SqliteTasklist(wiki))
+        log = planner.get_log(datetime.date(2012, 12, 20), Month)
+        assert log.getvalue() == "AGENDA:\n\nNOTES:\n"
+        assert planner.get_log(datetime.date(2012, 12, 20), Week) is None
+
+    def test_get_agenda(self):
+        wiki = _wiki()
+        planner = SqlitePlanner(wiki, SqliteTasklist(wiki))
+        agenda = planner.get_agenda(Day)
+        assert agenda == "[ ] a task\n[x] a done task\n"
+
+    def test_save(self):
+        wiki = _wiki()
+        planner = SqlitePlanner(wiki, SqliteTasklist(wiki))
+        planner.date = datetime.date(2012, 12, 6)
+        planner.dayfile = planner.dayfile
+        written, skipped = planner.save(Day)
+        assert (written, skipped) == (1, 0)
+        assert wiki.find_log(Day, planner.date) == "December 6, 2012.wiki"
+        assert wiki.readlink("currentday") == "December 6, 2012.wiki"
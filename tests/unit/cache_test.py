@@ -0,0 +1,104 @@
+import datetime
+
+from composer.cache import (
+    archive_cache,
+    get_archive_segments,
+    is_newest_first,
+    migrate_archive,
+    rotate_archive,
+)
+
+
+class TestArchiveCache(object):
+    def test_archive(self, tmp_path):
+        cache = tmp_path / "Cache.wiki"
+        archive = tmp_path / "Archive Cache.wiki"
+        cache.write_text("\nfirst notes\n\n")
+        archive_cache(str(cache), str(archive))
+        cache.write_text("second notes\n")
+        archive_cache(str(cache), str(archive))
+        assert cache.read_text() == ""
+        assert archive.read_text() == (
+            "first notes\n\n-----\n\nsecond notes\n"
+        )
+
+    def test_newest_first_archive_reversed(self, tmp_path):
+        cache = tmp_path / "Cache.wiki"
+        archive = tmp_path / "Archive Cache.wiki"
+        # as written when notes were prepended to the archive
+        legacy = "second notes\n\n-----\n\nfirst notes\n\n-----\n\n"
+        archive.write_text(legacy)
+        cache.write_text("third notes\n")
+        archive_cache(str(cache), str(archive))
+        cache.write_text("fourth notes\n")
+        archive_cache(str(cache), str(archive))
+        assert archive.read_text() == (
+            "first notes\n\n-----\n\nsecond notes\n\n-----\n\n"
+            "third notes\n\n-----\n\nfourth notes\n"
+        )
+        backup = tmp_path / "Archive Cache.wiki.bak"
+        assert backup.read_text() == legacy
+
+    def test_archive_only_reversed_once(self, tmp_path):
+        archive = tmp_path / "Archive Cache.wiki"
+        archive.write_text("second notes\n\n-----\n\nfirst notes\n\n-----\n\n")
+        assert migrate_archive(str(archive))
+        assert not migrate_archive(str(archive))
+        assert archive.read_text() == (
+            "first notes\n\n-----\n\nsecond notes\n"
+        )
+
+    def test_rules_in_notes_preserved(self, tmp_path):
+        archive = tmp_path / "Archive Cache.wiki"
+        archive.write_text(
+            "second\n-----\nnotes\n\n-----\n\nfirst notes\n-----\n\n-----\n\n"
+        )
+        assert migrate_archive(str(archive))
+        assert archive.read_text() == (
+            "first notes\n-----\n\n-----\n\nsecond\n-----\nnotes\n"
+        )
+
+    def test_new_archive_not_reversed(self, tmp_path):
+        archive = tmp_path / "Archive Cache.wiki"
+        assert not is_newest_first(str(archive))
+        assert not migrate_archive(str(archive))
+        assert not archive.exists()
+        archive.write_text("first notes\n\n-----\n\nsecond notes\n-----\n")
+        assert not is_newest_first(str(archive))
+        assert not migrate_archive(str(archive))
+        assert not (tmp_path / "Archive Cache.wiki.bak").exists()
+
+    def test_empty_cache(self, tmp_path):
+        cache = tmp_path / "Cache.wiki"
+        archive = tmp_path / "Archive Cache.wiki"
+        cache.write_text("\n")
+        archive_cache(str(cache), str(archive))
+        assert not archive.exists()
+
+    def test_rotation(self, tmp_path):
+        cache = tmp_path / "Cache.wiki"
+        archive = tmp_path / "Archive Cache.wiki"
+        for_date = datetime.date(2012, 12, 5)
+        for notes in ("one", "two", "three", "four"):
+            cache.write_text(notes + "\n")
+            archive_cache(
+                str(cache), str(archive), max_size=5, for_date=for_date
+            )
+        assert [
+            path.rsplit("/", 1)[-1]
+            for path in get_archive_segments(str(archive))
+        ] == [
+            "Archive Cache 2012-12-05.wiki",
+            "Archive Cache 2012-12-05 2.wiki",
+            "Archive Cache.wiki",
+        ]
+        assert [
+            open(path).read() for path in get_archive_segments(str(archive))
+        ] == ["one\n\n-----\n\ntwo\n", "three\n", "four\n"]
+
+    def test_rotate_small_archive(self, tmp_path):
+        archive = tmp_path / "Archive Cache.wiki"
+        assert rotate_archive(str(archive), 10) is None
+        archive.write_text("notes\n")
+        assert rotate_archive(str(archive), 10) is None
+        assert get_archive_segments(str(archive)) == [str(archive)]
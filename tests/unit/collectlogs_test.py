@@ -8,7 +8,8 @@ except ImportError:  # py3
 from datetime import date, timedelta
 
 from composer.collectlogs import extract_notes_from_log, get_logs_times
-from composer.timeperiod import Week
+from composer.backend.filesystem.primitives import get_log_filename
+from composer.timeperiod import Week, Day, PeriodInstance
 
 from mock import patch, MagicMock
 
@@ -78,8 +79,11 @@ class TestGetLogsTimes(object):
         planner.date = date.today() - timedelta(days=15)
         mock_planner.return_value = planner
         mock_extract_log.return_value = 'notes'
-        mock_get_logs.return_value = [MagicMock(), MagicMock()]
+        # a log is missing for the first day of the week
+        days = PeriodInstance.for_date(Week, planner.date).children()[1:3]
+        mock_get_logs.return_value = [(day, MagicMock()) for day in days]
         mock_compute_time.return_value = (0, 10)
         (logs, time) = get_logs_times('/path/to/wiki', Week)
         assert 'notes' in logs
+        assert logs.startswith(get_log_filename(days[0].start, Day))
         assert time == (0, 10)
@@ -147,7 +147,7 @@ def _tasklist_base():
         def get_tasks_for_tomorrow(self):
             pass
 
-        def save(self):
+        def save(self, transaction=None):
             pass
 
     tasklist = DummyTasklist()
@@ -195,7 +195,7 @@ def _planner_base():
         def is_ok_to_advance(self, period=Year):
             pass
 
-        def save(self, period=None):
+        def save(self, period=None, transaction=None):
             pass
 
     planner = DummyPlanner()
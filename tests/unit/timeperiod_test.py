@@ -2,6 +2,8 @@ from datetime import date, timedelta
 import pytest
 
 from composer.timeperiod import (
+    Period,
+    PeriodInstance,
     Day,
     Week,
     Month,
@@ -9,6 +11,7 @@ from composer.timeperiod import (
     Year,
     Zero,
     Eternity,
+    get_period_instances,
     get_time_periods,
     quarter_for_month,
     month_for_quarter,
@@ -260,6 +263,147 @@ class TestYearEndDate(TestEndDate):
         assert result == expected
 
 
+def _dates(start, end, days_of_month=None):
+    current_date = start
+    while current_date < end:
+        if days_of_month is None or current_date.day in days_of_month:
+            yield current_date
+        current_date += timedelta(days=1)
+
+
+class TestBoundariesMatchSearch(object):
+    """The boundaries of each period are computed directly, and should be
+    the same as those found by searching day by day for the start of the
+    period (which is the definition of the boundaries, see
+    `Period.is_start_of_period`).
+    """
+
+    # a 28-year span includes every arrangement of days of the week in a
+    # month, in both leap and non-leap years
+    dates = list(_dates(date(1999, 12, 1), date(2028, 2, 1)))
+
+    @pytest.mark.parametrize("period", [Day, Week, Month, Quarter])
+    def test_start_and_end_dates(self, period):
+        for for_date in self.dates:
+            assert period.get_start_date(for_date) == (
+                Period.get_start_date(period, for_date)
+            )
+            assert period.get_end_date(for_date) == (
+                Period.get_end_date(period, for_date)
+            )
+
+    def test_year_start_and_end_dates(self):
+        # searching takes up to a year, so only check a few days a month
+        for for_date in _dates(
+            date(1999, 12, 1), date(2028, 2, 1), {1, 2, 15, 28, 29, 30, 31}
+        ):
+            assert Year.get_start_date(for_date) == (
+                Period.get_start_date(Year, for_date)
+            )
+            assert Year.get_end_date(for_date) == (
+                Period.get_end_date(Year, for_date)
+            )
+
+
+class TestGetPeriodInstances(object):
+    def test_weeks_in_month(self):
+        instances = list(
+            get_period_instances(Week, date(2013, 4, 1), date(2013, 4, 30))
+        )
+        assert instances == [
+            (Week, date(2013, 4, 1), date(2013, 4, 6)),
+            (Week, date(2013, 4, 7), date(2013, 4, 13)),
+            (Week, date(2013, 4, 14), date(2013, 4, 20)),
+            (Week, date(2013, 4, 21), date(2013, 4, 30)),
+        ]
+
+    def test_partial_instances(self):
+        instances = list(
+            get_period_instances(Month, date(2012, 12, 15), date(2013, 1, 2))
+        )
+        assert instances == [
+            (Month, date(2012, 12, 1), date(2012, 12, 31)),
+            (Month, date(2013, 1, 1), date(2013, 1, 31)),
+        ]
+
+    def test_empty_range(self):
+        instances = list(
+            get_period_instances(Day, date(2013, 1, 2), date(2013, 1, 1))
+        )
+        assert instances == []
+
+    @pytest.mark.parametrize("period", [Day, Week, Month, Quarter, Year])
+    def test_consistent_with_boundaries(self, period):
+        instances = list(
+            get_period_instances(period, date(2011, 11, 20), date(2014, 2, 3))
+        )
+        current_date = period.get_start_date(date(2011, 11, 20))
+        for instance in instances:
+            assert instance == (
+                period,
+                current_date,
+                period.get_end_date(current_date),
+            )
+            current_date = instance[2] + timedelta(days=1)
+        assert current_date > date(2014, 2, 3)
+
+    @pytest.mark.parametrize("period", [Zero, Eternity])
+    def test_untracked_periods(self, period):
+        with pytest.raises(ValueError):
+            list(
+                get_period_instances(
+                    period, date(2013, 1, 1), date(2013, 2, 1)
+                )
+            )
+
+
+class TestPeriodInstance(object):
+    def test_for_date(self):
+        week = PeriodInstance.for_date(Week, date(2013, 5, 15))
+        assert week == (Week, date(2013, 5, 12), date(2013, 5, 18))
+        assert week.start == date(2013, 5, 12)
+        assert week.end == date(2013, 5, 18)
+
+    def test_hashable(self):
+        week = PeriodInstance.for_date(Week, date(2013, 5, 15))
+        same_week = PeriodInstance.for_date(Week, date(2013, 5, 18))
+        assert {week: "log"}[same_week] == "log"
+
+    def test_immutable(self):
+        week = PeriodInstance.for_date(Week, date(2013, 5, 15))
+        with pytest.raises(AttributeError):
+            week.start = date(2013, 5, 13)
+
+    def test_contains(self):
+        month = PeriodInstance.for_date(Month, date(2013, 5, 15))
+        assert date(2013, 5, 1) in month
+        assert date(2013, 6, 1) not in month
+        assert PeriodInstance.for_date(Week, date(2013, 5, 15)) in month
+        assert PeriodInstance.for_date(Week, date(2013, 6, 1)) not in month
+
+    def test_parent(self):
+        week = PeriodInstance.for_date(Week, date(2013, 5, 15))
+        assert week.parent() == PeriodInstance.for_date(
+            Month, date(2013, 5, 1)
+        )
+        assert week.parent(Year) == (
+            Year,
+            date(2013, 1, 1),
+            date(2013, 12, 31),
+        )
+
+    def test_children(self):
+        quarter = PeriodInstance.for_date(Quarter, date(2013, 5, 15))
+        assert quarter.children() == [
+            (Month, date(2013, 4, 1), date(2013, 4, 30)),
+            (Month, date(2013, 5, 1), date(2013, 5, 31)),
+            (Month, date(2013, 6, 1), date(2013, 6, 30)),
+        ]
+        assert len(quarter.children(Day)) == 91
+        day = PeriodInstance.for_date(Day, date(2013, 5, 15))
+        assert day.children() == []
+
+
 class TestGetTimePeriods(object):
     _time_periods = (Zero, Day, Week, Month, Quarter, Year, Eternity)
 